@@ -1,6 +1,7 @@
 import pygame
 from typing import Tuple
 from src.untils.constants import *
+from src.untils.font_manager import render_text
 class Button:
     """Simple button class."""
 
@@ -20,7 +21,7 @@ class Button:
         color = self.hover_color if self.is_hovered else self.color
         pygame.draw.rect(screen, color, self.rect)
         pygame.draw.rect(screen, WHITE, self.rect, 2)
-        text_surface = font.render(self.text, True, WHITE)
+        text_surface = render_text(font, self.text, True, WHITE)
         text_rect = text_surface.get_rect(center=self.rect.center)
         screen.blit(text_surface, text_rect)
 
@@ -1,7 +1,5 @@
 import pygame
-import tkinter as tk
-from tkinter import colorchooser, filedialog
-from src.untils.font_manager import get_font
+from src.untils.font_manager import get_font, render_text
 from src.untils.constants import SKINS
 
 
@@ -58,6 +56,10 @@ class SkinSelectorUI:
         """Xử lý click vào nút màu hoặc ảnh."""
         # Nút chọn màu
         if self.color_btn.collidepoint(pos):
+            # tkinter chỉ được import khi thật sự mở hộp thoại (tăng tốc khởi động)
+            import tkinter as tk
+            from tkinter import colorchooser
+
             root = tk.Tk()
             root.withdraw()
             color_result = colorchooser.askcolor(title="Chọn màu cho nhân vật")
@@ -70,6 +72,9 @@ class SkinSelectorUI:
 
         # Nút chọn ảnh
         elif self.image_btn.collidepoint(pos):
+            import tkinter as tk
+            from tkinter import filedialog
+
             root = tk.Tk()
             root.withdraw()
             path = filedialog.askopenfilename(
@@ -86,7 +91,7 @@ class SkinSelectorUI:
         self.screen.fill((0, 0, 0))
 
         # Tiêu đề
-        title = self.font_large.render("CHỌN SKIN", True, (255, 255, 0))
+        title = render_text(self.font_large, "CHỌN SKIN", True, (255, 255, 0))
         self.screen.blit(title, (640 - title.get_width() // 2, 80))
 
         # Danh sách skin
@@ -97,7 +102,7 @@ class SkinSelectorUI:
 
             # Nếu là skin đang chọn → thêm ký hiệu >>
             prefix = ">> " if i == self.selected_index else "   "
-            text_surface = self.font_medium.render(f"{prefix}{i + 1}. {name}", True, color)
+            text_surface = render_text(self.font_medium, f"{prefix}{i + 1}. {name}", True, color)
 
             text_x = 580 - text_surface.get_width() // 2
             text_y = start_y + i * 50
@@ -114,8 +119,8 @@ class SkinSelectorUI:
         pygame.draw.rect(self.screen, (120, 180, 255), self.color_btn, border_radius=8)
         pygame.draw.rect(self.screen, (100, 255, 120), self.image_btn, border_radius=8)
 
-        color_text = self.font_small.render("🎨 Màu", True, (0, 0, 0))
-        image_text = self.font_small.render("📁 Ảnh", True, (0, 0, 0))
+        color_text = render_text(self.font_small, "🎨 Màu", True, (0, 0, 0))
+        image_text = render_text(self.font_small, "📁 Ảnh", True, (0, 0, 0))
         self.screen.blit(
             color_text,
             (
@@ -132,7 +137,8 @@ class SkinSelectorUI:
         )
 
         # Hướng dẫn điều khiển
-        hint_text = self.font_small.render(
+        hint_text = render_text(
+            self.font_small,
             "Nhấn phím 1–6 để chọn | ENTER để xác nhận | ESC để quay lại",
             True,
             (180, 180, 180),
@@ -1,14 +1,15 @@
 import pygame
 from typing import Tuple, Optional
 from src.untils.constants import *
+from src.untils.font_manager import get_font, render_text
 class UIManager:
     """Manages UI elements and rendering."""
 
     def __init__(self, screen: pygame.Surface):
         self.screen = screen
-        self.font = pygame.font.Font(None, UI_FONT_SIZE)
-        self.small_font = pygame.font.Font(None, UI_SMALL_FONT_SIZE)
-        self.large_font = pygame.font.Font(None, UI_LARGE_FONT_SIZE)
+        self.font = get_font(UI_FONT_SIZE, face=None)
+        self.small_font = get_font(UI_SMALL_FONT_SIZE, face=None)
+        self.large_font = get_font(UI_LARGE_FONT_SIZE, face=None)
 
     def draw_text(self, text: str, x: int, y: int,
                   color: Tuple[int, int, int] = WHITE,
@@ -16,7 +17,7 @@ class UIManager:
                   center: bool = False):
         if font is None:
             font = self.font
-        text_surface = font.render(text, True, color)
+        text_surface = render_text(font, text, True, color)
         if center:
             text_rect = text_surface.get_rect(center=(x, y))
             self.screen.blit(text_surface, text_rect)
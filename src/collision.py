@@ -0,0 +1,86 @@
+"""
+Tile Collision
+==============
+Swept AABB movement over the maze grid, shared by Player and Enemy.
+
+A box is centred on (x, y) with half extent `half` and covers the half-open
+range [x - half, x + half). Each axis is swept separately across every tile
+column/row it would enter, so a long step (large dt or high speed) stops flush
+against the first wall instead of tunnelling through it, and the other axis
+still moves, which gives sliding along walls. No objects are allocated.
+"""
+import math
+from src.untils.constants import TILE_SIZE, CELL_WALL
+
+
+def _first_cell(low: float) -> int:
+    """Index of the first tile covered by an edge at `low`."""
+    return int(low // TILE_SIZE)
+
+
+def _last_cell(high: float) -> int:
+    """Index of the last tile covered by an edge at `high` (exclusive)."""
+    return math.ceil(high / TILE_SIZE) - 1
+
+
+def _column_blocked(maze: list, col: int, top: int, bottom: int) -> bool:
+    if col < 0 or col >= len(maze[0]) or top < 0 or bottom >= len(maze):
+        return True
+    for row in range(top, bottom + 1):
+        if maze[row][col] == CELL_WALL:
+            return True
+    return False
+
+
+def _row_blocked(maze: list, row: int, left: int, right: int) -> bool:
+    if row < 0 or row >= len(maze) or left < 0 or right >= len(maze[0]):
+        return True
+    cells = maze[row]
+    for col in range(left, right + 1):
+        if cells[col] == CELL_WALL:
+            return True
+    return False
+
+
+def sweep_x(x: float, y: float, dx: float, half: float, maze: list) -> float:
+    """Move a box horizontally by dx and return its resolved centre x."""
+    if dx == 0:
+        return x
+    top = _first_cell(y - half)
+    bottom = _last_cell(y + half)
+
+    if dx > 0:
+        start = _last_cell(x + half) + 1
+        end = _last_cell(x + dx + half)
+        for col in range(start, end + 1):
+            if _column_blocked(maze, col, top, bottom):
+                return col * TILE_SIZE - half
+    else:
+        start = _first_cell(x - half) - 1
+        end = _first_cell(x + dx - half)
+        for col in range(start, end - 1, -1):
+            if _column_blocked(maze, col, top, bottom):
+                return (col + 1) * TILE_SIZE + half
+    return x + dx
+
+
+def sweep_y(x: float, y: float, dy: float, half: float, maze: list) -> float:
+    """Move a box vertically by dy and return its resolved centre y."""
+    if dy == 0:
+        return y
+    left = _first_cell(x - half)
+    right = _last_cell(x + half)
+
+    if dy > 0:
+        start = _last_cell(y + half) + 1
+        end = _last_cell(y + dy + half)
+        for row in range(start, end + 1):
+            if _row_blocked(maze, row, left, right):
+                return row * TILE_SIZE - half
+    else:
+        start = _first_cell(y - half) - 1
+        end = _first_cell(y + dy - half)
+        for row in range(start, end - 1, -1):
+            if _row_blocked(maze, row, left, right):
+                return (row + 1) * TILE_SIZE + half
+    return y + dy
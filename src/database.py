@@ -2,28 +2,181 @@ import os
 import sqlite3
 import hashlib
 import json
-import sys
-from typing import Optional, List, Tuple
-from src.untils.constants import DB_NAME
+import queue
+import secrets
+import threading
+import time
+from datetime import date, timedelta
+from typing import Callable, Optional, List, Tuple
+from src.untils.constants import (
+    DB_NAME, DB_WRITE_BATCH_SIZE, DB_BUSY_TIMEOUT, MAZE_MIGRATION_BATCH_SIZE,
+    LEADERBOARD_DAY, LEADERBOARD_WEEK, LEADERBOARD_ALL, RANK_SCORE_BITS, RANK_LEVEL_BITS
+)
+from src.untils.asset_manager import resource_path
+from src.maze_codec import encode_grid, decode_grid
 
-def resource_path(relative_path):
-    """Lấy đường dẫn chính xác khi chạy bằng file .exe (PyInstaller)"""
-    try:
-        base_path = sys._MEIPASS  # Thư mục tạm khi chạy exe
-    except Exception:
-        base_path = os.path.abspath(".")
-    return os.path.join(base_path, relative_path)
 
-class DatabaseManager:
+# Biểu thức SQL tính bucket từ thời điểm `ts` (UTC, giống period_bucket).
+# Tuần được đặt tên theo ngày thứ Hai của nó, nên không bị cắt đôi qua năm mới:
+# lùi 6 ngày rồi tiến tới thứ Hai gần nhất (chính ngày đó nếu đã là thứ Hai)
+_BUCKET_SQL = {
+    LEADERBOARD_DAY: "date({ts})",
+    LEADERBOARD_WEEK: "date({ts}, '-6 days', 'weekday 1')",
+}
 
+# Khoá xếp hạng: điểm rồi level trong một số nguyên, lớn hơn = xếp trên
+RANK_KEY_BITS = RANK_SCORE_BITS + RANK_LEVEL_BITS
+_RANK_KEY_SQL = (f"(MIN(MAX({{score}}, 0), {(1 << RANK_SCORE_BITS) - 1}) << {RANK_LEVEL_BITS})"
+                 f" | MIN(MAX({{level}}, 0), {(1 << RANK_LEVEL_BITS) - 1})")
 
-    def __init__(self):
-        """Initialize database connection and create tables if needed."""
-        db_path = resource_path(DB_NAME)
-        os.makedirs(os.path.dirname(db_path), exist_ok=True)
-        self.conn = sqlite3.connect(db_path)
-        self.cursor = self.conn.cursor()
-        self.create_tables()
+# Số người chơi xếp trên một khoá: tổng các nút rank_counts liệt kê trong {nodes}
+# (mỗi nút là một cặp "(?, ?)" = depth, prefix), tra theo khoá chính
+_RANK_AHEAD_SQL = '''
+    SELECT COALESCE(SUM(r.players), 0)
+    FROM (VALUES {nodes}) n
+    JOIN rank_counts r
+      ON r.period = ? AND r.bucket = ?
+     AND r.depth = n.column1 AND r.prefix = n.column2
+'''
+
+
+def period_bucket(period: str, timestamp: Optional[float] = None) -> str:
+    """Bucket key of a leaderboard period at `timestamp` (default: now)."""
+    t = time.gmtime(timestamp)
+    if period == LEADERBOARD_DAY:
+        return time.strftime("%Y-%m-%d", t)
+    if period == LEADERBOARD_WEEK:
+        monday = date(t.tm_year, t.tm_mon, t.tm_mday) - timedelta(days=t.tm_wday)
+        return monday.isoformat()
+    return ""
+
+
+def rank_key(score: int, level: int) -> int:
+    """Python twin of _RANK_KEY_SQL."""
+    score = min(max(score, 0), (1 << RANK_SCORE_BITS) - 1)
+    level = min(max(level, 0), (1 << RANK_LEVEL_BITS) - 1)
+    return score << RANK_LEVEL_BITS | level
+
+
+def _rank_count_sql(row: str, period: str, bucket: str, delta: int) -> str:
+    """Trigger statement adding `delta` to every rank_counts node on the path of `row`'s key."""
+    key = _RANK_KEY_SQL.format(score=f"{row}.best_score", level=f"{row}.level")
+    return f'''
+        INSERT INTO rank_counts (period, bucket, depth, prefix, players)
+        SELECT {period}, {bucket}, depth, ({key}) >> depth, {delta} FROM rank_depths WHERE 1
+        ON CONFLICT(period, bucket, depth, prefix) DO UPDATE SET players = players + excluded.players;
+    '''
+
+
+def configure_connection(conn: sqlite3.Connection):
+    """WAL cho phép đọc song song với luồng ghi; NORMAL bỏ fsync ở mỗi commit."""
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+
+
+class WriteBehindQueue:
+    """
+    Dedicated DB thread for writes the game does not need to wait for.
+
+    put() only enqueues. The thread drains everything queued so far (up to
+    batch_size statements) into one transaction, so a burst of writes costs
+    a single commit. flush() blocks until every queued write is committed
+    or has failed: errors are printed and the thread keeps going, so
+    flush() and close() never hang on a dead writer.
+    """
+
+    _STOP = object()
+
+    def __init__(self, db_path: str, batch_size: int = DB_WRITE_BATCH_SIZE):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+        self._thread.start()
+
+    def put(self, sql: str, params: tuple = (), on_commit: Optional[Callable] = None):
+        """Queue one statement; on_commit() runs on the DB thread after it is committed."""
+        self._queue.put((sql, params, on_commit))
+
+    def flush(self):
+        """Wait until every write queued so far is committed."""
+        self._queue.join()
+
+    def close(self):
+        """Commit what is still queued, then stop the DB thread."""
+        self._queue.put(self._STOP)
+        self._thread.join()
+
+    def _run(self):
+        conn = None
+        stop = False
+        while not stop:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            writes = [item for item in batch if item is not self._STOP]
+            stop = len(writes) != len(batch)
+            try:
+                if writes and conn is None:
+                    conn = self._connect()
+                self._commit(conn, writes)
+            except Exception as e:
+                # Lỗi ở batch này không được giết luồng ghi (flush()/close() sẽ treo)
+                print(f"[DB] Bỏ {len(writes)} lệnh ghi: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+        if conn is not None:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=DB_BUSY_TIMEOUT)
+        configure_connection(conn)
+        return conn
+
+    @staticmethod
+    def _commit(conn: sqlite3.Connection, writes: list):
+        if not writes:
+            return
+        try:
+            with conn:
+                for sql, params, _ in writes:
+                    conn.execute(sql, params)
+            committed = writes
+        except sqlite3.Error:
+            # Một câu lệnh lỗi không được làm mất cả batch: thử lại từng câu
+            committed = []
+            for item in writes:
+                try:
+                    with conn:
+                        conn.execute(item[0], item[1])
+                    committed.append(item)
+                except sqlite3.Error as e:
+                    print(f"[DB] Lỗi khi ghi: {e}")
+
+        for _, _, on_commit in committed:
+            if on_commit:
+                try:
+                    on_commit()
+                except Exception as e:
+                    print(f"[DB] Lỗi trong on_commit: {e}")
+
+
+class DatabaseSession:
+    """
+    Schema and queries over one connection, run synchronously on its cursor.
+
+    DatabaseManager builds on this for the game thread; DatabaseService
+    (src/db_service.py) gives each of its worker threads its own session.
+    """
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        self.cursor = conn.cursor()
 
     def create_tables(self):
         # Users table
@@ -58,12 +211,186 @@ class DatabaseManager:
                             (
                                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                                 name TEXT NOT NULL,
-                                data TEXT NOT NULL,
+                                data TEXT NOT NULL DEFAULT '',
                                 created_by INTEGER NOT NULL,
                                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                                FOREIGN KEY (created_by)  REFERENCES users(id)  
+                                width INTEGER NOT NULL DEFAULT 0,
+                                height INTEGER NOT NULL DEFAULT 0,
+                                blob_hash TEXT,
+                                FOREIGN KEY (created_by)  REFERENCES users(id),
+                                FOREIGN KEY (blob_hash)  REFERENCES maze_blobs(hash)
+                            )
+        ''')
+
+        # Packed maze grids (see src/maze_codec.py), shared by identical mazes
+        self.cursor.execute('''
+                            CREATE TABLE IF NOT EXISTS maze_blobs
+                            (
+                                hash TEXT PRIMARY KEY,
+                                grid BLOB NOT NULL
                             )
         ''')
+        self._migrate_maze_dimensions()
+        self._migrate_maze_blob_column()
+        self._migrate_maze_blobs()
+        # Keyset pagination cho danh sách maze (theo user và toàn bộ)
+        self.cursor.execute(
+            'CREATE INDEX IF NOT EXISTS idx_mazes_user_created ON mazes(created_by, created_at)'
+        )
+        self.cursor.execute(
+            'CREATE INDEX IF NOT EXISTS idx_mazes_created ON mazes(created_at)'
+        )
+
+        # Covering index: MAX(score) per user is answered from the index alone
+        self.cursor.execute(
+            'CREATE INDEX IF NOT EXISTS idx_scores_user_score ON scores(user_id, score)'
+        )
+
+        # Best score per user (and the level it was reached on), kept up to
+        # date by a trigger so the leaderboard never has to scan `scores`
+        self.cursor.execute('''
+                            CREATE TABLE IF NOT EXISTS user_best
+                            (
+                                user_id INTEGER PRIMARY KEY,
+                                best_score INTEGER NOT NULL,
+                                level INTEGER NOT NULL,
+                                FOREIGN KEY (user_id) REFERENCES users(id)
+                            )
+        ''')
+        self.cursor.execute(
+            'CREATE INDEX IF NOT EXISTS idx_user_best_rank ON user_best(best_score DESC, level DESC)'
+        )
+        self.cursor.execute('''
+                            CREATE TRIGGER IF NOT EXISTS trg_scores_user_best
+                            AFTER INSERT ON scores
+                            BEGIN
+                                INSERT INTO user_best (user_id, best_score, level)
+                                VALUES (NEW.user_id, NEW.score, NEW.level)
+                                ON CONFLICT(user_id) DO UPDATE
+                                SET best_score = excluded.best_score, level = excluded.level
+                                WHERE excluded.best_score > user_best.best_score
+                                   OR (excluded.best_score = user_best.best_score
+                                       AND excluded.level > user_best.level);
+                            END
+        ''')
+
+        # Daily / weekly boards: best score per user per bucket, kept by triggers
+        self.cursor.execute('''
+                            CREATE TABLE IF NOT EXISTS period_best
+                            (
+                                period TEXT NOT NULL,
+                                bucket TEXT NOT NULL,
+                                user_id INTEGER NOT NULL,
+                                best_score INTEGER NOT NULL,
+                                level INTEGER NOT NULL,
+                                PRIMARY KEY (period, bucket, user_id),
+                                FOREIGN KEY (user_id) REFERENCES users(id)
+                            )
+        ''')
+        self.cursor.execute(
+            'CREATE INDEX IF NOT EXISTS idx_period_best_rank '
+            'ON period_best(period, bucket, best_score DESC, level DESC)'
+        )
+        # Trigger tuần cũ dùng strftime('%Y-%W'): thay trigger và tính lại các bảng xếp hạng
+        self.cursor.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = ?",
+            (f"trg_scores_{LEADERBOARD_WEEK}_best",)
+        )
+        old_week = self.cursor.fetchone()
+        rebuild = old_week is not None and "%W" in old_week[0]
+        if rebuild:
+            self.cursor.execute(f"DROP TRIGGER trg_scores_{LEADERBOARD_WEEK}_best")
+        for period, bucket_sql in _BUCKET_SQL.items():
+            bucket = bucket_sql.format(ts="COALESCE(NEW.completed_at, CURRENT_TIMESTAMP)")
+            self.cursor.execute(f'''
+                                CREATE TRIGGER IF NOT EXISTS trg_scores_{period}_best
+                                AFTER INSERT ON scores
+                                BEGIN
+                                    INSERT INTO period_best (period, bucket, user_id, best_score, level)
+                                    VALUES ('{period}', {bucket}, NEW.user_id, NEW.score, NEW.level)
+                                    ON CONFLICT(period, bucket, user_id) DO UPDATE
+                                    SET best_score = excluded.best_score, level = excluded.level
+                                    WHERE excluded.best_score > period_best.best_score
+                                       OR (excluded.best_score = period_best.best_score
+                                           AND excluded.level > period_best.level);
+                                END
+            ''')
+
+        # Number of players on each board, so percentiles never COUNT(*) a whole board.
+        # An upsert only fires AFTER INSERT when it really adds a user to the board.
+        self.cursor.execute('''
+                            CREATE TABLE IF NOT EXISTS board_sizes
+                            (
+                                period TEXT NOT NULL,
+                                bucket TEXT NOT NULL,
+                                players INTEGER NOT NULL,
+                                PRIMARY KEY (period, bucket)
+                            )
+        ''')
+        self.cursor.execute('''
+                            CREATE TRIGGER IF NOT EXISTS trg_period_best_size
+                            AFTER INSERT ON period_best
+                            BEGIN
+                                INSERT INTO board_sizes (period, bucket, players)
+                                VALUES (NEW.period, NEW.bucket, 1)
+                                ON CONFLICT(period, bucket) DO UPDATE SET players = players + 1;
+                            END
+        ''')
+        self.cursor.execute(f'''
+                            CREATE TRIGGER IF NOT EXISTS trg_user_best_size
+                            AFTER INSERT ON user_best
+                            BEGIN
+                                INSERT INTO board_sizes (period, bucket, players)
+                                VALUES ('{LEADERBOARD_ALL}', '', 1)
+                                ON CONFLICT(period, bucket) DO UPDATE SET players = players + 1;
+                            END
+        ''')
+
+        # Order statistics for get_user_rank: a binary trie over rank_key().
+        # Node (depth, prefix) counts the players whose key >> depth == prefix,
+        # so the players ahead of a key are a sum over at most RANK_KEY_BITS
+        # nodes, each one primary-key lookup, however many players there are.
+        self.cursor.execute('CREATE TABLE IF NOT EXISTS rank_depths (depth INTEGER PRIMARY KEY)')
+        self.cursor.executemany(
+            'INSERT OR IGNORE INTO rank_depths (depth) VALUES (?)', ((d,) for d in range(RANK_KEY_BITS))
+        )
+        self.cursor.execute('''
+                            CREATE TABLE IF NOT EXISTS rank_counts
+                            (
+                                period TEXT NOT NULL,
+                                bucket TEXT NOT NULL,
+                                depth INTEGER NOT NULL,
+                                prefix INTEGER NOT NULL,
+                                players INTEGER NOT NULL,
+                                PRIMARY KEY (period, bucket, depth, prefix)
+                            ) WITHOUT ROWID
+        ''')
+        for table, period, bucket in (("user_best", f"'{LEADERBOARD_ALL}'", "''"),
+                                      ("period_best", "NEW.period", "NEW.bucket")):
+            self.cursor.execute(f'''
+                                CREATE TRIGGER IF NOT EXISTS trg_{table}_rank_insert
+                                AFTER INSERT ON {table}
+                                BEGIN
+                                    {_rank_count_sql("NEW", period, bucket, 1)}
+                                END
+            ''')
+            old_period, old_bucket = period.replace("NEW.", "OLD."), bucket.replace("NEW.", "OLD.")
+            self.cursor.execute(f'''
+                                CREATE TRIGGER IF NOT EXISTS trg_{table}_rank_update
+                                AFTER UPDATE OF best_score, level ON {table}
+                                BEGIN
+                                    {_rank_count_sql("OLD", old_period, old_bucket, -1)}
+                                    {_rank_count_sql("NEW", period, bucket, 1)}
+                                END
+            ''')
+
+        if rebuild:
+            self.conn.commit()
+            self.rebuild_leaderboards()
+        else:
+            self._backfill_rank_counts()
+            self._backfill_user_best()
+            self._backfill_period_best()
 
         # Multiplayer sessions table
         self.cursor.execute('''
@@ -80,6 +407,113 @@ class DatabaseManager:
 
         self.conn.commit()
 
+    def _migrate_maze_dimensions(self):
+        """Add width/height columns to databases created before they existed."""
+        self.cursor.execute('PRAGMA table_info(mazes)')
+        columns = {row[1] for row in self.cursor.fetchall()}
+        if "width" in columns:
+            return
+        self.cursor.execute('ALTER TABLE mazes ADD COLUMN width INTEGER NOT NULL DEFAULT 0')
+        self.cursor.execute('ALTER TABLE mazes ADD COLUMN height INTEGER NOT NULL DEFAULT 0')
+        rows = self.cursor.execute('SELECT id, data FROM mazes').fetchall()
+        for maze_id, data in rows:
+            grid = json.loads(data)
+            self.cursor.execute(
+                'UPDATE mazes SET width = ?, height = ? WHERE id = ?',
+                (len(grid[0]) if grid else 0, len(grid), maze_id)
+            )
+
+    def _migrate_maze_blob_column(self):
+        """Add blob_hash to databases created before grids were stored as blobs."""
+        # Kiểm tra riêng: DB đã có width/height vẫn có thể chưa có blob_hash
+        self.cursor.execute('PRAGMA table_info(mazes)')
+        if "blob_hash" not in {row[1] for row in self.cursor.fetchall()}:
+            self.cursor.execute('ALTER TABLE mazes ADD COLUMN blob_hash TEXT REFERENCES maze_blobs(hash)')
+
+    def _migrate_maze_blobs(self, batch_size: int = MAZE_MIGRATION_BATCH_SIZE):
+        """Convert mazes still stored as JSON text to packed blobs, one batch per transaction."""
+        while True:
+            self.cursor.execute(
+                "SELECT id, data FROM mazes WHERE blob_hash IS NULL AND data != '' LIMIT ?",
+                (batch_size,)
+            )
+            rows = self.cursor.fetchall()
+            if not rows:
+                return
+            blobs = []
+            updates = []
+            for maze_id, data in rows:
+                blob, content_hash = encode_grid(json.loads(data))
+                blobs.append((content_hash, blob))
+                updates.append((content_hash, maze_id))
+            self.cursor.executemany('INSERT OR IGNORE INTO maze_blobs (hash, grid) VALUES (?, ?)', blobs)
+            self.cursor.executemany("UPDATE mazes SET blob_hash = ?, data = '' WHERE id = ?", updates)
+            self.conn.commit()
+
+    def rebuild_leaderboards(self):
+        """
+        Recompute user_best, period_best and board_sizes from `scores`.
+
+        The triggers only handle inserted scores; call this after scores
+        were replaced or deleted in bulk (e.g. an import with REPLACE).
+        """
+        with self.conn:
+            self.cursor.execute('DELETE FROM user_best')
+            self.cursor.execute('DELETE FROM period_best')
+            self.cursor.execute('DELETE FROM board_sizes')
+            self.cursor.execute('DELETE FROM rank_counts')
+            self._backfill_user_best()
+            self._backfill_period_best()
+
+    def _backfill_rank_counts(self):
+        """Fill rank_counts from existing boards the first time the table is created."""
+        self.cursor.execute('SELECT EXISTS (SELECT 1 FROM rank_counts)')
+        if self.cursor.fetchone()[0]:
+            return
+        # Bảng trống (user_best/period_best chưa có gì) thì trigger sẽ lo khi backfill
+        key = _RANK_KEY_SQL.format(score="b.best_score", level="b.level")
+        for board, period, bucket in (("user_best", "?", "''"), ("period_best", "b.period", "b.bucket")):
+            self.cursor.execute(f'''
+                                INSERT INTO rank_counts (period, bucket, depth, prefix, players)
+                                SELECT {period}, {bucket}, d.depth, ({key}) >> d.depth, COUNT(*)
+                                FROM {board} b CROSS JOIN rank_depths d
+                                GROUP BY 1, 2, 3, 4
+            ''', (LEADERBOARD_ALL,) if board == "user_best" else ())
+
+    def _backfill_user_best(self):
+        """Fill user_best from existing scores the first time the table is created."""
+        self.cursor.execute('SELECT EXISTS (SELECT 1 FROM user_best)')
+        if self.cursor.fetchone()[0]:
+            return
+        # INSERT OR IGNORE giữ dòng đầu tiên của mỗi user = điểm cao nhất (rồi level cao nhất)
+        self.cursor.execute('''
+                            INSERT OR IGNORE INTO user_best (user_id, best_score, level)
+                            SELECT user_id, score, level
+                            FROM scores
+                            ORDER BY score DESC, level DESC
+        ''')
+
+    def _backfill_period_best(self):
+        """Fill period_best and board_sizes from existing data the first time they are created."""
+        # Chưa có dòng 'all' nghĩa là trigger chưa từng chạy: đếm user_best hiện có
+        self.cursor.execute(
+            "INSERT OR IGNORE INTO board_sizes (period, bucket, players) "
+            "SELECT ?, '', COUNT(*) FROM user_best",
+            (LEADERBOARD_ALL,)
+        )
+        self.cursor.execute('SELECT EXISTS (SELECT 1 FROM period_best)')
+        if self.cursor.fetchone()[0]:
+            return
+        # trg_period_best_size cập nhật board_sizes cho từng dòng được thêm
+        for period, bucket_sql in _BUCKET_SQL.items():
+            bucket = bucket_sql.format(ts="COALESCE(completed_at, CURRENT_TIMESTAMP)")
+            self.cursor.execute(f'''
+                                INSERT OR IGNORE INTO period_best (period, bucket, user_id, best_score, level)
+                                SELECT ?, {bucket}, user_id, score, level
+                                FROM scores
+                                ORDER BY score DESC, level DESC
+            ''', (period,))
+
     @staticmethod
     def hash_password(password: str) -> str:
         """Hash password using SHA-256."""
@@ -151,71 +585,286 @@ class DatabaseManager:
         return {"skin_type": "preset", "skin_value": "1"}
 
     def save_score(self, user_id: int, score: int, level: int):
-        """Save a game score to the database."""
+        """Save a game score."""
         self.cursor.execute(
             'INSERT INTO scores (user_id, score, level) VALUES (?, ?, ?)',
             (user_id, score, level)
         )
         self.conn.commit()
 
-    def get_leaderboard(self, limit: int = 10) -> List[Tuple]:
-        self.cursor.execute('''
-                            SELECT 
+    def get_leaderboard(self, limit: int = 10, period: str = LEADERBOARD_ALL) -> List[Tuple]:
+        """Top scores per user for today, this week or all time."""
+        return self._query_leaderboard(limit, period, period_bucket(period))
+
+    def _query_leaderboard(self, limit: int, period: str = LEADERBOARD_ALL, bucket: str = "") -> List[Tuple]:
+        board, where, params = self._board(period, bucket)
+        self.cursor.execute(f'''
+                            SELECT
                                 u.username,
-                                MAX(s.score) AS best_score,
-                                s.level
-                            FROM scores s
-                            JOIN users u ON s.user_id = u.id
-                            GROUP BY s.user_id
-                            ORDER BY best_score DESC, s.level DESC
+                                b.best_score,
+                                b.level
+                            FROM {board} b
+                            JOIN users u ON b.user_id = u.id
+                            WHERE {where}
+                            ORDER BY b.best_score DESC, b.level DESC
                             LIMIT ?
-                            ''', (limit,))
+                            ''', params + (limit,))
         return self.cursor.fetchall()
 
+    @staticmethod
+    def _board(period: str, bucket: str) -> Tuple[str, str, tuple]:
+        """(table, WHERE condition, params) selecting one leaderboard."""
+        if period == LEADERBOARD_ALL:
+            return "user_best", "1", ()
+        if period not in _BUCKET_SQL:
+            raise ValueError(f"Unknown leaderboard period: {period!r}")
+        return "period_best", "b.period = ? AND b.bucket = ?", (period, bucket)
+
+    def get_user_rank(self, user_id: int, period: str = LEADERBOARD_ALL) -> Optional[dict]:
+        """
+        The user's place on a board as {'rank', 'players', 'top_percent'}.
+
+        Returns None if the user has no score on that board. `scores` is
+        never read: the players ahead of the user are summed from at most
+        RANK_KEY_BITS rank_counts nodes, and the board size comes from
+        board_sizes, so the cost does not grow with the rank.
+        """
+        bucket = period_bucket(period)
+        board, where, params = self._board(period, bucket)
+        self.cursor.execute(
+            f"SELECT b.best_score, b.level FROM {board} b WHERE {where} AND b.user_id = ?",
+            params + (user_id,)
+        )
+        mine = self.cursor.fetchone()
+        if mine is None:
+            return None
+        score, level = mine
+
+        # Khoá lớn hơn `key` khác nó lần đầu ở bit `depth` nào đó mà key có bit 0:
+        # chúng nằm trong nút (depth, (key >> depth) | 1)
+        key = rank_key(score, level)
+        nodes = [(depth, (key >> depth) | 1) for depth in range(RANK_KEY_BITS) if not (key >> depth) & 1]
+        ahead = 0
+        if nodes:
+            self.cursor.execute(_RANK_AHEAD_SQL.format(nodes=", ".join(["(?, ?)"] * len(nodes))),
+                                tuple(v for node in nodes for v in node) + (period, bucket))
+            ahead = self.cursor.fetchone()[0]
+        self.cursor.execute('SELECT players FROM board_sizes WHERE period = ? AND bucket = ?', (period, bucket))
+        players = self.cursor.fetchone()
+        players = players[0] if players else 0
+        rank = ahead + 1
+        players = max(players or 0, rank)
+        return {'rank': rank, 'players': players, 'top_percent': 100.0 * rank / players}
+
     def get_user_best_score(self, user_id: int) -> Optional[int]:
         """Get user's highest score."""
         self.cursor.execute(
-            'SELECT MAX(score) FROM scores WHERE user_id = ?',
+            'SELECT best_score FROM user_best WHERE user_id = ?',
             (user_id,)
         )
         result = self.cursor.fetchone()
-        return result[0] if result[0] else 0
+        return result[0] if result else 0
 
     def save_custom_maze(self, name: str, maze_data: List[List[int]], user_id: int) -> int:
-        data_json = json.dumps(maze_data)
+        blob, content_hash = encode_grid(maze_data)
+        # Maze giống hệt nhau dùng chung một blob
         self.cursor.execute(
-            'INSERT INTO mazes (name, data, created_by) VALUES (?, ?, ?)',
-            (name, data_json, user_id)
+            'INSERT OR IGNORE INTO maze_blobs (hash, grid) VALUES (?, ?)',
+            (content_hash, blob)
+        )
+        self.cursor.execute(
+            "INSERT INTO mazes (name, data, created_by, width, height, blob_hash) VALUES (?, '', ?, ?, ?, ?)",
+            (name, user_id, len(maze_data[0]) if maze_data else 0, len(maze_data), content_hash)
         )
         self.conn.commit()
         return self.cursor.lastrowid
 
-    def get_custom_mazes(self, user_id: Optional[int] = None) -> List[Tuple]:
+    def list_custom_mazes(self, user_id: Optional[int] = None, limit: int = 20,
+                          after: Optional[Tuple[str, int]] = None) -> List[Tuple]:
+        """
+        One page of maze metadata, newest first, without the grid data.
+
+        Rows are (id, name, author, width, height, created_at). To get the
+        next page pass after=(created_at, id) of the last row; each page is
+        an index range scan, so its cost does not grow with the table.
+        """
+        conditions = []
+        params = []
         if user_id:
-            self.cursor.execute('''
-                                SELECT m.id, m.name, m.data, m.created_by, u.username
-                                FROM mazes m
-                                         JOIN users u ON m.created_by = u.id
-                                WHERE m.created_by = ?
-                                ORDER BY m.created_at DESC
-                                ''', (user_id,))
-        else:
-            self.cursor.execute('''
-                                SELECT m.id, m.name, m.data, m.created_by, u.username
-                                FROM mazes m
-                                         JOIN users u ON m.created_by = u.id
-                                ORDER BY m.created_at DESC
-                                ''')
+            conditions.append('m.created_by = ?')
+            params.append(user_id)
+        if after is not None:
+            conditions.append('(m.created_at, m.id) < (?, ?)')
+            params.extend(after)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        params.append(limit)
+
+        self.cursor.execute(f'''
+                            SELECT m.id, m.name, u.username, m.width, m.height, m.created_at
+                            FROM mazes m
+                                     JOIN users u ON m.created_by = u.id
+                            {where}
+                            ORDER BY m.created_at DESC, m.id DESC
+                            LIMIT ?
+                            ''', params)
         return self.cursor.fetchall()
 
     def load_custom_maze(self, maze_id: int) -> Optional[List[List[int]]]:
         """Load a custom maze by ID."""
-        self.cursor.execute('SELECT data FROM mazes WHERE id = ?', (maze_id,))
+        self.cursor.execute('''
+                            SELECT m.data, b.grid
+                            FROM mazes m
+                                     LEFT JOIN maze_blobs b ON b.hash = m.blob_hash
+                            WHERE m.id = ?
+                            ''', (maze_id,))
+        result = self.cursor.fetchone()
+        if result:
+            data, grid = result
+            return decode_grid(grid) if grid is not None else json.loads(data)
+        return None
+
+    def create_multiplayer_session(self, host_user_id: int) -> str:
+        """Register a new session hosted by host_user_id; returns its join code."""
+        while True:
+            code = secrets.token_hex(3).upper()
+            try:
+                self.cursor.execute(
+                    'INSERT INTO multiplayer_sessions (session_code, host_user_id) VALUES (?, ?)',
+                    (code, host_user_id)
+                )
+                self.conn.commit()
+                return code
+            except sqlite3.IntegrityError:
+                continue  # trùng mã, thử mã khác
+
+    def get_multiplayer_session(self, session_code: str) -> Optional[dict]:
+        self.cursor.execute(
+            'SELECT id, session_code, host_user_id, status, created_at '
+            'FROM multiplayer_sessions WHERE session_code = ?',
+            (session_code,)
+        )
         result = self.cursor.fetchone()
         if result:
-            return json.loads(result[0])
+            return dict(zip(('id', 'session_code', 'host_user_id', 'status', 'created_at'), result))
         return None
 
+    def set_multiplayer_session_status(self, session_code: str, status: str):
+        self.cursor.execute(
+            'UPDATE multiplayer_sessions SET status = ? WHERE session_code = ?',
+            (status, session_code)
+        )
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+
+def connect(db_path: Optional[str] = None, check_same_thread: bool = True) -> sqlite3.Connection:
+    """Open a connection to the game database (default: DB_NAME) with WAL enabled."""
+    db_path = db_path or resource_path(DB_NAME)
+    os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+    conn = sqlite3.connect(db_path, timeout=DB_BUSY_TIMEOUT, check_same_thread=check_same_thread)
+    configure_connection(conn)
+    return conn
+
+
+class DatabaseManager(DatabaseSession):
+    """
+    Database access for the game thread.
+
+    Writes the game does not wait for go through a WriteBehindQueue, and the
+    leaderboard and per-user progress are cached in memory.
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        """Initialize database connection and create tables if needed."""
+        db_path = db_path or resource_path(DB_NAME)
+        super().__init__(connect(db_path))
+        self.create_tables()
+
+        # Các lệnh ghi không cần kết quả đi qua luồng ghi riêng
+        self.writer = WriteBehindQueue(db_path)
+        # Tiến độ mới nhất của từng user (cả phần còn nằm trong hàng đợi ghi)
+        self._progress = {}
+
+        # Leaderboard/rank cache theo (period, bucket, ...); leaderboard_version tăng mỗi khi có điểm mới
+        self._leaderboard_cache = {}
+        self.leaderboard_version = 0
+        # Luồng UI đọc/ghi cache, luồng ghi xoá nó trong on_commit
+        self._cache_lock = threading.Lock()
+
+    # Các lệnh đọc dưới đây cần thấy những gì còn nằm trong hàng đợi ghi
+    def login_user(self, username: str, password: str):
+        self.flush()
+        return super().login_user(username, password)
+
+    def get_user_skin(self, user_id: int):
+        self.flush()
+        return super().get_user_skin(user_id)
+
+    def get_user_best_score(self, user_id: int) -> Optional[int]:
+        self.flush()
+        return super().get_user_best_score(user_id)
+
+    def update_user_progress(self, user_id: int, last_level: int):
+        self._progress[user_id] = last_level
+        self.writer.put("UPDATE users SET last_level = ? WHERE id = ?", (last_level, user_id))
+
+    def get_user_progress(self, user_id: int) -> int:
+        if user_id not in self._progress:
+            self._progress[user_id] = super().get_user_progress(user_id)
+        return self._progress[user_id]
+
+    def update_user_skin(self, user_id: int, skin_type: str, skin_value: str):
+        self.writer.put(
+            "UPDATE users SET skin_type = ?, skin_value = ? WHERE id = ?",
+            (skin_type, skin_value, user_id)
+        )
+
+    def save_score(self, user_id: int, score: int, level: int):
+        """Queue a game score for the DB thread to save."""
+        self.writer.put(
+            'INSERT INTO scores (user_id, score, level) VALUES (?, ?, ?)',
+            (user_id, score, level),
+            on_commit=self._invalidate_leaderboard
+        )
+
+    def _invalidate_leaderboard(self):
+        """Drop cached leaderboards (runs on the DB thread after a score commits)."""
+        with self._cache_lock:
+            self._leaderboard_cache = {}
+            self.leaderboard_version += 1
+
+    def get_leaderboard(self, limit: int = 10, period: str = LEADERBOARD_ALL) -> List[Tuple]:
+        """Top scores per user, served from cache until a new score is saved."""
+        bucket = period_bucket(period)
+        return self._cached((period, bucket, limit), lambda: self._query_leaderboard(limit, period, bucket))
+
+    def get_user_rank(self, user_id: int, period: str = LEADERBOARD_ALL) -> Optional[dict]:
+        """The user's rank on a board, cached like the leaderboard."""
+        key = ("rank", period, period_bucket(period), user_id)
+        return self._cached(key, lambda: DatabaseSession.get_user_rank(self, user_id, period))
+
+    def _cached(self, key, query):
+        # Bucket nằm trong key nên sang ngày/tuần mới sẽ tự truy vấn lại
+        with self._cache_lock:
+            version = self.leaderboard_version
+            if key in self._leaderboard_cache:
+                return self._leaderboard_cache[key]
+
+        # Truy vấn ngoài lock: luồng ghi không phải chờ nó để báo commit
+        result = query()
+        # Chỉ lưu nếu không có điểm mới nào được commit trong lúc truy vấn
+        with self._cache_lock:
+            if version == self.leaderboard_version:
+                self._leaderboard_cache[key] = result
+        return result
+
+    def flush(self):
+        """Block until every queued write has been committed."""
+        self.writer.flush()
+
     def close(self):
-        """Close database connection."""
+        """Commit queued writes and close database connections."""
+        self.writer.close()
         self.conn.close()
\ No newline at end of file
@@ -0,0 +1,146 @@
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, List, Optional, Tuple
+from src.database import DatabaseSession, connect
+from src.untils.constants import DB_READ_POOL_SIZE, LEADERBOARD_ALL
+
+
+class DatabaseService:
+    """
+    Thread-pooled database access that never blocks the caller.
+
+    Every query method returns a concurrent.futures.Future. Reads run on a
+    pool of `readers` threads, each with its own read-only connection; all
+    writes run on a single writer thread with its own connection. Under WAL
+    readers never wait for the writer, and no cursor is shared between
+    threads. Reads do not wait for queued writes: wait on a write's future
+    before reading what it wrote.
+
+    From asyncio code use the `aio` view, whose methods are coroutines:
+        user = await service.aio.login_user(username, password)
+    From the pygame loop, poll future.done() each frame instead.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, readers: int = DB_READ_POOL_SIZE):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._sessions = []  # mọi session đã mở, để close() đóng hết
+        self._sessions_lock = threading.Lock()
+
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-service-writer")
+        # Schema được tạo trên luồng ghi trước khi bất kỳ reader nào mở kết nối
+        self._ready = self._writer.submit(self._open_writer)
+        self._readers = ThreadPoolExecutor(
+            max_workers=readers, thread_name_prefix="db-service-reader",
+            initializer=self._open_reader
+        )
+        self.aio = _AsyncView(self)
+
+    # ==================== Worker threads ====================
+    def _open_session(self) -> DatabaseSession:
+        # Mỗi kết nối chỉ dùng trên luồng của nó; close() đóng sau khi các luồng đã dừng
+        session = DatabaseSession(connect(self.db_path, check_same_thread=False))
+        self._local.session = session
+        with self._sessions_lock:
+            self._sessions.append(session)
+        return session
+
+    def _open_writer(self):
+        self._open_session().create_tables()
+
+    def _open_reader(self):
+        self._ready.result()
+        session = self._open_session()
+        session.conn.execute("PRAGMA query_only=ON")
+
+    def _call(self, method: Callable, args: tuple):
+        return method(self._local.session, *args)
+
+    def read(self, method: Callable, *args) -> Future:
+        """Run method(session, *args) on a reader thread."""
+        return self._readers.submit(self._call, method, args)
+
+    def write(self, method: Callable, *args) -> Future:
+        """Run method(session, *args) on the writer thread, after earlier writes."""
+        return self._writer.submit(self._call, method, args)
+
+    # ==================== Users ====================
+    def get_user_by_username(self, username: str) -> Future:
+        return self.read(DatabaseSession.get_user_by_username, username)
+
+    def register_user(self, username: str, password: str) -> Future:
+        return self.write(DatabaseSession.register_user, username, password)
+
+    def login_user(self, username: str, password: str) -> Future:
+        return self.read(DatabaseSession.login_user, username, password)
+
+    def get_user_progress(self, user_id: int) -> Future:
+        return self.read(DatabaseSession.get_user_progress, user_id)
+
+    def update_user_progress(self, user_id: int, last_level: int) -> Future:
+        return self.write(DatabaseSession.update_user_progress, user_id, last_level)
+
+    def get_user_skin(self, user_id: int) -> Future:
+        return self.read(DatabaseSession.get_user_skin, user_id)
+
+    def update_user_skin(self, user_id: int, skin_type: str, skin_value: str) -> Future:
+        return self.write(DatabaseSession.update_user_skin, user_id, skin_type, skin_value)
+
+    # ==================== Scores ====================
+    def save_score(self, user_id: int, score: int, level: int) -> Future:
+        return self.write(DatabaseSession.save_score, user_id, score, level)
+
+    def get_leaderboard(self, limit: int = 10, period: str = LEADERBOARD_ALL) -> Future:
+        return self.read(DatabaseSession.get_leaderboard, limit, period)
+
+    def get_user_rank(self, user_id: int, period: str = LEADERBOARD_ALL) -> Future:
+        return self.read(DatabaseSession.get_user_rank, user_id, period)
+
+    def get_user_best_score(self, user_id: int) -> Future:
+        return self.read(DatabaseSession.get_user_best_score, user_id)
+
+    # ==================== Mazes ====================
+    def save_custom_maze(self, name: str, maze_data: List[List[int]], user_id: int) -> Future:
+        return self.write(DatabaseSession.save_custom_maze, name, maze_data, user_id)
+
+    def list_custom_mazes(self, user_id: Optional[int] = None, limit: int = 20,
+                          after: Optional[Tuple[str, int]] = None) -> Future:
+        return self.read(DatabaseSession.list_custom_mazes, user_id, limit, after)
+
+    def load_custom_maze(self, maze_id: int) -> Future:
+        return self.read(DatabaseSession.load_custom_maze, maze_id)
+
+    # ==================== Multiplayer ====================
+    def create_multiplayer_session(self, host_user_id: int) -> Future:
+        return self.write(DatabaseSession.create_multiplayer_session, host_user_id)
+
+    def get_multiplayer_session(self, session_code: str) -> Future:
+        return self.read(DatabaseSession.get_multiplayer_session, session_code)
+
+    def set_multiplayer_session_status(self, session_code: str, status: str) -> Future:
+        return self.write(DatabaseSession.set_multiplayer_session_status, session_code, status)
+
+    # ==================== Shutdown ====================
+    def close(self):
+        """Finish queued queries and writes, then close every connection."""
+        self._readers.shutdown(wait=True)
+        self._writer.shutdown(wait=True)
+        with self._sessions_lock:
+            for session in self._sessions:
+                session.close()
+            self._sessions.clear()
+
+
+class _AsyncView:
+    """service.aio.<method>(...) -> awaitable result of service.<method>(...)."""
+
+    def __init__(self, service: DatabaseService):
+        self._service = service
+
+    def __getattr__(self, name: str):
+        method = getattr(self._service, name)
+
+        async def call(*args, **kwargs):
+            return await asyncio.wrap_future(method(*args, **kwargs))
+        return call
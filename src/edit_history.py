@@ -0,0 +1,133 @@
+import struct
+import sys
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+# Một run: ô bắt đầu (y * width + x), số ô liên tiếp, giá trị cũ << 4 | giá trị mới
+_RUN = struct.Struct("<IHB")
+_MAX_RUN = 0xFFFF
+
+Run = Tuple[int, int, int, int]  # (start, length, old, new)
+
+
+class EditHistory:
+    """
+    Undo/redo log for the maze editor that stores only the cells a stroke changed.
+
+    Cells are addressed by their index (y * width + x). While a stroke is
+    open, record() keeps the value each cell had before its first change;
+    commit() compares that with the grid and packs the changed cells as
+    runs of consecutive indices sharing the same old and new value (7
+    bytes per run; tile values fit in 4 bits, as in maze_codec), so a line
+    of walls or a cleared area costs a few bytes, not one entry per cell.
+    The oldest strokes are dropped once the log (undo and redo together)
+    is over `memory_limit` bytes.
+    """
+
+    def __init__(self, memory_limit: int):
+        self.memory_limit = memory_limit
+        self._undo = deque()
+        self._redo = []
+        self._stroke: Optional[Dict[int, int]] = None
+        self.memory = 0  # bytes held by the encoded strokes
+
+    @property
+    def recording(self) -> bool:
+        return self._stroke is not None
+
+    def begin(self):
+        if self._stroke is None:
+            self._stroke = {}
+
+    def record(self, index: int, old: int):
+        """Remember a cell's value before it changes; later changes in the same stroke are ignored."""
+        if self._stroke is not None and index not in self._stroke:
+            self._stroke[index] = old
+
+    def commit(self, grid: list, width: int) -> bool:
+        """Close the stroke; returns False if it did not change anything."""
+        stroke, self._stroke = self._stroke, None
+        if not stroke:
+            return False
+
+        runs = []
+        start = length = old = new = None
+        for index in sorted(stroke):
+            value = grid[index // width][index % width]
+            if value == stroke[index]:
+                continue
+            if length and index == start + length and stroke[index] == old and value == new:
+                length += 1
+                continue
+            if length:
+                runs.append((start, length, old, new))
+            start, length, old, new = index, 1, stroke[index], value
+        if length:
+            runs.append((start, length, old, new))
+        return self.push(runs)
+
+    def push(self, runs: List[Run]) -> bool:
+        """
+        Add one step made of (start, length, old, new) runs.
+
+        Bulk edits (fill, rectangle, line) build their runs directly instead
+        of recording cell by cell. Returns False if `runs` is empty.
+        """
+        return self.push_packed(self.pack(runs))
+
+    @staticmethod
+    def pack(runs: List[Run]) -> bytes:
+        """Encode runs for push_packed(); the encodings of consecutive batches can be concatenated."""
+        packed = []
+        for start, length, old, new in runs:
+            values = old << 4 | new
+            while length > _MAX_RUN:
+                packed.append(_RUN.pack(start, _MAX_RUN, values))
+                start += _MAX_RUN
+                length -= _MAX_RUN
+            packed.append(_RUN.pack(start, length, values))
+        return b"".join(packed)
+
+    def push_packed(self, data: bytes) -> bool:
+        """Add one step already encoded with pack(); returns False if it is empty."""
+        if not data:
+            return False
+        self._undo.append(data)
+        self.memory += sys.getsizeof(data)
+        # Bước mới làm mất nhánh redo
+        for dropped in self._redo:
+            self.memory -= sys.getsizeof(dropped)
+        self._redo.clear()
+        while self.memory > self.memory_limit and len(self._undo) > 1:
+            self.memory -= sys.getsizeof(self._undo.popleft())
+        return True
+
+    def undo(self) -> List[Tuple[int, int, int]]:
+        """(start, length, value) runs that revert the last step; empty if there is none."""
+        if not self._undo:
+            return []
+        data = self._undo.pop()
+        self._redo.append(data)
+        return [(start, length, values >> 4) for start, length, values in _RUN.iter_unpack(data)]
+
+    def redo(self) -> List[Tuple[int, int, int]]:
+        """(start, length, value) runs that re-apply the last undone step."""
+        if not self._redo:
+            return []
+        data = self._redo.pop()
+        self._undo.append(data)
+        return [(start, length, values & 0x0F) for start, length, values in _RUN.iter_unpack(data)]
+
+    def clear(self):
+        self._undo.clear()
+        self._redo.clear()
+        self._stroke = None
+        self.memory = 0
+
+    @property
+    def undo_steps(self) -> int:
+        return len(self._undo)
+
+    @property
+    def redo_steps(self) -> int:
+        return len(self._redo)
@@ -1,7 +1,24 @@
 
+import math
+import time
+from itertools import groupby
 import pygame
 from src.untils.constants import *
 from src.database import DatabaseManager
+from src.edit_history import EditHistory
+from src.editor_tools import iter_flood_fill_spans, line_spans, rect_spans, clip_spans
+from src.maze_connectivity import ConnectivityValidator
+from src.untils.font_manager import get_font, render_text
+
+_TILE_COLORS = {
+    EDITOR_TILE_EMPTY: BLACK,
+    EDITOR_TILE_WALL: GRAY,
+    EDITOR_TILE_START: BLUE,
+    EDITOR_TILE_EXIT: GREEN,
+    EDITOR_TILE_ENEMY: RED,
+}
+# Overview là surface 8-bit: giá trị ô chính là chỉ số trong palette
+_PALETTE = [_TILE_COLORS[tile] for tile in sorted(_TILE_COLORS)]
 
 
 class MazeEditor:
@@ -12,28 +29,59 @@ class MazeEditor:
         self.user = user
         self.state = STATE_MENU
         # Editor state
-        self.grid_width = 21
-        self.grid_height = 21
-        self.cell_size = 30
-        self.grid = [[EDITOR_TILE_EMPTY for _ in range(self.grid_width)]
-                     for _ in range(self.grid_height)]
+        self.grid_width = EDITOR_GRID_SIZES[0]
+        self.grid_height = EDITOR_GRID_SIZES[0]
+        self.grid = []
 
         # Current tool
         self.current_tool = EDITOR_TILE_WALL
+        self.mode = EDITOR_MODE_BRUSH
 
-        # Grid offset for scrolling
-        self.offset_x = 100
-        self.offset_y = 100
+        # Viewport: vùng màn hình hiển thị grid, view_x/view_y là ô (số thực)
+        # ở góc trên bên trái, cell_size là mức zoom hiện tại
+        self.viewport = pygame.Rect(220, 20, SCREEN_WIDTH - 240, SCREEN_HEIGHT - 40)
+        self.cell_size = 30
+        self.view_x = 0.0
+        self.view_y = 0.0
 
         # UI
-        self.font = pygame.font.Font(None, 24)
-        self.small_font = pygame.font.Font(None, 18)
+        self.font = get_font(24, face=None)
+        self.small_font = get_font(18, face=None)
 
         # Mouse state
         self.is_drawing = False
+        self.is_panning = False
+        self.drag_start = None  # ô bắt đầu khi kéo Line/Rectangle
+        self.drag_end = None
+        self.drag_mode = EDITOR_MODE_BRUSH  # mode và ô lúc bắt đầu kéo, dùng khi thả chuột
+        self.drag_tool = EDITOR_TILE_WALL
+
+        # Overview: một pixel cho mỗi ô, phóng to khi vẽ; chỉ các vùng đã đổi được vẽ lại
+        self.overview = None
+        self.dirty_rects = []  # (x, y, w, h, tile) theo ô, vẽ lại theo thứ tự
+
+        # Undo/redo: mỗi nét vẽ (nhấn tới thả chuột) là một bước
+        self.history = EditHistory(EDITOR_UNDO_MEMORY)
+        self._fill_job = None  # generator tô vùng, chạy từng phần mỗi frame (xem update)
+
+        # START -> EXIT còn đi được không, cập nhật dần theo các ô đã đổi
+        self.validator = ConnectivityValidator()
 
         # Initialize with border walls
+        self._new_grid(self.grid_width, self.grid_height)
+
+    def _new_grid(self, width: int, height: int):
+        """Replace the grid with an empty one of the given size and fit it in the view."""
+        self.grid_width = width
+        self.grid_height = height
+        # Mỗi hàng là một bytearray: ghi cả đoạn, dựng overview và đọc hàng đều ở tốc độ C
+        self.grid = [bytearray((EDITOR_TILE_EMPTY,)) * width for _ in range(height)]
         self._create_border()
+        self._rebuild_overview()
+        self._fit_view()
+        self._fill_job = None  # tô vùng dở trên grid cũ: bỏ luôn
+        self.history.clear()
+        self.validator.reset(self.grid)
 
     def _create_border(self):
         """Create walls around the border."""
@@ -48,22 +96,66 @@ class MazeEditor:
     def handle_event(self, event: pygame.event.Event):
 
         if event.type == pygame.MOUSEBUTTONDOWN:
-            if event.button == 1:  # Left click
-                self.is_drawing = True
-                self._paint_cell(event.pos)
+            if event.button in (1, 3) and self.is_filling:
+                pass  # Đang tô vùng: grid chỉ được đổi sau khi tô xong
+            elif event.button == 1:  # Left click
+                mode = self._active_mode()
+                if mode == EDITOR_MODE_BRUSH:
+                    self.is_drawing = True
+                    self.history.begin()
+                    self._paint_cell(event.pos)
+                elif mode == EDITOR_MODE_FILL:
+                    self._fill(event.pos)
+                else:
+                    self.drag_start = self.drag_end = self._cell_at(event.pos)
+                    self.drag_mode, self.drag_tool = mode, self.current_tool
+                    self.is_drawing = self.drag_start is not None
+            elif event.button == 2:  # Middle click
+                self.is_panning = True
             elif event.button == 3:  # Right click
+                self.history.begin()
                 self._erase_cell(event.pos)
+                self._end_stroke()
 
         elif event.type == pygame.MOUSEBUTTONUP:
             if event.button == 1:
                 self.is_drawing = False
+                if self.drag_start:
+                    self._apply_shape(pygame.key.get_mods() & pygame.KMOD_SHIFT)
+                    self.drag_start = self.drag_end = None
+                self._end_stroke()
+            elif event.button == 2:
+                self.is_panning = False
 
         elif event.type == pygame.MOUSEMOTION:
-            if self.is_drawing:
+            if self.is_panning:
+                self._pan(-event.rel[0], -event.rel[1])
+            elif self.is_drawing and self.drag_start:
+                self.drag_end = self._cell_at(event.pos) or self.drag_end
+            elif self.is_drawing:
                 self._paint_cell(event.pos)
 
+        elif event.type == pygame.MOUSEWHEEL:
+            self._zoom(event.y, pygame.mouse.get_pos())
+
         elif event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_1:
+            ctrl = event.mod & pygame.KMOD_CTRL
+            grid_keys = (pygame.K_n, pygame.K_l, pygame.K_c, pygame.K_s)
+            if (self.is_drawing or self.is_filling) and (
+                    event.key in grid_keys or ctrl and event.key in (pygame.K_z, pygame.K_y)):
+                # Đang kéo chuột / đang tô vùng: undo, xoá, lưu hay đổi grid giữa chừng sẽ cắt
+                # bước đang ghi làm đôi (hoặc ép tô hết ngay trong frame này)
+                pass
+            elif ctrl and event.key == pygame.K_z and event.mod & pygame.KMOD_SHIFT:
+                self._redo()
+            elif ctrl and event.key == pygame.K_z:
+                self._undo()
+            elif ctrl and event.key == pygame.K_y:
+                self._redo()
+            elif self.is_drawing and event.key in (pygame.K_1, pygame.K_2, pygame.K_3, pygame.K_4,
+                                                   pygame.K_5, pygame.K_TAB):
+                pass  # Không đổi ô / mode giữa nét vẽ
+            elif event.key == pygame.K_1:
                 self.current_tool = EDITOR_TILE_WALL
             elif event.key == pygame.K_2:
                 self.current_tool = EDITOR_TILE_EMPTY
@@ -73,6 +165,16 @@ class MazeEditor:
                 self.current_tool = EDITOR_TILE_EXIT
             elif event.key == pygame.K_5:
                 self.current_tool = EDITOR_TILE_ENEMY
+            elif event.key == pygame.K_TAB:
+                self.mode = EDITOR_MODES[(EDITOR_MODES.index(self.mode) + 1) % len(EDITOR_MODES)]
+            elif event.key in (pygame.K_EQUALS, pygame.K_PLUS, pygame.K_KP_PLUS):
+                self._zoom(1, self.viewport.center)
+            elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+                self._zoom(-1, self.viewport.center)
+            elif event.key == pygame.K_f:
+                self._fit_view()
+            elif event.key == pygame.K_n:
+                self._next_grid_size()
             elif event.key == pygame.K_c:
                 self._clear_grid()
             elif event.key == pygame.K_s:
@@ -82,12 +184,21 @@ class MazeEditor:
             elif event.key == pygame.K_ESCAPE:
                 return "exit"
 
+    def _cell_at(self, mouse_pos: tuple):
+        """Grid cell under a screen position, or None outside the grid."""
+        if not self.viewport.collidepoint(mouse_pos):
+            return None
+        grid_x = math.floor(self.view_x + (mouse_pos[0] - self.viewport.x) / self.cell_size)
+        grid_y = math.floor(self.view_y + (mouse_pos[1] - self.viewport.y) / self.cell_size)
+        if 0 <= grid_x < self.grid_width and 0 <= grid_y < self.grid_height:
+            return grid_x, grid_y
+        return None
+
     def _paint_cell(self, mouse_pos: tuple):
         """Paint a cell at mouse position."""
-        grid_x = (mouse_pos[0] - self.offset_x) // self.cell_size
-        grid_y = (mouse_pos[1] - self.offset_y) // self.cell_size
-
-        if 0 <= grid_x < self.grid_width and 0 <= grid_y < self.grid_height:
+        cell = self._cell_at(mouse_pos)
+        if cell:
+            grid_x, grid_y = cell
             # Don't allow overwriting borders
             if (grid_x == 0 or grid_x == self.grid_width - 1 or
                     grid_y == 0 or grid_y == self.grid_height - 1):
@@ -99,36 +210,174 @@ class MazeEditor:
             elif self.current_tool == EDITOR_TILE_EXIT:
                 self._clear_tile_type(EDITOR_TILE_EXIT)
 
-            self.grid[grid_y][grid_x] = self.current_tool
+            self._set_cell(grid_x, grid_y, self.current_tool)
+
+    def _active_mode(self) -> str:
+        """START and EXIT are single tiles, so they are always placed with the brush."""
+        if self.current_tool in (EDITOR_TILE_START, EDITOR_TILE_EXIT):
+            return EDITOR_MODE_BRUSH
+        return self.mode
+
+    @property
+    def is_filling(self) -> bool:
+        return self._fill_job is not None
+
+    def _fill(self, mouse_pos: tuple):
+        """
+        Start flood filling the region under the mouse with the current tile (one undo step).
+
+        A large or ragged region can take hundreds of thousands of spans,
+        so the fill runs as a job in update(), EDITOR_FILL_BUDGET seconds
+        per frame, and the region fills in over a few frames.
+        """
+        cell = self._cell_at(mouse_pos)
+        if not cell:
+            return
+        x, y = cell
+        target = self.grid[y][x]
+        if target == self.current_tool:
+            return
+        self._end_stroke()
+        self._fill_job = self._fill_steps(iter_flood_fill_spans(self.grid, x, y), self.current_tool, target)
+
+    def _fill_steps(self, spans, tile: int, old: int):
+        """Write the spans of a fill, EDITOR_FILL_BATCH per step, then push them as one undo step."""
+        # Runs được mã hoá từng lô: cả triệu tuple chờ tới cuối sẽ làm frame cuối (và GC) rất chậm
+        packed = []
+        runs = []
+        batch = []
+        for span in spans:
+            batch.append(span)
+            if len(batch) == EDITOR_FILL_BATCH:
+                self._write_spans(batch, tile, old, runs)
+                packed.append(self.history.pack(runs))
+                batch.clear()
+                runs.clear()
+                yield len(packed)
+        self._write_spans(batch, tile, old, runs)
+        packed.append(self.history.pack(runs))
+        self.history.push_packed(b"".join(packed))
+
+    def _run_fill(self, budget: float):
+        deadline = time.perf_counter() + budget
+        while self._fill_job is not None and time.perf_counter() < deadline:
+            if next(self._fill_job, None) is None:
+                self._fill_job = None
+
+    def _apply_shape(self, outline: bool):
+        """Draw the dragged line or rectangle with the tile chosen when the drag began (one undo step)."""
+        (x0, y0), (x1, y1) = self.drag_start, self.drag_end
+        if self.drag_mode == EDITOR_MODE_LINE:
+            spans = line_spans(x0, y0, x1, y1)
+        else:
+            spans = rect_spans(x0, y0, x1, y1, outline)
+        self._set_spans(clip_spans(spans, self.grid_width, self.grid_height), self.drag_tool)
 
     def _erase_cell(self, mouse_pos: tuple):
         """Erase a cell at mouse position."""
-        grid_x = (mouse_pos[0] - self.offset_x) // self.cell_size
-        grid_y = (mouse_pos[1] - self.offset_y) // self.cell_size
-
-        if 0 <= grid_x < self.grid_width and 0 <= grid_y < self.grid_height:
+        cell = self._cell_at(mouse_pos)
+        if cell:
+            grid_x, grid_y = cell
             # Don't allow erasing borders
             if (grid_x == 0 or grid_x == self.grid_width - 1 or
                     grid_y == 0 or grid_y == self.grid_height - 1):
                 return
 
-            self.grid[grid_y][grid_x] = EDITOR_TILE_EMPTY
+            self._set_cell(grid_x, grid_y, EDITOR_TILE_EMPTY)
 
     def _clear_tile_type(self, tile_type: int):
         """Clear all tiles of a specific type."""
-        for y in range(self.grid_height):
+        for y, row in enumerate(self.grid):
+            # `in` quét cả hàng ở tốc độ C; phần lớn hàng bị bỏ qua ngay
+            if tile_type not in row:
+                continue
             for x in range(self.grid_width):
-                if self.grid[y][x] == tile_type:
-                    self.grid[y][x] = EDITOR_TILE_EMPTY
+                if row[x] == tile_type:
+                    self._set_cell(x, y, EDITOR_TILE_EMPTY)
 
     def _clear_grid(self):
-        """Clear the entire grid."""
-        self.grid = [[EDITOR_TILE_EMPTY for _ in range(self.grid_width)]
-                     for _ in range(self.grid_height)]
-        self._create_border()
+        """Clear the entire grid (one undo step)."""
+        self._end_stroke()
+        width, height = self.grid_width, self.grid_height
+        runs = []
+        self._write_spans([(y, 1, width - 1) for y in range(1, height - 1)], EDITOR_TILE_EMPTY, None, runs)
+        border = [(0, 0, width), (height - 1, 0, width)]
+        border += [(y, x, x + 1) for y in range(1, height - 1) for x in (0, width - 1)]
+        self._write_spans(border, EDITOR_TILE_WALL, None, runs)
+        self.history.push(runs)
+
+    def _next_grid_size(self):
+        """Start a new, empty grid at the next size in EDITOR_GRID_SIZES."""
+        larger = [size for size in EDITOR_GRID_SIZES if size > self.grid_width]
+        size = larger[0] if larger else EDITOR_GRID_SIZES[0]
+        self._new_grid(size, size)
+
+    def _set_cell(self, x: int, y: int, tile: int):
+        """Change one cell, record it for undo and mark it for redrawing."""
+        if self.grid[y][x] != tile:
+            self.history.record(y * self.grid_width + x, self.grid[y][x])
+            self.grid[y][x] = tile
+            self._mark_dirty(x, y, 1, 1, tile)
+
+    def _set_spans(self, spans: list, tile: int, old: int = None):
+        """
+        Set every cell of the (y, x0, x1) spans to `tile` as one batched, undoable edit.
+
+        `old` is the value all those cells had, when the caller knows it
+        (flood fill); otherwise the old values are read run by run.
+        """
+        self._end_stroke()
+        runs = []
+        self._write_spans(spans, tile, old, runs)
+        self.history.push(runs)
+
+    def _write_spans(self, spans: list, tile: int, old, runs: list):
+        width = self.grid_width
+        for y, x0, x1 in spans:
+            row = self.grid[y]
+            length = x1 - x0
+            if old is not None:
+                runs.append((y * width + x0, length, old, tile))
+            else:
+                segment = row[x0:x1]
+                if segment.count(tile) == length:
+                    continue
+                x = x0
+                for value, group in groupby(segment):
+                    count = len(list(group))
+                    if value != tile:
+                        runs.append((y * width + x, count, value, tile))
+                    x += count
+            row[x0:x1] = bytes((tile,)) * length
+            self._mark_dirty(x0, y, length, 1, tile)
+
+    def _apply_runs(self, runs: list):
+        """Write (start, length, value) runs from the history back into the grid."""
+        width = self.grid_width
+        for start, length, value in runs:
+            while length:
+                y, x = divmod(start, width)
+                count = min(length, width - x)
+                self.grid[y][x:x + count] = bytes((value,)) * count
+                self._mark_dirty(x, y, count, 1, value)
+                start += count
+                length -= count
+
+    def _end_stroke(self):
+        if self.history.recording:
+            self.history.commit(self.grid, self.grid_width)
+
+    def _undo(self):
+        self._end_stroke()
+        self._apply_runs(self.history.undo())
+
+    def _redo(self):
+        self._end_stroke()
+        self._apply_runs(self.history.redo())
 
     def _save_maze(self):
         """Save the current maze to database."""
+        self._end_stroke()
         # Validate maze (must have start and exit)
         has_start = any(EDITOR_TILE_START in row for row in self.grid)
         has_exit = any(EDITOR_TILE_EXIT in row for row in self.grid)
@@ -136,9 +385,11 @@ class MazeEditor:
         if not has_start or not has_exit:
             print("Error: Maze must have both START and EXIT tiles!")
             return
+        if not self.validator.finish():
+            print("Error: EXIT cannot be reached from START!")
+            return
 
         # Generate name based on timestamp
-        import time
         name = f"Custom_Maze_{int(time.time())}"
 
         # Save to database
@@ -147,22 +398,57 @@ class MazeEditor:
 
     def _load_maze(self):
         """Load a maze from database."""
-        # Get user's mazes
-        mazes = self.db.get_custom_mazes(self.user['id'])
+        # Get user's most recent maze (metadata only; the grid is loaded below)
+        mazes = self.db.list_custom_mazes(self.user['id'], limit=1)
 
         if mazes:
-            # Load the most recent maze
-            maze_id, name, data, created_by, username = mazes[0]
+            maze_id, name, username, width, height, created_at = mazes[0]
             loaded_grid = self.db.load_custom_maze(maze_id)
 
             if loaded_grid:
-                self.grid = loaded_grid
+                self.grid = [bytearray(row) for row in loaded_grid]
                 self.grid_height = len(loaded_grid)
                 self.grid_width = len(loaded_grid[0])
+                self._rebuild_overview()
+                self._fit_view()
+                self._fill_job = None
+                self.history.clear()
+                self.validator.reset(self.grid)
                 print(f"Loaded maze: {name}")
         else:
             print("No saved mazes found!")
 
+    # ==================== View ====================
+    def _fit_view(self):
+        """Largest zoom level that shows the whole grid (or the smallest one), centred."""
+        fitting = [size for size in EDITOR_ZOOM_LEVELS
+                   if size * self.grid_width <= self.viewport.width
+                   and size * self.grid_height <= self.viewport.height]
+        self.cell_size = fitting[-1] if fitting else EDITOR_ZOOM_LEVELS[0]
+        self.view_x = (self.grid_width - self.viewport.width / self.cell_size) / 2
+        self.view_y = (self.grid_height - self.viewport.height / self.cell_size) / 2
+
+    def _zoom(self, steps: int, anchor: tuple):
+        """Change the zoom level by `steps`, keeping the cell under `anchor` in place."""
+        index = EDITOR_ZOOM_LEVELS.index(self.cell_size)
+        index = max(0, min(len(EDITOR_ZOOM_LEVELS) - 1, index + steps))
+        new_size = EDITOR_ZOOM_LEVELS[index]
+        if new_size == self.cell_size:
+            return
+        ax = anchor[0] - self.viewport.x
+        ay = anchor[1] - self.viewport.y
+        self.view_x += ax / self.cell_size - ax / new_size
+        self.view_y += ay / self.cell_size - ay / new_size
+        self.cell_size = new_size
+        self._pan(0, 0)
+
+    def _pan(self, dx: float, dy: float):
+        """Move the view by (dx, dy) screen pixels; at least half the viewport stays on the grid."""
+        cells_w = self.viewport.width / self.cell_size
+        cells_h = self.viewport.height / self.cell_size
+        self.view_x = max(-cells_w / 2, min(self.grid_width - cells_w / 2, self.view_x + dx / self.cell_size))
+        self.view_y = max(-cells_h / 2, min(self.grid_height - cells_h / 2, self.view_y + dy / self.cell_size))
+
     def update(self, dt: float):
         """
         Update editor state.
@@ -170,46 +456,110 @@ class MazeEditor:
         Args:
             dt: Delta time
         """
-        pass
+        keys = pygame.key.get_pressed()
+        dx = keys[pygame.K_RIGHT] - keys[pygame.K_LEFT]
+        dy = keys[pygame.K_DOWN] - keys[pygame.K_UP]
+        if dx or dy:
+            self._pan(dx * EDITOR_PAN_SPEED * dt, dy * EDITOR_PAN_SPEED * dt)
+        self._run_fill(EDITOR_FILL_BUDGET)
+        self.validator.update(dt)
 
     def render(self):
         """Render the editor."""
         self.screen.fill(BLACK)
 
         # Draw grid
-        for y in range(self.grid_height):
-            for x in range(self.grid_width):
-                screen_x = self.offset_x + x * self.cell_size
-                screen_y = self.offset_y + y * self.cell_size
-
-                # Get tile color
-                tile = self.grid[y][x]
-                if tile == EDITOR_TILE_WALL:
-                    color = GRAY
-                elif tile == EDITOR_TILE_START:
-                    color = BLUE
-                elif tile == EDITOR_TILE_EXIT:
-                    color = GREEN
-                elif tile == EDITOR_TILE_ENEMY:
-                    color = RED
-                else:
-                    color = BLACK
-
-                # Draw cell
-                pygame.draw.rect(self.screen, color,
-                                 (screen_x, screen_y, self.cell_size, self.cell_size))
-
-                # Draw grid lines
-                pygame.draw.rect(self.screen, DARK_GRAY,
-                                 (screen_x, screen_y, self.cell_size, self.cell_size), 1)
+        self._redraw_dirty()
+        self._render_grid()
+        self._render_drag_preview()
 
         # Draw UI
         self._render_ui()
 
+    def _rebuild_overview(self):
+        """Build the one-pixel-per-cell overview from the grid (after the grid is replaced)."""
+        data = b"".join(self.grid)
+        self.overview = pygame.image.frombytes(data, (self.grid_width, self.grid_height), "P")
+        self.overview.set_palette(_PALETTE)
+        self.dirty_rects.clear()
+
+    def _mark_dirty(self, x: int, y: int, w: int, h: int, tile: int):
+        self.dirty_rects.append((x, y, w, h, tile))
+        self.validator.mark(x, y, w, h, tile)
+
+    def _redraw_dirty(self):
+        # Mỗi fill() tốn như dựng lại khoảng 64 ô, bất kể rect lớn hay nhỏ:
+        # quá nhiều rect (tô vùng lởm chởm, undo lớn) thì dựng lại cả overview nhanh hơn
+        if len(self.dirty_rects) > self.grid_width * self.grid_height // 64:
+            self._rebuild_overview()
+            return
+        for x, y, w, h, tile in self.dirty_rects:
+            self.overview.fill(_TILE_COLORS[tile], (x, y, w, h))
+        self.dirty_rects.clear()
+
+    def _render_grid(self):
+        """
+        Draw the visible part of the grid.
+
+        Only the cells inside the viewport are taken from the overview and
+        scaled up, so the cost depends on the viewport size, not on the grid
+        size or the zoom level. Grid lines are only drawn when cells are at
+        least EDITOR_LOD_CELL_SIZE pixels.
+        """
+        cs = self.cell_size
+        vp = self.viewport
+        x0 = max(0, math.floor(self.view_x))
+        y0 = max(0, math.floor(self.view_y))
+        x1 = min(self.grid_width, math.ceil(self.view_x + vp.width / cs))
+        y1 = min(self.grid_height, math.ceil(self.view_y + vp.height / cs))
+        if x1 <= x0 or y1 <= y0:
+            return
+
+        visible = (x0, y0, x1 - x0, y1 - y0)
+        area = self.overview.subsurface(visible)
+        # Ô đi được nhưng không tới được từ START
+        unreachable = self.validator.highlight.subsurface(visible)
+        if cs > 1:
+            area = pygame.transform.scale(area, ((x1 - x0) * cs, (y1 - y0) * cs))
+            unreachable = pygame.transform.scale(unreachable, area.get_size())
+        left = vp.x + round((x0 - self.view_x) * cs)
+        top = vp.y + round((y0 - self.view_y) * cs)
+
+        self.screen.set_clip(vp)
+        self.screen.blit(area, (left, top))
+        self.screen.blit(unreachable, (left, top))
+        if cs >= EDITOR_LOD_CELL_SIZE:
+            right = left + (x1 - x0) * cs
+            bottom = top + (y1 - y0) * cs
+            for x in range(left, right + 1, cs):
+                pygame.draw.line(self.screen, DARK_GRAY, (x, top), (x, bottom))
+            for y in range(top, bottom + 1, cs):
+                pygame.draw.line(self.screen, DARK_GRAY, (left, y), (right, y))
+        self.screen.set_clip(None)
+
+    def _render_drag_preview(self):
+        """Outline of the line or rectangle being dragged."""
+        if not (self.drag_start and self.drag_end):
+            return
+        (x0, y0), (x1, y1) = self.drag_start, self.drag_end
+        if self.drag_mode == EDITOR_MODE_LINE:
+            rects = [(start, y, end - start, 1) for y, start, end in line_spans(x0, y0, x1, y1)]
+        else:
+            rects = [(min(x0, x1), min(y0, y1), abs(x1 - x0) + 1, abs(y1 - y0) + 1)]
+        cs = self.cell_size
+        left = self.viewport.x - self.view_x * cs
+        top = self.viewport.y - self.view_y * cs
+        border = 2 if cs >= EDITOR_LOD_CELL_SIZE else 1
+        self.screen.set_clip(self.viewport)
+        for x, y, w, h in rects:
+            pygame.draw.rect(self.screen, YELLOW,
+                             (round(left + x * cs), round(top + y * cs), math.ceil(w * cs), math.ceil(h * cs)), border)
+        self.screen.set_clip(None)
+
     def _render_ui(self):
         """Render UI elements."""
         # Title
-        title = self.font.render("MAZE EDITOR", True, CYAN)
+        title = render_text(self.font, "MAZE EDITOR", True, CYAN)
         self.screen.blit(title, (20, 20))
 
         # Tool selection
@@ -224,22 +574,48 @@ class MazeEditor:
         y = 60
         for i, (tile_type, name, color) in enumerate(tools, start=1):
             prefix = ">> " if self.current_tool == tile_type else "   "
-            text = self.small_font.render(f"{prefix}{i}. {name}", True, color)
+            text = render_text(self.small_font, f"{prefix}{i}. {name}", True, color)
+            self.screen.blit(text, (20, y))
+            y += 25
+
+        # Grid info
+        y += 15
+        history = self.history
+        for line in (f"Mode: {self._active_mode()}" + (" (filling...)" if self.is_filling else ""),
+                     f"Grid: {self.grid_width}x{self.grid_height}",
+                     f"Zoom: {self.cell_size} px/cell"):
+            text = render_text(self.small_font, line, True, WHITE)
+            self.screen.blit(text, (20, y))
+            y += 25
+        # Bộ đếm đổi sau mỗi nét vẽ: render thẳng, không làm tràn cache nhãn
+        for line in (f"Undo: {history.undo_steps}  Redo: {history.redo_steps}",
+                     f"History: {history.memory / 1024:.1f} / {history.memory_limit // 1024} KiB"):
+            text = self.small_font.render(line, True, WHITE)
             self.screen.blit(text, (20, y))
             y += 25
+        status = self.validator.status
+        color = GREEN if status == "OK" else LIGHT_GRAY if self.validator.checking else RED
+        self.screen.blit(render_text(self.small_font, f"Path: {status}", True, color), (20, y))
 
         # Instructions
         instructions = [
             "Left Click: Paint",
             "Right Click: Erase",
+            "TAB: Brush/Line/Rect/Fill",
+            "Shift: Rectangle Outline",
+            "Wheel / +-: Zoom",
+            "Middle Drag / Arrows: Pan",
+            "F: Fit View",
+            "N: New Grid (next size)",
+            "Ctrl+Z / Ctrl+Y: Undo / Redo",
             "C: Clear Grid",
             "S: Save Maze",
             "L: Load Maze",
             "ESC: Exit Editor"
         ]
 
-        y = SCREEN_HEIGHT - 180
+        y = SCREEN_HEIGHT - 25 * len(instructions) - 30
         for instruction in instructions:
-            text = self.small_font.render(instruction, True, LIGHT_GRAY)
+            text = render_text(self.small_font, instruction, True, LIGHT_GRAY)
             self.screen.blit(text, (20, y))
             y += 25
\ No newline at end of file
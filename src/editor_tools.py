@@ -0,0 +1,106 @@
+from typing import Iterator, List, Tuple
+
+# (y, x0, x1): các ô x0 <= x < x1 trên hàng y
+Span = Tuple[int, int, int]
+
+
+def flood_fill_spans(grid: List[List[int]], start_x: int, start_y: int) -> List[Span]:
+    """Spans of the 4-connected region of equal tiles containing (start_x, start_y)."""
+    return list(iter_flood_fill_spans(grid, start_x, start_y))
+
+
+def iter_flood_fill_spans(grid: List[List[int]], start_x: int, start_y: int) -> Iterator[Span]:
+    """
+    Lazily yield the spans of flood_fill_spans().
+
+    Scanline fill: each row is turned into a bytearray mask (1 = same tile
+    as the start, not yet filled) the first time it is reached, and spans
+    are found and cleared with find/rfind and slice assignment, so the work
+    in Python is per span, not per cell. The outer border is never part of
+    the region.
+
+    The caller may write each span into `grid` before asking for the next
+    one (rows are read only once, and a filled cell no longer matches), but
+    must not change the grid in any other way until the fill is done.
+    """
+    height = len(grid)
+    width = len(grid[0])
+    if not (0 < start_x < width - 1 and 0 < start_y < height - 1):
+        return
+    target = grid[start_y][start_x]
+    table = bytes(1 if value == target else 0 for value in range(256))
+
+    masks = {}
+    stack = [(start_y, start_x, start_x + 1)]
+    while stack:
+        y, left, right = stack.pop()
+        mask = masks.get(y)
+        if mask is None:
+            mask = masks[y] = bytearray(bytes(grid[y]).translate(table))
+            mask[0] = mask[width - 1] = 0
+
+        x = mask.find(1, left, right)
+        while x != -1:
+            # Chỉ span bắt đầu đúng tại `left` mới có thể kéo dài sang trái
+            x0 = mask.rfind(0, 0, x) + 1 if x == left else x
+            x1 = mask.find(0, x)  # ô biên luôn là 0 nên luôn tìm thấy
+            mask[x0:x1] = bytes(x1 - x0)
+            yield y, x0, x1
+            # Bỏ qua hàng kề đã tô hết đoạn này: stack không phình ra bởi các đoạn chết
+            for ny in (y - 1, y + 1):
+                if 0 < ny < height - 1:
+                    near = masks.get(ny)
+                    if near is None or near.find(1, x0, x1) != -1:
+                        stack.append((ny, x0, x1))
+            x = mask.find(1, x1, right)
+
+
+def line_spans(x0: int, y0: int, x1: int, y1: int) -> List[Span]:
+    """Bresenham line from (x0, y0) to (x1, y1), merged into horizontal spans."""
+    dx = abs(x1 - x0)
+    dy = -abs(y1 - y0)
+    step_x = 1 if x0 < x1 else -1
+    step_y = 1 if y0 < y1 else -1
+    error = dx + dy
+    spans = []
+    x, y = x0, y0
+    while True:
+        if spans and spans[-1][0] == y:
+            row, left, right = spans[-1]
+            spans[-1] = (row, min(left, x), max(right, x + 1))
+        else:
+            spans.append((y, x, x + 1))
+        if x == x1 and y == y1:
+            return spans
+        double = 2 * error
+        if double >= dy:
+            error += dy
+            x += step_x
+        if double <= dx:
+            error += dx
+            y += step_y
+
+
+def rect_spans(x0: int, y0: int, x1: int, y1: int, outline: bool = False) -> List[Span]:
+    """Spans of the rectangle with corners (x0, y0) and (x1, y1), both included."""
+    left, right = min(x0, x1), max(x0, x1) + 1
+    top, bottom = min(y0, y1), max(y0, y1)
+    if not outline or right - left <= 2 or bottom - top <= 1:
+        return [(y, left, right) for y in range(top, bottom + 1)]
+    spans = [(top, left, right)]
+    for y in range(top + 1, bottom):
+        spans.append((y, left, left + 1))
+        spans.append((y, right - 1, right))
+    spans.append((bottom, left, right))
+    return spans
+
+
+def clip_spans(spans: List[Span], width: int, height: int) -> List[Span]:
+    """Cut spans to the editable area inside the border walls."""
+    clipped = []
+    for y, x0, x1 in spans:
+        if 0 < y < height - 1:
+            x0, x1 = max(x0, 1), min(x1, width - 1)
+            if x0 < x1:
+                clipped.append((y, x0, x1))
+    return clipped
@@ -4,11 +4,23 @@ import math
 from typing import Tuple
 from src.untils.constants import (
     ENEMY_SPEED, ENEMY_SIZE, ENEMY_DAMAGE, ENEMY_COOLDOWN,
-    TILE_SIZE, CELL_WALL, RED, ORANGE
+    TILE_SIZE, RED, ORANGE
 )
+from src.collision import sweep_x, sweep_y
 
 class Enemy:
+    __slots__ = (
+        "grid_x", "grid_y", "x", "y", "size", "speed", "damage",
+        "velocity_x", "velocity_y",
+        "patrol_target", "direction_timer", "direction_change_time",
+        "attack_cooldown", "color", "pulse",
+    )
+
     def __init__(self, x: int, y: int):
+        self.reset(x, y)
+
+    def reset(self, x: int, y: int):
+        """Đặt lại toàn bộ trạng thái để tái sử dụng enemy ở vị trí mới."""
         self.grid_x = x
         self.grid_y = y
         self.x = x * TILE_SIZE + TILE_SIZE // 2
@@ -53,18 +65,19 @@ class Enemy:
         else:
             self._patrol(dt)
 
-        # Update position with collision
-        new_x = self.x + self.velocity_x * self.speed * dt
-        new_y = self.y + self.velocity_y * self.speed * dt
+        # Update position with swept collision
+        half = self.size / 2
+        step_x = self.velocity_x * self.speed * dt
+        step_y = self.velocity_y * self.speed * dt
 
-        if not self._check_collision(new_x, self.y, maze):
-            self.x = new_x
-        else:
+        target_x = self.x + step_x
+        self.x = sweep_x(self.x, self.y, step_x, half, maze)
+        if self.x != target_x:
             self.velocity_x *= -1  # Bounce
 
-        if not self._check_collision(self.x, new_y, maze):
-            self.y = new_y
-        else:
+        target_y = self.y + step_y
+        self.y = sweep_y(self.x, self.y, step_y, half, maze)
+        if self.y != target_y:
             self.velocity_y *= -1
 
         # Update grid position
@@ -94,29 +107,6 @@ class Enemy:
             self.direction_timer = 0
             self.direction_change_time = random.uniform(1.0, 3.0)
 
-    # ==================== COLLISION ====================
-    def _check_collision(self, x: float, y: float, maze: list) -> bool:
-        """Check for wall collisions."""
-        half = self.size / 2
-        corners = [
-            (x - half, y - half),
-            (x + half, y - half),
-            (x - half, y + half),
-            (x + half, y + half)
-        ]
-
-        for cx, cy in corners:
-            gx = int(cx // TILE_SIZE)
-            gy = int(cy // TILE_SIZE)
-
-            if gy < 0 or gy >= len(maze) or gx < 0 or gx >= len(maze[0]):
-                return True
-
-            if maze[gy][gx] == CELL_WALL:
-                return True
-
-        return False
-
     # ==================== PLAYER INTERACTION ====================
     def check_collision_with_player(self, player) -> bool:
         """Return True if colliding with player."""
@@ -134,23 +124,85 @@ class Enemy:
             self.attack_cooldown = ENEMY_COOLDOWN
 
     # ==================== RENDER ====================
+    def _frame_blit(self, camera_offset: Tuple[int, int]):
+        """Return the (frame, position) pair for the current animation frame."""
+        # Pulsing size: int() already quantises the pulse to a handful of radii
+        pulse_size = int(math.sin(self.pulse) * 2 + self.size // 2)
+        frame = get_enemy_frame(self.color, self.size, pulse_size)
+        radius = pulse_size + 2
+        return frame, (int(self.x - camera_offset[0]) - radius,
+                       int(self.y - camera_offset[1]) - radius)
+
     def render(self, screen: pygame.Surface, camera_offset: Tuple[int, int] = (0, 0)):
         """Render enemy with pulsing animation."""
-        screen_x = int(self.x - camera_offset[0])
-        screen_y = int(self.y - camera_offset[1])
+        frame, pos = self._frame_blit(camera_offset)
+        screen.blit(frame, pos)
 
-        # Pulsing size
-        pulse_size = int(math.sin(self.pulse) * 2 + self.size // 2)
+    @staticmethod
+    def render_all(enemies: list, screen: pygame.Surface,
+                   camera_offset: Tuple[int, int] = (0, 0)):
+        """Render every enemy with a single Surface.blits call."""
+        if enemies:
+            # blits nhận mọi iterable: generator không dựng list mới mỗi frame
+            screen.blits((enemy._frame_blit(camera_offset) for enemy in enemies), doreturn=False)
+
+
+# Pre-rendered enemy frames, shared by all enemies: (color, size, pulse_size) -> Surface
+_frame_cache = {}
+_FRAME_COLORKEY = (255, 0, 255)
+
+
+def get_enemy_frame(color: Tuple[int, int, int], size: int, pulse_size: int) -> pygame.Surface:
+    """Return the cached sprite for one pulse radius, drawing it on first use."""
+    key = (color, size, pulse_size)
+    frame = _frame_cache.get(key)
+    if frame is None:
+        radius = pulse_size + 2
+        frame = pygame.Surface((radius * 2 + 1, radius * 2 + 1))
+        frame.fill(_FRAME_COLORKEY)
+        center = (radius, radius)
 
         # Outer glow
-        pygame.draw.circle(screen, ORANGE, (screen_x, screen_y), pulse_size + 2, 2)
+        pygame.draw.circle(frame, ORANGE, center, radius, 2)
 
         # Main body
-        pygame.draw.circle(screen, self.color, (screen_x, screen_y), pulse_size)
+        pygame.draw.circle(frame, color, center, pulse_size)
 
         # Eyes
-        eye_offset = self.size // 4
-        pygame.draw.circle(screen, (255, 255, 255),
-                           (screen_x - eye_offset // 2, screen_y - eye_offset // 2), 3)
-        pygame.draw.circle(screen, (255, 255, 255),
-                           (screen_x + eye_offset // 2, screen_y - eye_offset // 2), 3)
+        eye_offset = size // 4
+        pygame.draw.circle(frame, (255, 255, 255),
+                           (radius - eye_offset // 2, radius - eye_offset // 2), 3)
+        pygame.draw.circle(frame, (255, 255, 255),
+                           (radius + eye_offset // 2, radius - eye_offset // 2), 3)
+
+        # Colorkey + RLE blits much faster than per-pixel alpha (draw.circle is not antialiased)
+        if pygame.display.get_surface() is not None:
+            frame = frame.convert()
+        frame.set_colorkey(_FRAME_COLORKEY, pygame.RLEACCEL)
+        _frame_cache[key] = frame
+    return frame
+
+
+class EnemyPool:
+    """Keeps released enemies around so new levels reuse them instead of allocating."""
+
+    __slots__ = ("_free",)
+
+    def __init__(self):
+        self._free = []
+
+    def acquire(self, x: int, y: int) -> Enemy:
+        """Return a pooled enemy reset to (x, y), or a new one if the pool is empty."""
+        if self._free:
+            enemy = self._free.pop()
+            enemy.reset(x, y)
+            return enemy
+        return Enemy(x, y)
+
+    def release_all(self, enemies: list):
+        """Return every enemy in the list to the pool and empty the list in place."""
+        self._free.extend(enemies)
+        enemies.clear()
+
+    def __len__(self) -> int:
+        return len(self._free)
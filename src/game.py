@@ -2,15 +2,16 @@
 import pygame
 from typing import Optional, List
 from src.player import Player
-from src.enemy import Enemy
+from src.enemy import Enemy, EnemyPool
 from src.maze_generator import MazeGenerator
-from src.database import DatabaseManager
+from src.database import DatabaseManager, period_bucket
 from src.UI.UIManager import UIManager
 from src.UI.InputBox import InputBox
 from src.UI.SkinSelector import SkinSelectorUI
 from src.editor import MazeEditor
 from src.untils.constants import *
-from src.untils.font_manager import get_font
+from src.untils.font_manager import get_font, render_text, render_value, preload_font
+from src.untils.asset_loader import AssetLoader
 from src.untils.sound_manager import SoundManager
 
 class Game:
@@ -20,13 +21,13 @@ class Game:
         self.screen = screen
         self.should_quit = False
 
-        # Database
-        self.db = DatabaseManager()
+        # Database (mở kết nối khi cần lần đầu, không chặn frame menu đầu tiên)
+        self._db = None
 
         # UI Manager
         self.ui = UIManager(screen)
 
-        # Game state
+        # Game state (vào thẳng menu; asset của các màn hình khác nạp nền phía sau)
         self.state = STATE_MENU
         self.current_user = None
 
@@ -37,6 +38,8 @@ class Game:
         self.maze = None
         self.player = None
         self.enemies = []
+        self.enemy_pool = EnemyPool()
+        self.exit_pos = None
         self.maze_width = MIN_MAZE_SIZE
         self.maze_height = MIN_MAZE_SIZE
 
@@ -47,6 +50,10 @@ class Game:
         # Editor
         self.editor = None
 
+        # Leaderboard đang xem và bản đã render: (cache key, [Surface])
+        self.leaderboard_period = LEADERBOARD_ALL
+        self._leaderboard_surfaces = None
+
         # Fonts
         self.font = get_font(UI_FONT_SIZE)
         self.small_font = get_font(UI_SMALL_FONT_SIZE)
@@ -54,12 +61,21 @@ class Game:
         # Âm thanh
         self.sounds = SoundManager()
 
+        # Asset nạp nền (âm thanh, font của các màn hình khác menu)
+        self.loader = AssetLoader()
+        self._loader_checked = False
+
         # Form đăng nhập / đăng ký
-        self.state = STATE_MENU
         self.input_username = InputBox(SCREEN_WIDTH // 2 - 150, 220, 300, 40, self.font)
         self.input_password = InputBox(SCREEN_WIDTH // 2 - 150, 280, 300, 40, self.font, password=True)
         self.login_message = ''
 
+    @property
+    def db(self) -> DatabaseManager:
+        if self._db is None:
+            self._db = DatabaseManager()
+        return self._db
+
     def handle_event(self, event: pygame.event.Event):
         if event.type == pygame.USEREVENT + 1:
             pygame.time.set_timer(pygame.USEREVENT + 1, 0)
@@ -88,7 +104,15 @@ class Game:
                 self.state = STATE_MENU
 
 
+    def start_loading(self):
+        """Queue non-menu assets on the background loader; the menu stays usable meanwhile."""
+        self.sounds.preload(self.loader)
+        for size in (22, 28, 36):  # SkinSelectorUI
+            preload_font(self.loader, size)
+
     def update(self, dt: float):
+        if not self._loader_checked:
+            self._check_loader()
         if self.state == STATE_PLAYING:
             self._update_playing(dt)
         elif self.state == STATE_EDITOR:
@@ -121,7 +145,11 @@ class Game:
 
     def cleanup(self):
         """Cleanup resources."""
-        self.db.close()
+        self.loader.shutdown()
+        if self._db is not None:
+            # Ghi nốt các lệnh còn trong hàng đợi write-behind trước khi đóng
+            self._db.flush()
+            self._db.close()
 
     # ==================== Game State Methods ====================
 
@@ -189,11 +217,14 @@ class Game:
                 # Guest / không đăng nhập => skin mặc định
                 self.player = Player(start_pos[0], start_pos[1], skin_id=1)
 
-        # --- Tạo enemy ---
-        self.enemies = []
+        # --- Tạo enemy (tái sử dụng từ pool của level trước) ---
+        self.enemy_pool.release_all(self.enemies)
         enemy_positions = self._find_all_cell_type(CELL_ENEMY)
         for ex, ey in enemy_positions:
-            self.enemies.append(Enemy(ex, ey))
+            self.enemies.append(self.enemy_pool.acquire(ex, ey))
+
+        # Vị trí exit không đổi trong level -> tìm một lần thay vì mỗi frame
+        self.exit_pos = self._find_cell_type(CELL_EXIT)
 
     def next_level(self):
         """Progress to next level."""
@@ -221,6 +252,14 @@ class Game:
 
     # ==================== Update Methods ====================
 
+    def _check_loader(self):
+        """Report, once, the background assets that failed to load."""
+        if not self.loader.done:
+            return
+        self._loader_checked = True
+        for name, error in self.loader.errors():
+            print(f"[AssetLoader] Warning: could not load {name}: {error}")
+
     def _update_playing(self, dt: float):
         """Update playing state."""
         if not self.player or not self.maze:
@@ -234,8 +273,9 @@ class Game:
         self.player.update(dt, self.maze)
 
         # Update enemies
+        player_pos = (self.player.x, self.player.y)
         for enemy in self.enemies:
-            enemy.update(dt, self.maze, (self.player.x, self.player.y))
+            enemy.update(dt, self.maze, player_pos)
 
             # Check collision with player
             if enemy.check_collision_with_player(self.player):
@@ -246,7 +286,7 @@ class Game:
         self._update_camera()
 
         # Check win condition (reached exit)
-        exit_pos = self._find_cell_type(CELL_EXIT)
+        exit_pos = self.exit_pos
         if exit_pos and self.player.grid_x == exit_pos[0] and self.player.grid_y == exit_pos[1]:
             self.sounds.play("win")
             if self.current_user:
@@ -292,7 +332,7 @@ class Game:
         self.screen.fill(BLACK)
 
         # Tiêu đề
-        title = self.large_font.render("ĐĂNG NHẬP", True, CYAN)
+        title = render_text(self.large_font, "ĐĂNG NHẬP", True, CYAN)
         self.screen.blit(title, (SCREEN_WIDTH // 2 - title.get_width() // 2, 100))
 
         # Ô nhập username & password
@@ -300,11 +340,11 @@ class Game:
         self.input_password.draw(self.screen)
 
         # Nút hướng dẫn
-        hint = self.small_font.render("Nhấn ENTER để đăng nhập | ESC để quay lại", True, GRAY)
+        hint = render_text(self.small_font, "Nhấn ENTER để đăng nhập | ESC để quay lại", True, GRAY)
         self.screen.blit(hint, (SCREEN_WIDTH // 2 - hint.get_width() // 2, 350))
 
         # Liên kết đăng ký
-        register_hint = self.small_font.render("Chưa có tài khoản? Nhấn R để đăng ký", True, YELLOW)
+        register_hint = render_text(self.small_font, "Chưa có tài khoản? Nhấn R để đăng ký", True, YELLOW)
         self.screen.blit(register_hint, (SCREEN_WIDTH // 2 - register_hint.get_width() // 2, 380))
 
         # Thông báo lỗi/thành công
@@ -313,13 +353,13 @@ class Game:
 
     def _render_register(self):
         self.screen.fill(BLACK)
-        title = self.large_font.render("REGISTER", True, CYAN)
+        title = render_text(self.large_font, "REGISTER", True, CYAN)
         self.screen.blit(title, (SCREEN_WIDTH // 2 - title.get_width() // 2, 100))
 
         self.input_username.draw(self.screen)
         self.input_password.draw(self.screen)
 
-        note = self.small_font.render("ENTER để đăng ký | ESC để quay lại", True, GRAY)
+        note = render_text(self.small_font, "ENTER để đăng ký | ESC để quay lại", True, GRAY)
         self.screen.blit(note, (SCREEN_WIDTH // 2 - note.get_width() // 2, 350))
 
         msg = self.small_font.render(self.login_message, True, YELLOW)
@@ -557,12 +597,16 @@ class Game:
             self.sounds.play("select")
             if event.key == pygame.K_ESCAPE:
                 self.state = STATE_MENU
+            elif event.key in (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_TAB):
+                step = -1 if event.key == pygame.K_LEFT else 1
+                index = LEADERBOARD_PERIODS.index(self.leaderboard_period)
+                self.leaderboard_period = LEADERBOARD_PERIODS[(index + step) % len(LEADERBOARD_PERIODS)]
 
     # ==================== Render Methods ====================
 
     def _render_menu(self):
         """Render main menu."""
-        title = self.large_font.render("MAZE ADVENTURE", True, CYAN)
+        title = render_text(self.large_font, "MAZE ADVENTURE", True, CYAN)
         self.screen.blit(title, (SCREEN_WIDTH // 2 - title.get_width() // 2, 100))
 
         menu_items = [
@@ -577,12 +621,12 @@ class Game:
 
         y = 250
         for item in menu_items:
-            text = self.font.render(item, True, WHITE)
+            text = render_text(self.font, item, True, WHITE)
             self.screen.blit(text, (SCREEN_WIDTH // 2 - text.get_width() // 2, y))
             y += 50
 
         if self.current_user:
-            user_text = self.small_font.render(
+            user_text = render_text(self.small_font, 
                 f"Logged in as: {self.current_user['username']}",
                 True, GREEN
             )
@@ -617,8 +661,7 @@ class Game:
                         )
 
             # Enemy
-            for enemy in self.enemies:
-                enemy.render(maze_surface, (0, 0))
+            Enemy.render_all(self.enemies, maze_surface, (0, 0))
 
             # Player
             self.player.render(maze_surface, (0, 0))
@@ -637,9 +680,8 @@ class Game:
             # --- Trường hợp mê cung nhỏ (hiển thị full kích thước + camera theo player) ---
             self._render_maze()
 
-            for enemy in self.enemies:
-                enemy.render(self.screen, (self.camera_x - self.maze_offset_x,
-                                           self.camera_y - self.maze_offset_y))
+            Enemy.render_all(self.enemies, self.screen, (self.camera_x - self.maze_offset_x,
+                                                         self.camera_y - self.maze_offset_y))
             self.player.render(self.screen, (self.camera_x - self.maze_offset_x,
                                              self.camera_y - self.maze_offset_y))
 
@@ -675,7 +717,7 @@ class Game:
                          (0, SCREEN_HEIGHT - UI_PANEL_HEIGHT, SCREEN_WIDTH, UI_PANEL_HEIGHT))
 
         # Health bar
-        health_text = self.small_font.render("Health:", True, WHITE)
+        health_text = render_text(self.small_font, "Health:", True, WHITE)
         self.screen.blit(health_text, (20, SCREEN_HEIGHT - UI_PANEL_HEIGHT + 10))
 
         health_bar_width = 200
@@ -691,8 +733,8 @@ class Game:
                          (20, SCREEN_HEIGHT - UI_PANEL_HEIGHT + 35, health_bar_width, health_bar_height), 2)
 
         # Score and Level
-        score_text = self.font.render(f"Score: {self.score}", True, YELLOW)
-        level_text = self.font.render(f"Level: {self.level}", True, CYAN)
+        score_text = render_value(self.font, "Score: {}", self.score, True, YELLOW)
+        level_text = render_value(self.font, "Level: {}", self.level, True, CYAN)
 
         self.screen.blit(score_text, (SCREEN_WIDTH - 250, SCREEN_HEIGHT - UI_PANEL_HEIGHT + 10))
         self.screen.blit(level_text, (SCREEN_WIDTH - 250, SCREEN_HEIGHT - UI_PANEL_HEIGHT + 40))
@@ -708,64 +750,91 @@ class Game:
         self.screen.blit(overlay, (0, 0))
 
         # Paused text
-        text = self.large_font.render("PAUSED", True, WHITE)
+        text = render_text(self.large_font, "PAUSED", True, WHITE)
         self.screen.blit(text, (SCREEN_WIDTH // 2 - text.get_width() // 2, SCREEN_HEIGHT // 2 - 50))
 
-        text2 = self.font.render("Press P or ESC to Resume", True, GRAY)
+        text2 = render_text(self.font, "Press P or ESC to Resume", True, GRAY)
         self.screen.blit(text2, (SCREEN_WIDTH // 2 - text2.get_width() // 2, SCREEN_HEIGHT // 2 + 20))
 
-        text3 = self.font.render("Press Q to Quit to Menu", True, GRAY)
+        text3 = render_text(self.font, "Press Q to Quit to Menu", True, GRAY)
         self.screen.blit(text3, (SCREEN_WIDTH // 2 - text3.get_width() // 2, SCREEN_HEIGHT // 2 + 60))
 
     def _render_game_over(self):
         """Render game over screen."""
-        title = self.large_font.render("GAME OVER", True, RED)
+        title = render_text(self.large_font, "GAME OVER", True, RED)
         self.screen.blit(title, (SCREEN_WIDTH // 2 - title.get_width() // 2, 150))
 
-        score_text = self.font.render(f"Final Score: {self.score}", True, YELLOW)
-        level_text = self.font.render(f"Reached Level: {self.level}", True, CYAN)
+        score_text = render_value(self.font, "Final Score: {}", self.score, True, YELLOW)
+        level_text = render_value(self.font, "Reached Level: {}", self.level, True, CYAN)
 
         self.screen.blit(score_text, (SCREEN_WIDTH // 2 - score_text.get_width() // 2, 250))
         self.screen.blit(level_text, (SCREEN_WIDTH // 2 - level_text.get_width() // 2, 300))
 
-        restart_text = self.font.render("Press R to Restart", True, GREEN)
-        menu_text = self.font.render("Press Q for Menu", True, GRAY)
+        restart_text = render_text(self.font, "Press R to Restart", True, GREEN)
+        menu_text = render_text(self.font, "Press Q for Menu", True, GRAY)
 
         self.screen.blit(restart_text, (SCREEN_WIDTH // 2 - restart_text.get_width() // 2, 400))
         self.screen.blit(menu_text, (SCREEN_WIDTH // 2 - menu_text.get_width() // 2, 450))
 
     def _render_level_complete(self):
         """Render level complete screen."""
-        title = self.large_font.render("LEVEL COMPLETE!", True, GREEN)
+        title = render_text(self.large_font, "LEVEL COMPLETE!", True, GREEN)
         self.screen.blit(title, (SCREEN_WIDTH // 2 - title.get_width() // 2, 150))
 
-        level_text = self.font.render(f"Level {self.level} Completed!", True, CYAN)
-        score_text = self.font.render(f"Score: {self.score}", True, YELLOW)
+        level_text = render_value(self.font, "Level {} Completed!", self.level, True, CYAN)
+        score_text = render_value(self.font, "Score: {}", self.score, True, YELLOW)
 
         self.screen.blit(level_text, (SCREEN_WIDTH // 2 - level_text.get_width() // 2, 250))
         self.screen.blit(score_text, (SCREEN_WIDTH // 2 - score_text.get_width() // 2, 300))
 
-        continue_text = self.font.render("Press SPACE to Continue", True, WHITE)
+        continue_text = render_text(self.font, "Press SPACE to Continue", True, WHITE)
         self.screen.blit(continue_text, (SCREEN_WIDTH // 2 - continue_text.get_width() // 2, 400))
 
+    def _leaderboard_lines(self) -> List[pygame.Surface]:
+        """Rendered leaderboard rows and rank line, rebuilt only when they change."""
+        period = self.leaderboard_period
+        user_id = self.current_user['id'] if self.current_user else None
+        key = (self.db.leaderboard_version, period, period_bucket(period), user_id)
+        if self._leaderboard_surfaces is None or self._leaderboard_surfaces[0] != key:
+            leaderboard = self.db.get_leaderboard(10, period)
+            if leaderboard:
+                lines = [
+                    self.font.render(f"{i + 1}. {username} - Score: {score} - Level: {level}",
+                                     True, WHITE if i > 0 else YELLOW)
+                    for i, (username, score, level) in enumerate(leaderboard)
+                ]
+            else:
+                lines = [self.font.render("No scores yet!", True, GRAY)]
+
+            if user_id is not None:
+                rank = self.db.get_user_rank(user_id, period)
+                if rank:
+                    text = (f"Your rank: #{rank['rank']} of {rank['players']} "
+                            f"(top {max(1, round(rank['top_percent']))}%)")
+                    lines.append(self.font.render(text, True, GREEN))
+                else:
+                    lines.append(self.font.render("You have no score on this board yet", True, GRAY))
+            self._leaderboard_surfaces = (key, lines)
+        return self._leaderboard_surfaces[1]
+
     def _render_leaderboard(self):
         """Render leaderboard."""
-        title = self.large_font.render("LEADERBOARD", True, CYAN)
+        title = render_text(self.large_font, "LEADERBOARD", True, CYAN)
         self.screen.blit(title, (SCREEN_WIDTH // 2 - title.get_width() // 2, 50))
 
-        # Get leaderboard data
-        leaderboard = self.db.get_leaderboard(10)
+        # Tabs: Today / This Week / All Time
+        tab_width = 180
+        x = SCREEN_WIDTH // 2 - tab_width * len(LEADERBOARD_PERIODS) // 2
+        for period in LEADERBOARD_PERIODS:
+            color = YELLOW if period == self.leaderboard_period else GRAY
+            tab = render_text(self.small_font, LEADERBOARD_TITLES[period], True, color)
+            self.screen.blit(tab, (x + tab_width // 2 - tab.get_width() // 2, 105))
+            x += tab_width
 
         y = 150
-        if leaderboard:
-            for i, (username, score, level) in enumerate(leaderboard):
-                rank_text = f"{i + 1}. {username} - Score: {score} - Level: {level}"
-                text = self.font.render(rank_text, True, WHITE if i > 0 else YELLOW)
-                self.screen.blit(text, (SCREEN_WIDTH // 2 - text.get_width() // 2, y))
-                y += 40
-        else:
-            text = self.font.render("No scores yet!", True, GRAY)
+        for text in self._leaderboard_lines():
             self.screen.blit(text, (SCREEN_WIDTH // 2 - text.get_width() // 2, y))
+            y += 40
 
-        back_text = self.small_font.render("Press ESC to go back", True, GRAY)
+        back_text = render_text(self.small_font, "LEFT/RIGHT: change board  -  ESC: go back", True, GRAY)
         self.screen.blit(back_text, (SCREEN_WIDTH // 2 - back_text.get_width() // 2, SCREEN_HEIGHT - 50))
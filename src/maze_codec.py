@@ -0,0 +1,53 @@
+import hashlib
+import struct
+import zlib
+from typing import List, Tuple
+
+# Header: magic, width, height (little-endian)
+MAGIC = b"MZG1"
+_HEADER = struct.Struct("<4sHH")
+
+# Lookup tables for packing/unpacking two 4-bit cells per byte
+_SHIFT_HIGH = bytes((i << 4) & 0xFF for i in range(256))
+_HIGH = bytes(i >> 4 for i in range(256))
+_LOW = bytes(i & 0x0F for i in range(256))
+
+
+def encode_grid(grid: List[List[int]]) -> Tuple[bytes, str]:
+    """
+    Pack a grid into the binary maze format.
+
+    Returns (blob, content_hash). The blob is the header followed by the
+    zlib-compressed cells at 4 bits each; the hash is taken over the
+    uncompressed data so identical grids always hash the same.
+    """
+    height = len(grid)
+    width = len(grid[0]) if grid else 0
+    cells = bytes(cell for row in grid for cell in row)
+    if len(cells) != width * height:
+        raise ValueError("Maze rows must all have the same width")
+    if cells and max(cells) > 0x0F:
+        raise ValueError("Maze cell values must fit in 4 bits")
+
+    high = cells[0::2].translate(_SHIFT_HIGH)
+    low = cells[1::2]
+    if len(low) < len(high):
+        low += b"\0"
+    packed = bytes(map(int.__or__, high, low))
+
+    header = _HEADER.pack(MAGIC, width, height)
+    content_hash = hashlib.sha1(header + packed).hexdigest()
+    return header + zlib.compress(packed, 9), content_hash
+
+
+def decode_grid(blob: bytes) -> List[List[int]]:
+    """Unpack a blob produced by encode_grid() back into a list of rows."""
+    magic, width, height = _HEADER.unpack_from(blob, 0)
+    if magic != MAGIC:
+        raise ValueError("Not a packed maze grid")
+    packed = zlib.decompress(blob[_HEADER.size:])
+
+    cells = bytearray(len(packed) * 2)
+    cells[0::2] = packed.translate(_HIGH)
+    cells[1::2] = packed.translate(_LOW)
+    return [list(cells[y * width:(y + 1) * width]) for y in range(height)]
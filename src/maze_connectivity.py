@@ -0,0 +1,333 @@
+import time
+from array import array
+from collections import deque
+from typing import List, Optional
+
+import pygame
+from src.untils.constants import *
+
+# bytes(row).translate(...): 1 cho ô đi được, 0 cho tường
+_PASSABLE = bytes(0 if value == EDITOR_TILE_WALL else 1 for value in range(256))
+_MARKED = (*EDITOR_UNREACHABLE_COLOR, EDITOR_UNREACHABLE_ALPHA)
+_CLEAR = (0, 0, 0, 0)
+
+
+class ConnectivityValidator:
+    """
+    Keeps START -> EXIT reachability of the editor grid up to date while painting.
+
+    Passable cells (anything but a wall) are grouped with a union-find over
+    cell indices (y * width + x). The editor reports every change with
+    mark(); update() then works off the changes within a time budget:
+
+    - cells that became passable are unioned with their passable
+      neighbours, which is exact and cheap;
+    - union-find cannot split a set, so walls are collected and, once the
+      user has paused for EDITOR_VALIDATE_DEBOUNCE seconds, a bounded BFS
+      checks that the cells around them are still connected. If that fails
+      (or the change was too large to absorb), the whole grid is relabelled
+      row by row, a few rows per frame;
+    - a wall that passed the check still sits in the set of its old region,
+      so reopening it also relabels the grid: unioning it would join the
+      cell to a region it may no longer touch.
+
+    `highlight` is a translucent surface, one pixel per cell like the
+    editor overview, that marks passable cells which cannot be reached
+    from START. The grid border is assumed to be wall, as the editor keeps
+    it.
+    """
+
+    def __init__(self):
+        self.grid: List[List[int]] = []
+        self.width = 0
+        self.height = 0
+        self.parent = array("i")
+        self.highlight: Optional[pygame.Surface] = None
+        self.start: Optional[int] = None
+        self.exit: Optional[int] = None
+        self.stale = True  # union-find không còn đúng, phải gán nhãn lại cả grid
+        self._pending = []  # (x, y, w, h, tile) chưa xử lý
+        self._walls = []  # ô vừa thành tường, chờ kiểm tra BFS
+        self._closed = set()  # tường đã qua kiểm tra BFS nhưng vẫn nằm trong tập cũ (tới lần gán nhãn sau)
+        self._quiet = 0.0  # số giây không có thay đổi nào
+        self._job = None  # generator gán nhãn lại / tô lại highlight, chạy từng phần mỗi frame
+        self._repaint = False
+
+    def reset(self, grid: List[List[int]]):
+        """Start over on a new or replaced grid; it is labelled without waiting for the debounce."""
+        self.grid = grid
+        self.width = len(grid[0])
+        self.height = len(grid)
+        self.parent = array("i", [0]) * (self.width * self.height)
+        self.highlight = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+        self._pending.clear()
+        self._walls.clear()
+        self._closed.clear()
+        self._find_endpoints()
+        self.stale = True
+        self._quiet = EDITOR_VALIDATE_DEBOUNCE
+        self._job = None
+        self._repaint = False
+
+    def mark(self, x: int, y: int, w: int, h: int, tile: int):
+        """Cells in the rectangle were set to `tile`."""
+        self._pending.append((x, y, w, h, tile))
+
+    # ==================== Status ====================
+    @property
+    def checking(self) -> bool:
+        return bool(self.stale or self._walls or self._pending)
+
+    @property
+    def solvable(self) -> bool:
+        if self.start is None or self.exit is None or self.checking:
+            return False
+        return self._find(self.start) == self._find(self.exit)
+
+    @property
+    def status(self) -> str:
+        if self.start is None or self.exit is None:
+            return "missing START/EXIT"
+        if self.checking:
+            return "checking..."
+        return "OK" if self.solvable else "EXIT unreachable"
+
+    # ==================== Work ====================
+    def update(self, dt: float, budget: float = EDITOR_VALIDATE_BUDGET):
+        """Process changes, spending at most about `budget` seconds."""
+        deadline = time.perf_counter() + budget
+        if self._pending:
+            self._quiet = 0.0
+            self._absorb()
+        else:
+            self._quiet += dt
+
+        if self._quiet >= EDITOR_VALIDATE_DEBOUNCE:
+            if self._walls and not self.stale:
+                self.stale = not self._check_walls()
+                if not self.stale:
+                    grid, width = self.grid, self.width
+                    self._closed.update(cell for cell in self._walls
+                                        if grid[cell // width][cell % width] == EDITOR_TILE_WALL)
+                self._walls.clear()
+            if self.stale and not self._relabelling:
+                self._job = self._relabel()
+        if self._repaint and self._job is None and not self.stale:
+            self._repaint = False
+            self._job = self._paint()
+
+        while self._job is not None and time.perf_counter() < deadline:
+            if next(self._job, None) is None:
+                self._job = None
+
+    def finish(self) -> bool:
+        """Do all outstanding work now, ignoring the debounce and budget; returns `solvable`."""
+        while self.checking or self._job is not None or self._repaint:
+            # update() đặt lại _quiet mỗi khi có thay đổi mới, nên phải đặt lại ở mỗi vòng
+            self._quiet = EDITOR_VALIDATE_DEBOUNCE
+            self.update(0.0, budget=float("inf"))
+        return self.solvable
+
+    @property
+    def _relabelling(self) -> bool:
+        return self._job is not None and self._job.__name__ == "_relabel"
+
+    def _absorb(self):
+        """Apply the pending changes to the union-find, or give up and mark it stale."""
+        pending, self._pending = self._pending, []
+        area = sum(w * h for _, _, w, h, _ in pending)
+        old_start = self.start
+        self._track_endpoints(pending)
+        if self.start != old_start:
+            self._repaint = True
+
+        if self.stale or area > EDITOR_VALIDATE_UNION_LIMIT or self._reopens(pending):
+            # Quá nhiều ô (tô vùng, undo lớn) hoặc mở lại tường cũ: gán nhãn lại sau khi người dùng dừng tay
+            self.stale = True
+            self._walls.clear()
+            if self._relabelling:
+                self._job = None
+        else:
+            start_root = self._find(self.start) if self.start is not None else None
+            width = self.width
+            for x, y, w, h, tile in pending:
+                if tile == EDITOR_TILE_WALL:
+                    for row in range(y, y + h):
+                        self._walls.extend(range(row * width + x, row * width + x + w))
+                    self.highlight.fill(_CLEAR, (x, y, w, h))
+                    continue
+                for row in range(y, y + h):
+                    for cell in range(row * width + x, row * width + x + w):
+                        self._join(cell, start_root)
+                if start_root is not None:
+                    start_root = self._find(self.start)
+                    unreachable = self._find(y * width + x) != start_root
+                    self.highlight.fill(_MARKED if unreachable else _CLEAR, (x, y, w, h))
+
+    def _reopens(self, pending: list) -> bool:
+        """True if a change makes one of the `_closed` walls passable again."""
+        if not self._closed:
+            return False
+        width = self.width
+        for x, y, w, h, tile in pending:
+            if tile == EDITOR_TILE_WALL:
+                continue
+            for row in range(y, y + h):
+                if not self._closed.isdisjoint(range(row * width + x, row * width + x + w)):
+                    return True
+        return False
+
+    def _track_endpoints(self, pending: list):
+        """
+        Follow START/EXIT through the changes without scanning the grid.
+
+        The editor keeps at most one of each, so the last cell set to START
+        is the start, and a start that was painted over is gone.
+        """
+        width = self.width
+        for x, y, w, h, tile in pending:
+            if tile == EDITOR_TILE_START:
+                self.start = y * width + x
+            elif tile == EDITOR_TILE_EXIT:
+                self.exit = y * width + x
+        if self.start is not None and self.grid[self.start // width][self.start % width] != EDITOR_TILE_START:
+            self.start = None
+        if self.exit is not None and self.grid[self.exit // width][self.exit % width] != EDITOR_TILE_EXIT:
+            self.exit = None
+
+    def _join(self, cell: int, start_root: Optional[int]):
+        """Union a cell that became passable with its passable neighbours."""
+        grid = self.grid
+        width = self.width
+        y, x = divmod(cell, width)
+        for neighbour, nx, ny in ((cell - 1, x - 1, y), (cell + 1, x + 1, y),
+                                  (cell - width, x, y - 1), (cell + width, x, y + 1)):
+            if grid[ny][nx] == EDITOR_TILE_WALL:
+                continue
+            a, b = self._find(cell), self._find(neighbour)
+            if a == b:
+                continue
+            # Nối thêm một vùng vào vùng của START: các ô của vùng đó hết bị đánh dấu
+            if start_root is not None and (a == start_root or b == start_root):
+                self._repaint = True
+            self.parent[a] = b
+
+    def _find(self, cell: int) -> int:
+        parent = self.parent
+        while parent[cell] != cell:
+            parent[cell] = parent[parent[cell]]  # path halving
+            cell = parent[cell]
+        return cell
+
+    def _check_walls(self) -> bool:
+        """
+        True if the new walls did not split any region.
+
+        The passable neighbours of the new walls are grouped by their old
+        region; a BFS from one cell of each group must reach all the others
+        without visiting more than EDITOR_VALIDATE_BFS_LIMIT cells in total.
+        """
+        grid = self.grid
+        width = self.width
+        groups = {}
+        for cell in self._walls:
+            y, x = divmod(cell, width)
+            if grid[y][x] != EDITOR_TILE_WALL:
+                continue  # đã được vẽ lại thành ô đi được: _join đã xử lý
+            for neighbour in (cell - 1, cell + 1, cell - width, cell + width):
+                ny, nx = divmod(neighbour, width)
+                if grid[ny][nx] != EDITOR_TILE_WALL:
+                    groups.setdefault(self._find(neighbour), set()).add(neighbour)
+
+        budget = EDITOR_VALIDATE_BFS_LIMIT
+        for targets in groups.values():
+            if len(targets) < 2:
+                continue
+            first = next(iter(targets))
+            remaining = len(targets) - 1
+            seen = {first}
+            queue = deque((first,))
+            while queue and remaining:
+                cell = queue.popleft()
+                budget -= 1
+                if budget < 0:
+                    return False
+                for neighbour in (cell - 1, cell + 1, cell - width, cell + width):
+                    if neighbour in seen:
+                        continue
+                    ny, nx = divmod(neighbour, width)
+                    if grid[ny][nx] == EDITOR_TILE_WALL:
+                        continue
+                    seen.add(neighbour)
+                    queue.append(neighbour)
+                    if neighbour in targets:
+                        remaining -= 1
+            if remaining:
+                return False
+        return True
+
+    def _find_endpoints(self):
+        self.start = self.exit = None
+        for y, row in enumerate(self.grid):
+            # `in` quét cả hàng ở tốc độ C
+            if EDITOR_TILE_START in row:
+                self.start = y * self.width + row.index(EDITOR_TILE_START)
+            if EDITOR_TILE_EXIT in row:
+                self.exit = y * self.width + row.index(EDITOR_TILE_EXIT)
+
+    def _row_runs(self, y: int):
+        """(x0, x1) runs of passable cells in row y."""
+        mask = bytes(self.grid[y]).translate(_PASSABLE)
+        runs = []
+        x = mask.find(1)
+        while x != -1:
+            end = mask.find(0, x)
+            if end == -1:
+                end = self.width
+            runs.append((x, end))
+            x = mask.find(1, end)
+        return runs
+
+    def _relabel(self):
+        """Rebuild the union-find from scratch, one row per step."""
+        parent = self.parent
+        width = self.width
+        previous = []
+        for y in range(self.height):
+            base = y * width
+            parent[base:base + width] = array("i", range(base, base + width))
+            runs = self._row_runs(y)
+            for x0, x1 in runs:
+                parent[base + x0 + 1:base + x1] = array("i", [base + x0]) * (x1 - x0 - 1)
+            # Nối các đoạn chồng lên đoạn của hàng trên
+            i = j = 0
+            while i < len(runs) and j < len(previous):
+                (x0, x1), (p0, p1) = runs[i], previous[j]
+                if x0 < p1 and p0 < x1:
+                    a, b = self._find(base + x0), self._find(base - width + p0)
+                    if a != b:
+                        parent[a] = b
+                if x1 < p1:
+                    i += 1
+                else:
+                    j += 1
+            previous = runs
+            yield y
+        if self._pending or self._walls:
+            return  # có thay đổi trong lúc chạy: stale vẫn đúng, sẽ chạy lại
+        self.stale = False
+        self._closed.clear()
+        self._repaint = True
+
+    def _paint(self):
+        """Redraw `highlight` from the union-find, one row per step."""
+        width = self.width
+        start_root = self._find(self.start) if self.start is not None else None
+        for y in range(self.height):
+            self.highlight.fill(_CLEAR, (0, y, width, 1))
+            if start_root is not None:
+                base = y * width
+                for x0, x1 in self._row_runs(y):
+                    if self._find(base + x0) != start_root:
+                        self.highlight.fill(_MARKED, (x0, y, x1 - x0, 1))
+            yield y
@@ -0,0 +1,149 @@
+"""
+Multiplayer Client
+==================
+Connects to src/net/server.py, sends one INPUT per tick and keeps the latest
+authoritative world state decoded from the server's delta snapshots.
+SpectatorClient watches a running session without playing.
+"""
+import asyncio
+import json
+from typing import List, Optional
+from src.maze_codec import decode_grid
+from src.net.conditioner import LinkConditioner
+from src.net.protocol import (
+    MSG_JOIN, MSG_WELCOME, MSG_SNAPSHOT, MSG_ERROR, MSG_SPECTATE, FRAME_HEADER_SIZE, NO_BASELINE,
+    read_frame, json_frame, parse_welcome, input_frame, decode_snapshot, WorldState
+)
+from src.untils.constants import NET_HOST, NET_PORT
+
+
+class ConnectionRefused(Exception):
+    """The server answered JOIN with an error."""
+
+
+class NetClient:
+    """
+    Headless connection to a game server; the game or a load test drives it.
+
+    latency (round trip, seconds), jitter and loss are simulated on both
+    directions with LinkConditioner, for testing on localhost.
+    """
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, loss: float = 0.0,
+                 seed: Optional[int] = None):
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+        self.player_id = 0
+        self.tick_rate = 0
+        self.maze: Optional[List[List[int]]] = None
+
+        self.state: WorldState = {}
+        self.tick = 0  # tick của snapshot mới nhất
+        self.ack = 0  # seq của input cuối cùng server đã áp dụng
+        self.seq = 0  # seq của input cuối cùng đã gửi
+
+        self.uplink = LinkConditioner(latency / 2, jitter / 2, loss, seed=seed)
+        self.downlink = LinkConditioner(latency / 2, jitter / 2, loss,
+                                        seed=None if seed is None else seed + 1)
+
+        self.bytes_received = 0
+        self.snapshots_received = 0
+        self._receive_task: Optional[asyncio.Task] = None
+
+    async def connect(self, session_code: str, username: str, password: str,
+                      host: str = NET_HOST, port: int = NET_PORT):
+        """Connect and join a session; raises ConnectionRefused if the server says no."""
+        await self._open(host, port, json_frame(MSG_JOIN, {
+            "session": session_code, "username": username, "password": password
+        }))
+
+    async def _open(self, host: str, port: int, request: bytes):
+        self.reader, self.writer = await asyncio.open_connection(host, port)
+        self.writer.write(request)
+        msg_type, payload = await read_frame(self.reader)
+        if msg_type == MSG_ERROR:
+            self.writer.close()
+            raise ConnectionRefused(json.loads(payload)["error"])
+        if msg_type != MSG_WELCOME:
+            self.writer.close()
+            raise ConnectionRefused(f"unexpected message {msg_type}")
+
+        info, maze_blob = parse_welcome(payload)
+        self.player_id = info["player_id"]
+        self.tick_rate = info["tick_rate"]
+        self.tick = info["tick"]
+        self.maze = decode_grid(maze_blob)
+        self._receive_task = asyncio.create_task(self._receive_loop())
+
+    def send_input(self, dx: int, dy: int) -> int:
+        """Send the input for the next tick; returns its sequence number."""
+        self.seq += 1
+        data = input_frame(self.seq, dx, dy)
+        if self.uplink.active:
+            self.uplink.send(self._write, data)
+        else:
+            self._write(data)
+        return self.seq
+
+    def _write(self, data: bytes):
+        if not self.writer.is_closing():
+            self.writer.write(data)
+
+    async def _receive_loop(self):
+        try:
+            while True:
+                msg_type, payload = await read_frame(self.reader)
+                if self.downlink.active:
+                    self.downlink.send(self._deliver, msg_type, payload)
+                else:
+                    self._deliver(msg_type, payload)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+
+    def _deliver(self, msg_type: int, payload: bytes):
+        self.bytes_received += FRAME_HEADER_SIZE + len(payload)
+        if msg_type == MSG_SNAPSHOT:
+            self.on_snapshot(payload)
+
+    def on_snapshot(self, payload: bytes):
+        """Apply one snapshot to the held state."""
+        self.tick, _, self.ack, self.state = decode_snapshot(payload, self.state)
+        self.snapshots_received += 1
+
+    @property
+    def connected(self) -> bool:
+        return self._receive_task is not None and not self._receive_task.done()
+
+    async def close(self):
+        if self.writer:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except ConnectionError:
+                pass
+        if self._receive_task:
+            await asyncio.gather(self._receive_task, return_exceptions=True)
+
+
+class SpectatorClient(NetClient):
+    """Watches a running session; receives the same snapshots as the players but sends nothing."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.full_snapshots = 0  # lần đầu + mỗi lần server bỏ frame vì client đọc chậm
+
+    async def connect(self, session_code: str, host: str = NET_HOST, port: int = NET_PORT):
+        """Start watching a session; raises ConnectionRefused if it is not running."""
+        await self._open(host, port, json_frame(MSG_SPECTATE, {"session": session_code}))
+
+    def send_input(self, dx: int, dy: int) -> int:
+        raise RuntimeError("Spectators cannot send input")
+
+    def on_snapshot(self, payload: bytes):
+        tick, baseline_tick, _, state = decode_snapshot(payload, self.state)
+        if baseline_tick == NO_BASELINE:
+            self.full_snapshots += 1
+        elif baseline_tick != self.tick:
+            raise ValueError(f"Delta against tick {baseline_tick} but holding tick {self.tick}")
+        self.tick, self.state = tick, state
+        self.snapshots_received += 1
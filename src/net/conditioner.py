@@ -0,0 +1,43 @@
+import asyncio
+import random
+from typing import Callable, Optional
+
+
+class LinkConditioner:
+    """
+    Artificial latency, jitter and packet loss for one direction of a connection.
+
+    send() schedules a callback after `delay` (+ up to `jitter`) seconds on
+    the running event loop. The game protocol runs over TCP, so a lost
+    packet is not dropped: it is retransmitted after `retransmit` seconds
+    and everything sent after it waits behind it (head-of-line blocking),
+    which is how loss actually shows up to the game.
+    """
+
+    def __init__(self, delay: float = 0.0, jitter: float = 0.0, loss: float = 0.0,
+                 retransmit: Optional[float] = None, seed: Optional[int] = None):
+        self.delay = delay
+        self.jitter = jitter
+        self.loss = loss
+        # Linux không cho RTO dưới 200 ms
+        self.retransmit = retransmit if retransmit is not None else max(0.2, 4 * delay)
+        self._rng = random.Random(seed)
+        self._last_release = 0.0
+        self.sent = 0
+        self.lost = 0
+
+    @property
+    def active(self) -> bool:
+        return self.delay > 0 or self.jitter > 0 or self.loss > 0
+
+    def send(self, callback: Callable, *args):
+        loop = asyncio.get_running_loop()
+        release = loop.time() + self.delay + self._rng.uniform(0, self.jitter)
+        if self._rng.random() < self.loss:
+            release += self.retransmit
+            self.lost += 1
+        # Giữ thứ tự như TCP: không gói nào tới trước gói gửi trước nó
+        release = max(release, self._last_release)
+        self._last_release = release
+        self.sent += 1
+        loop.call_at(release, callback, *args)
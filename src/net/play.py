@@ -0,0 +1,163 @@
+"""
+Networked Play
+==============
+Joins a session on the multiplayer server and plays it with client-side
+prediction (see src/net/prediction.py). Latency and loss can be simulated
+to check how it feels on a bad connection while running on localhost.
+
+Usage:
+    python -m src.net.play SESSION USERNAME PASSWORD [--host H] [--port P]
+                           [--latency 0.15] [--jitter 0.015] [--loss 0.02]
+"""
+import argparse
+import asyncio
+import pygame
+from src.enemy import Enemy, EnemyPool
+from src.net.client import ConnectionRefused
+from src.net.prediction import PredictedClient
+from src.net.protocol import (
+    KIND_PLAYER, KIND_ENEMY, FLAG_DEAD, FLAG_INVULNERABLE, flags_direction, keys_to_direction
+)
+from src.player import Player
+from src.untils.constants import *
+from src.untils.font_manager import get_font
+from src.untils.sound_manager import MutedSoundManager
+
+
+class NetworkView:
+    """Draws the predicted local player and the interpolated remote entities."""
+
+    def __init__(self, screen: pygame.Surface, client: PredictedClient):
+        self.screen = screen
+        self.client = client
+        self.font = get_font(UI_SMALL_FONT_SIZE)
+        self.maze_surface = self._draw_maze(client.maze)
+        self.offset = ((SCREEN_WIDTH - self.maze_surface.get_width()) // 2,
+                       (SCREEN_HEIGHT - UI_PANEL_HEIGHT - self.maze_surface.get_height()) // 2)
+        self.enemy_pool = EnemyPool()
+        self.enemies = {}  # entity id -> Enemy chỉ dùng để vẽ
+        self.players = {}  # entity id -> Player chỉ dùng để vẽ
+
+    @staticmethod
+    def _draw_maze(maze) -> pygame.Surface:
+        surface = pygame.Surface((len(maze[0]) * TILE_SIZE, len(maze) * TILE_SIZE))
+        surface.fill(BLACK)
+        for y, row in enumerate(maze):
+            for x, cell in enumerate(row):
+                rect = (x * TILE_SIZE, y * TILE_SIZE, TILE_SIZE, TILE_SIZE)
+                if cell == CELL_WALL:
+                    pygame.draw.rect(surface, DARK_GRAY, rect)
+                    pygame.draw.rect(surface, GRAY, rect, 1)
+                elif cell == CELL_EXIT:
+                    pygame.draw.rect(surface, GREEN, rect)
+                elif cell == CELL_START:
+                    pygame.draw.rect(surface, BLUE, rect)
+        return surface.convert()
+
+    def render(self, dt: float):
+        self.screen.fill(BLACK)
+        self.screen.blit(self.maze_surface, self.offset)
+        camera = (-self.offset[0], -self.offset[1])
+
+        remote = self.client.remote_entities()
+        seen = set()
+        for entity_id, (kind, x, y, health, flags) in remote.items():
+            seen.add(entity_id)
+            if kind == KIND_ENEMY:
+                enemy = self.enemies.get(entity_id)
+                if enemy is None:
+                    enemy = self.enemies[entity_id] = self.enemy_pool.acquire(0, 0)
+                enemy.x, enemy.y = x, y
+                enemy.pulse += dt * 5
+            elif kind == KIND_PLAYER:
+                player = self.players.get(entity_id)
+                if player is None:
+                    player = self.players[entity_id] = Player(0, 0, skin_value=str(entity_id % len(SKINS) + 1))
+                    player.sound = MutedSoundManager()
+                player.x, player.y, player.health = x, y, health
+                player.velocity_x, player.velocity_y = flags_direction(flags)
+                # Nhấp nháy như Player.render khi server báo đang miễn thương
+                if flags & FLAG_INVULNERABLE:
+                    player.damage_cooldown = (player.damage_cooldown - dt) % player.invulnerable_time
+                else:
+                    player.damage_cooldown = 0
+                if not flags & FLAG_DEAD:
+                    player.render(self.screen, camera)
+        for entity_id in [e for e in self.enemies if e not in seen]:
+            self.enemy_pool.release_all([self.enemies.pop(entity_id)])
+        for entity_id in [p for p in self.players if p not in seen]:
+            del self.players[entity_id]
+        Enemy.render_all(list(self.enemies.values()), self.screen, camera)
+
+        me = self.client.player
+        if me is not None:
+            saved = me.x, me.y
+            me.x, me.y = self.client.player_position()
+            me.render(self.screen, camera)
+            me.x, me.y = saved
+            self._render_panel(me)
+
+    def _render_panel(self, me: Player):
+        pygame.draw.rect(self.screen, DARK_GRAY,
+                         (0, SCREEN_HEIGHT - UI_PANEL_HEIGHT, SCREEN_WIDTH, UI_PANEL_HEIGHT))
+        client = self.client
+        lines = (
+            f"Health: {me.health}   Players: {1 + len(self.players)}   Tick: {client.tick}",
+            f"Pending inputs: {len(client.pending)}   Corrections: {len(client.corrections)}   "
+            f"Underruns: {client.underruns}   Lost packets: {client.uplink.lost + client.downlink.lost}",
+        )
+        for i, line in enumerate(lines):
+            text = self.font.render(line, True, WHITE)  # bộ đếm đổi mỗi tick: không qua cache
+            self.screen.blit(text, (20, SCREEN_HEIGHT - UI_PANEL_HEIGHT + 10 + i * 28))
+
+
+async def run(args):
+    pygame.display.init()
+    pygame.font.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption(f"{WINDOW_TITLE} - {args.session}")
+
+    client = PredictedClient(latency=args.latency, jitter=args.jitter, loss=args.loss)
+    try:
+        await client.connect(args.session, args.username, args.password, args.host, args.port)
+    except (ConnectionRefused, OSError) as e:
+        print(f"[Network] Could not join {args.session}: {e}")
+        return
+    view = NetworkView(screen, client)
+
+    # Vòng lặp frame chạy trong event loop: chờ bằng asyncio.sleep thay vì clock.tick
+    # để socket và độ trễ giả lập vẫn được xử lý giữa các frame
+    loop = asyncio.get_running_loop()
+    frame_time = 1.0 / FPS
+    last = loop.time()
+    running = True
+    while running and client.connected:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                running = False
+        now = loop.time()
+        dt, last = now - last, now
+        client.update(dt, *keys_to_direction(pygame.key.get_pressed()))
+        view.render(dt)
+        pygame.display.flip()
+        await asyncio.sleep(max(0.0, frame_time - (loop.time() - now)))
+
+    await client.close()
+    pygame.quit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play a multiplayer session.")
+    parser.add_argument("session")
+    parser.add_argument("username")
+    parser.add_argument("password")
+    parser.add_argument("--host", default=NET_HOST)
+    parser.add_argument("--port", type=int, default=NET_PORT)
+    parser.add_argument("--latency", type=float, default=0.0, help="simulated round trip, seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="simulated jitter, seconds")
+    parser.add_argument("--loss", type=float, default=0.0, help="simulated packet loss, 0..1")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
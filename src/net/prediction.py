@@ -0,0 +1,162 @@
+"""
+Client Prediction
+=================
+PredictedClient hides network latency on top of NetClient:
+
+  - Prediction: every tick the local input is sent and also applied to a
+    local Player at once (the same step_player() the server runs), so the
+    player moves on the frame the key is pressed.
+  - Reconciliation: each snapshot says which input the server applied last
+    (ack). The local player is reset to the authoritative position and the
+    inputs the server has not seen yet are replayed. The difference to the
+    old prediction is not snapped away but faded out over a few frames.
+  - Interpolation: other entities are drawn NET_INTERP_DELAY behind the
+    newest snapshot, blending the two buffered snapshots around that time,
+    so they move smoothly even though snapshots arrive at the tick rate
+    with jitter.
+"""
+import asyncio
+import math
+from collections import deque
+from typing import Dict, Optional, Tuple
+from src.net.client import NetClient
+from src.net.protocol import decode_snapshot, dequantize, step_player, WorldState
+from src.player import Player
+from src.untils.constants import NET_INTERP_DELAY, NET_SNAPSHOT_BUFFER, NET_CORRECTION_DECAY
+from src.untils.sound_manager import MutedSoundManager
+
+# (kind, x, y, health, flags) với x, y đã đổi về pixel
+RenderState = Tuple[int, float, float, int, int]
+
+
+class PredictedClient(NetClient):
+    """NetClient with local prediction, server reconciliation and entity interpolation."""
+
+    def __init__(self, *args, interp_delay: float = NET_INTERP_DELAY, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.interp_delay = interp_delay
+        self.player: Optional[Player] = None
+        self.pending = deque()  # (seq, dx, dy) server chưa xác nhận
+        self._accumulator = 0.0
+        self._previous = (0.0, 0.0)  # vị trí dự đoán ở tick trước, để nội suy khi vẽ
+        self._error = [0.0, 0.0]  # sai lệch sau reconcile, giảm dần về 0
+
+        self.snapshots = deque(maxlen=NET_SNAPSHOT_BUFFER)  # (tick, WorldState)
+        self._clock_offset = None  # ước lượng (server tick / tick_rate) - giờ local
+
+        # Số liệu
+        self.corrections = []  # độ lớn mỗi lần sửa (pixel), bỏ qua các lần = 0
+        self.underruns = 0  # số frame phải giữ nguyên snapshot mới nhất vì hết dữ liệu
+        self.frames = 0
+
+    # ==================== Prediction ====================
+    @property
+    def tick_dt(self) -> float:
+        return 1.0 / self.tick_rate
+
+    def update(self, dt: float, dx: int, dy: int):
+        """Advance local time by dt; sends and predicts one input per elapsed tick."""
+        self.frames += 1
+        decay = math.exp(-NET_CORRECTION_DECAY * dt)
+        self._error[0] *= decay
+        self._error[1] *= decay
+        if self.player is None:
+            return
+        self._accumulator += dt
+        while self._accumulator >= self.tick_dt:
+            self._accumulator -= self.tick_dt
+            seq = self.send_input(dx, dy)
+            self.pending.append((seq, dx, dy))
+            self._previous = (self.player.x, self.player.y)
+            step_player(self.player, dx, dy, self.tick_dt, self.maze)
+
+    def player_position(self) -> Tuple[float, float]:
+        """Where to draw the local player this frame (between the last two ticks, plus the fading error)."""
+        alpha = self._accumulator / self.tick_dt
+        x = self._previous[0] + (self.player.x - self._previous[0]) * alpha
+        y = self._previous[1] + (self.player.y - self._previous[1]) * alpha
+        return x + self._error[0], y + self._error[1]
+
+    # ==================== Reconciliation ====================
+    def on_snapshot(self, payload: bytes):
+        self.tick, _, self.ack, self.state = decode_snapshot(payload, self.state)
+        self.snapshots_received += 1
+        self.snapshots.append((self.tick, self.state))
+        self._sync_clock()
+
+        mine = self.state.get(self.player_id)
+        if mine is None:
+            return
+        _, qx, qy, health, _ = mine
+        if self.player is None:
+            self.player = Player(0, 0)
+            self.player.sound = MutedSoundManager()
+            self.player.x, self.player.y = dequantize(qx), dequantize(qy)
+            self._previous = (self.player.x, self.player.y)
+            return
+
+        while self.pending and self.pending[0][0] <= self.ack:
+            self.pending.popleft()
+
+        predicted = (self.player.x, self.player.y)
+        self.player.x, self.player.y = dequantize(qx), dequantize(qy)
+        self.player.health = health
+        for _, dx, dy in self.pending:
+            step_player(self.player, dx, dy, self.tick_dt, self.maze)
+
+        error_x = predicted[0] - self.player.x
+        error_y = predicted[1] - self.player.y
+        # Chênh lệch dưới 1/8 px chỉ là sai số lượng tử hoá
+        if abs(error_x) + abs(error_y) > 0.25:
+            self.corrections.append(math.hypot(error_x, error_y))
+            self._error[0] += error_x
+            self._error[1] += error_y
+            self._previous = (self._previous[0] - error_x, self._previous[1] - error_y)
+
+    # ==================== Interpolation ====================
+    def _sync_clock(self):
+        loop = asyncio.get_running_loop()
+        offset = self.tick / self.tick_rate - loop.time()
+        if self._clock_offset is None or offset > self._clock_offset:
+            self._clock_offset = offset
+        else:
+            # Snapshot tới trễ (jitter/mất gói) chỉ kéo đồng hồ lùi từ từ
+            self._clock_offset += (offset - self._clock_offset) * 0.05
+
+    def remote_entities(self) -> Dict[int, RenderState]:
+        """Every entity except the local player, interpolated at the render time."""
+        if not self.snapshots:
+            return {}
+        render_tick = (asyncio.get_running_loop().time() + self._clock_offset
+                       - self.interp_delay) * self.tick_rate
+
+        newest_tick, newest = self.snapshots[-1]
+        if render_tick >= newest_tick:
+            self.underruns += 1
+            return self._to_render(newest, newest, 0.0)
+
+        older_tick, older = self.snapshots[0]
+        newer_tick, newer = older_tick, older
+        for tick, state in self.snapshots:
+            if tick <= render_tick:
+                older_tick, older = tick, state
+            else:
+                newer_tick, newer = tick, state
+                break
+        alpha = 0.0 if newer_tick == older_tick else (render_tick - older_tick) / (newer_tick - older_tick)
+        return self._to_render(older, newer, max(0.0, min(1.0, alpha)))
+
+    def _to_render(self, older: WorldState, newer: WorldState, alpha: float) -> Dict[int, RenderState]:
+        result = {}
+        for entity_id, (kind, x1, y1, health, flags) in newer.items():
+            if entity_id == self.player_id:
+                continue
+            x0, y0 = x1, y1
+            previous = older.get(entity_id)
+            if previous is not None:
+                x0, y0 = previous[1], previous[2]
+            result[entity_id] = (kind,
+                                 dequantize(x0 + (x1 - x0) * alpha),
+                                 dequantize(y0 + (y1 - y0) * alpha),
+                                 health, flags)
+        return result
@@ -0,0 +1,231 @@
+"""
+Network Protocol
+================
+Length-prefixed binary frames shared by the game server and clients.
+
+Frame: u32 payload length, u8 message type, payload.
+
+  JOIN      client -> server  JSON {session, username, password}
+  WELCOME   server -> client  u16 JSON length, JSON {player_id, tick_rate}, packed maze
+  INPUT     client -> server  u32 seq, i8 dx, i8 dy
+  SNAPSHOT  server -> client  delta-compressed world state (see encode_snapshot)
+  ERROR     server -> client  JSON {error}
+  SPECTATE  client -> server  JSON {session}; answered with WELCOME (player_id 0)
+
+World state is a dict {entity_id: (kind, x, y, health, flags)} of small
+integers. A snapshot only carries the fields that changed since the
+baseline the receiver already holds; TCP delivers frames in order, so the
+baseline is simply the previous snapshot sent on that connection.
+Spectators all receive the same frame: a delta against the previous tick,
+or a full snapshot when they missed a tick.
+"""
+import asyncio
+import json
+import struct
+from typing import Dict, Optional, Tuple
+import pygame
+from src.untils.constants import NET_POSITION_SCALE
+
+MSG_JOIN = 1
+MSG_WELCOME = 2
+MSG_INPUT = 3
+MSG_SNAPSHOT = 4
+MSG_ERROR = 5
+MSG_SPECTATE = 6
+
+KIND_PLAYER = 0
+KIND_ENEMY = 1
+
+# flags của player; bit 3-4 và 5-6 là hướng di chuyển (dx + 1, dy + 1)
+FLAG_DEAD = 1
+FLAG_FINISHED = 2
+FLAG_INVULNERABLE = 4
+_DIR_SHIFT_X = 3
+_DIR_SHIFT_Y = 5
+
+NO_BASELINE = 0xFFFFFFFF
+
+_FRAME = struct.Struct("<IB")
+FRAME_HEADER_SIZE = _FRAME.size
+_INPUT = struct.Struct("<Ibb")
+_SNAPSHOT_HEADER = struct.Struct("<IIIH")  # tick, baseline tick, ack seq, changed count
+_RECORD_HEADER = struct.Struct("<HB")  # entity id, changed-field mask
+_COUNT = struct.Struct("<H")
+# (kind, x, y, health, flags)
+_FIELDS = tuple(struct.Struct(f) for f in ("<B", "<H", "<H", "<B", "<B"))
+
+EntityState = Tuple[int, int, int, int, int]
+WorldState = Dict[int, EntityState]
+
+
+# ==================== Framing ====================
+
+def frame(msg_type: int, payload: bytes = b"") -> bytes:
+    return _FRAME.pack(len(payload), msg_type) + payload
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Tuple[int, bytes]:
+    """Read one frame; raises asyncio.IncompleteReadError when the peer closes."""
+    length, msg_type = _FRAME.unpack(await reader.readexactly(_FRAME.size))
+    return msg_type, await reader.readexactly(length)
+
+
+def json_frame(msg_type: int, data: dict) -> bytes:
+    return frame(msg_type, json.dumps(data).encode("utf-8"))
+
+
+def welcome_frame(info: dict, maze_blob: bytes) -> bytes:
+    header = json.dumps(info).encode("utf-8")
+    return frame(MSG_WELCOME, _COUNT.pack(len(header)) + header + maze_blob)
+
+
+def parse_welcome(payload: bytes) -> Tuple[dict, bytes]:
+    (length,) = _COUNT.unpack_from(payload, 0)
+    start = _COUNT.size
+    return json.loads(payload[start:start + length]), payload[start + length:]
+
+
+# ==================== Input ====================
+
+def input_frame(seq: int, dx: int, dy: int) -> bytes:
+    return frame(MSG_INPUT, _INPUT.pack(seq, dx, dy))
+
+
+def parse_input(payload: bytes) -> Tuple[int, int, int]:
+    seq, dx, dy = _INPUT.unpack(payload)
+    return seq, max(-1, min(1, dx)), max(-1, min(1, dy))
+
+
+class InputKeys:
+    """Stands in for pygame.key.get_pressed() so Player.handle_input can run headless."""
+
+    __slots__ = ("_pressed",)
+
+    def __init__(self, dx: int, dy: int):
+        self._pressed = set()
+        if dx < 0:
+            self._pressed.add(pygame.K_LEFT)
+        elif dx > 0:
+            self._pressed.add(pygame.K_RIGHT)
+        if dy < 0:
+            self._pressed.add(pygame.K_UP)
+        elif dy > 0:
+            self._pressed.add(pygame.K_DOWN)
+
+    def __getitem__(self, key: int) -> bool:
+        return key in self._pressed
+
+
+def step_player(player, dx: int, dy: int, dt: float, maze: list):
+    """Apply one INPUT for one tick; the server and client prediction both use this."""
+    player.handle_input(InputKeys(dx, dy))
+    player.update(dt, maze)
+
+
+def keys_to_direction(keys) -> Tuple[int, int]:
+    """(dx, dy) in -1..1 from a pygame key state, with the same keys as Player.handle_input."""
+    dx = dy = 0
+    if keys[pygame.K_LEFT] or keys[pygame.K_a]:
+        dx = -1
+    if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
+        dx = 1
+    if keys[pygame.K_UP] or keys[pygame.K_w]:
+        dy = -1
+    if keys[pygame.K_DOWN] or keys[pygame.K_s]:
+        dy = 1
+    return dx, dy
+
+
+# ==================== Snapshots ====================
+
+def quantize(value: float) -> int:
+    return max(0, min(0xFFFF, int(round(value * NET_POSITION_SCALE))))
+
+
+def dequantize(value: int) -> float:
+    return value / NET_POSITION_SCALE
+
+
+def direction_flags(velocity_x: float, velocity_y: float) -> int:
+    sx = (velocity_x > 0) - (velocity_x < 0)
+    sy = (velocity_y > 0) - (velocity_y < 0)
+    return ((sx + 1) << _DIR_SHIFT_X) | ((sy + 1) << _DIR_SHIFT_Y)
+
+
+def flags_direction(flags: int) -> Tuple[int, int]:
+    """(dx, dy) in -1..1 stored by direction_flags()."""
+    return ((flags >> _DIR_SHIFT_X) & 3) - 1, ((flags >> _DIR_SHIFT_Y) & 3) - 1
+
+
+def encode_snapshot(tick: int, ack: int, state: WorldState,
+                    baseline: Optional[WorldState] = None, baseline_tick: int = NO_BASELINE) -> bytes:
+    """
+    SNAPSHOT frame for `state`, as a delta against `baseline`.
+
+    Without a baseline every field of every entity is written (a full
+    snapshot). Entities missing from `state` but present in the baseline
+    are listed as removed.
+    """
+    if baseline is None:
+        baseline = {}
+        baseline_tick = NO_BASELINE
+
+    records = []
+    count = 0
+    for entity_id, fields in state.items():
+        old = baseline.get(entity_id)
+        if old == fields:
+            continue
+        mask = 0
+        parts = []
+        for i, value in enumerate(fields):
+            if old is None or old[i] != value:
+                mask |= 1 << i
+                parts.append(_FIELDS[i].pack(value))
+        records.append(_RECORD_HEADER.pack(entity_id, mask))
+        records.extend(parts)
+        count += 1
+
+    removed = [entity_id for entity_id in baseline if entity_id not in state]
+    body = b"".join((
+        _SNAPSHOT_HEADER.pack(tick, baseline_tick, ack, count),
+        b"".join(records),
+        _COUNT.pack(len(removed)),
+        b"".join(_COUNT.pack(entity_id) for entity_id in removed),
+    ))
+    return frame(MSG_SNAPSHOT, body)
+
+
+def decode_snapshot(payload, baseline: Optional[WorldState]) -> Tuple[int, int, int, WorldState]:
+    """
+    Apply a SNAPSHOT payload to `baseline`; returns (tick, baseline_tick, ack, state).
+
+    `baseline` is not modified. Raises ValueError if the snapshot is a delta
+    but no baseline is held.
+    """
+    tick, baseline_tick, ack, count = _SNAPSHOT_HEADER.unpack_from(payload, 0)
+    if baseline_tick == NO_BASELINE:
+        state = {}
+    elif baseline is None:
+        raise ValueError("Delta snapshot received without a baseline")
+    else:
+        state = dict(baseline)
+
+    offset = _SNAPSHOT_HEADER.size
+    for _ in range(count):
+        entity_id, mask = _RECORD_HEADER.unpack_from(payload, offset)
+        offset += _RECORD_HEADER.size
+        fields = list(state.get(entity_id, (0, 0, 0, 0, 0)))
+        for i, field in enumerate(_FIELDS):
+            if mask & (1 << i):
+                (fields[i],) = field.unpack_from(payload, offset)
+                offset += field.size
+        state[entity_id] = tuple(fields)
+
+    (removed,) = _COUNT.unpack_from(payload, offset)
+    offset += _COUNT.size
+    for _ in range(removed):
+        (entity_id,) = _COUNT.unpack_from(payload, offset)
+        offset += _COUNT.size
+        state.pop(entity_id, None)
+    return tick, baseline_tick, ack, state
@@ -0,0 +1,528 @@
+"""
+Multiplayer Server
+==================
+Headless asyncio server that hosts the sessions in the multiplayer_sessions
+table. Each session runs the Player/Enemy simulation authoritatively at a
+fixed tick rate and sends every client a delta-compressed snapshot per tick
+(see src/net/protocol.py). Spectators of a running session share one
+encoded frame per tick (see SpectatorFeed).
+
+Usage:
+    python -m src.net.server [--host 127.0.0.1] [--port 50007] [--tick-rate 30] [--db path]
+
+Clients join with a session code created by
+DatabaseSession.create_multiplayer_session(); see tools/net_loadtest.py.
+"""
+import argparse
+import asyncio
+import json
+import math
+import socket
+import time
+from collections import deque
+from typing import Dict, List, Optional
+from src.db_service import DatabaseService
+from src.enemy import Enemy
+from src.maze_codec import encode_grid
+from src.maze_generator import MazeGenerator
+from src.net.protocol import (
+    MSG_JOIN, MSG_INPUT, MSG_ERROR, MSG_SPECTATE, KIND_PLAYER, KIND_ENEMY,
+    FLAG_DEAD, FLAG_FINISHED, FLAG_INVULNERABLE,
+    read_frame, json_frame, welcome_frame, parse_input, encode_snapshot,
+    quantize, direction_flags, step_player, WorldState
+)
+from src.player import Player
+from src.untils.constants import (
+    NET_HOST, NET_PORT, NET_TICK_RATE, NET_INPUT_BACKLOG, NET_SEND_BUFFER_LIMIT,
+    NET_SPECTATOR_BUFFER_LIMIT, NET_SPECTATOR_SOCKET_BUFFER, NET_STATS_INTERVAL,
+    MIN_MAZE_SIZE, BASE_ENEMY_COUNT, CELL_START, CELL_EXIT, CELL_ENEMY,
+    SESSION_PLAYING, SESSION_FINISHED
+)
+from src.untils.sound_manager import MutedSoundManager
+
+
+class ClientConnection:
+    """One connected player: its socket, input queue and delta baseline."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.user = None
+        self.session: Optional["GameSession"] = None
+        self.player_id = 0
+        self.inputs = deque()  # (seq, dx, dy) chưa xử lý
+        self.last_input = (0, 0)
+        self.ack = 0  # seq của input cuối cùng server đã áp dụng
+
+        # Snapshot cuối đã gửi (TCP giữ thứ tự nên đó chính là baseline của client)
+        self.baseline: Optional[WorldState] = None
+        self.baseline_tick = 0
+
+        self.bytes_sent = 0
+        self.snapshots_sent = 0
+        self.snapshots_skipped = 0
+        self.connected_at = time.perf_counter()
+
+    def send(self, data: bytes) -> bool:
+        """Write without waiting; returns False while the send buffer is over the limit."""
+        transport = self.writer.transport
+        if transport.is_closing() or transport.get_write_buffer_size() > NET_SEND_BUFFER_LIMIT:
+            return False
+        self.writer.write(data)
+        self.bytes_sent += len(data)
+        return True
+
+    @property
+    def bandwidth(self) -> float:
+        """Average bytes/s sent to this client."""
+        return self.bytes_sent / max(time.perf_counter() - self.connected_at, 1e-9)
+
+
+class SpectatorConnection:
+    """One spectator: only the tick of the last frame it was sent is tracked."""
+
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer = writer
+        self.transport = writer.transport
+        self.last_tick: Optional[int] = None  # None -> frame tiếp theo phải là full snapshot
+        self.bytes_sent = 0
+        self.frames_sent = 0
+        self.frames_dropped = 0
+        self.full_sent = 0
+
+
+class SpectatorFeed:
+    """
+    Fans one session's snapshots out to its spectators.
+
+    Each tick the world state is encoded at most twice, however many people
+    are watching: a delta against the previous tick, and a full snapshot
+    only if some spectator needs one, and the same bytes object is passed
+    to every spectator. This saves the encoding, not the sending: each
+    spectator still costs a buffer-size check and a transport.write(),
+    which is one send() system call, and whatever the kernel does not take
+    at once is copied into that transport's buffer (asyncio on Python 3.11
+    keeps a bytearray per transport). tools/net_spectator_bench.py
+    measures both parts.
+
+    A spectator whose send buffer is over NET_SPECTATOR_BUFFER_LIMIT is
+    skipped for that tick and loses its baseline; once its buffer drains it
+    gets a full snapshot of the newest state, so stale frames are never
+    queued behind a slow reader.
+    """
+
+    def __init__(self):
+        self.spectators: List[SpectatorConnection] = []
+        self.state: Optional[WorldState] = None
+        self.tick = 0
+        self.bytes_encoded = 0
+
+    def add(self, spectator: SpectatorConnection):
+        self.spectators.append(spectator)
+
+    def remove(self, spectator: SpectatorConnection):
+        if spectator in self.spectators:
+            self.spectators.remove(spectator)
+
+    def publish(self, tick: int, state: WorldState):
+        if not self.spectators:
+            # Không ai xem thì không encode; người xem đầu tiên nhận full snapshot
+            self.state = None
+            return
+        delta = None
+        if self.state is not None:
+            delta = encode_snapshot(tick, 0, state, self.state, self.tick)
+            self.bytes_encoded += len(delta)
+        full = None
+        previous_tick = self.tick if self.state is not None else None
+
+        for spectator in self.spectators:
+            transport = spectator.transport
+            if transport.is_closing():
+                continue
+            if transport.get_write_buffer_size() > NET_SPECTATOR_BUFFER_LIMIT:
+                spectator.frames_dropped += 1
+                spectator.last_tick = None
+                continue
+            if delta is not None and spectator.last_tick == previous_tick:
+                data = delta
+            else:
+                if full is None:
+                    full = encode_snapshot(tick, 0, state)
+                    self.bytes_encoded += len(full)
+                data = full
+                spectator.full_sent += 1
+            transport.write(data)
+            spectator.last_tick = tick
+            spectator.bytes_sent += len(data)
+            spectator.frames_sent += 1
+
+        self.state = state
+        self.tick = tick
+
+    def close(self):
+        for spectator in self.spectators:
+            spectator.writer.close()
+        self.spectators.clear()
+
+
+class GameSession:
+    """One running session: the maze, its players and enemies."""
+
+    def __init__(self, code: str):
+        self.code = code
+        generator = MazeGenerator(MIN_MAZE_SIZE, MIN_MAZE_SIZE)
+        self.maze = generator.generate_dfs()
+        generator.add_enemies(BASE_ENEMY_COUNT)
+        self.maze_blob, _ = encode_grid(self.maze)
+
+        self.start = self._find(CELL_START) or (1, 1)
+        self.exit = self._find(CELL_EXIT)
+        self.clients: Dict[int, ClientConnection] = {}
+        self.players: Dict[int, Player] = {}
+        self.enemies: List[Enemy] = []
+        self.feed = SpectatorFeed()
+        self._next_id = 1
+        for y, row in enumerate(self.maze):
+            for x, cell in enumerate(row):
+                if cell == CELL_ENEMY:
+                    self.enemies.append(Enemy(x, y))
+        # Enemy dùng id cố định theo thứ tự, player lấy id sau đó
+        self.enemy_ids = [self._new_id() for _ in self.enemies]
+
+    def _new_id(self) -> int:
+        entity_id = self._next_id
+        self._next_id += 1
+        return entity_id
+
+    def _find(self, cell_type: int):
+        for y, row in enumerate(self.maze):
+            for x, cell in enumerate(row):
+                if cell == cell_type:
+                    return x, y
+        return None
+
+    def add_client(self, client: ClientConnection) -> int:
+        player_id = self._new_id()
+        player = Player(self.start[0], self.start[1])
+        player.sound = MutedSoundManager()
+        self.players[player_id] = player
+        self.clients[player_id] = client
+        return player_id
+
+    def remove_client(self, player_id: int):
+        self.players.pop(player_id, None)
+        self.clients.pop(player_id, None)
+
+    def step(self, dt: float):
+        """Advance the simulation by one tick."""
+        for player_id, player in self.players.items():
+            client = self.clients[player_id]
+            if not player.is_alive():
+                continue
+            # Mỗi tick dùng đúng một input; không có input mới thì giữ hướng cũ
+            if client.inputs:
+                seq, dx, dy = client.inputs.popleft()
+                client.ack = seq
+                client.last_input = (dx, dy)
+            step_player(player, *client.last_input, dt, self.maze)
+
+        alive = [p for p in self.players.values() if p.is_alive()]
+        for enemy in self.enemies:
+            # Enemy đuổi theo player gần nhất còn sống
+            if alive:
+                target = min(alive, key=lambda p: math.hypot(p.x - enemy.x, p.y - enemy.y))
+                enemy.update(dt, self.maze, (target.x, target.y))
+            else:
+                enemy.update(dt, self.maze, (-1e9, -1e9))
+            for player in alive:
+                if enemy.check_collision_with_player(player):
+                    enemy.attack(player)
+
+    def world_state(self) -> WorldState:
+        state = {}
+        for entity_id, enemy in zip(self.enemy_ids, self.enemies):
+            state[entity_id] = (KIND_ENEMY, quantize(enemy.x), quantize(enemy.y), 0, 0)
+        for player_id, player in self.players.items():
+            flags = direction_flags(player.velocity_x, player.velocity_y)
+            if not player.is_alive():
+                flags |= FLAG_DEAD
+            if self.exit and (player.grid_x, player.grid_y) == self.exit:
+                flags |= FLAG_FINISHED
+            if player.damage_cooldown > 0:
+                flags |= FLAG_INVULNERABLE
+            state[player_id] = (KIND_PLAYER, quantize(player.x), quantize(player.y),
+                                max(0, min(255, int(player.health))), flags)
+        return state
+
+
+class TickStats:
+    """Running per-tick cost, reported and reset every NET_STATS_INTERVAL seconds."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.ticks = 0
+        self.total = 0.0
+        self.worst = 0.0
+        self.encode = 0.0
+        self.broadcast = 0.0
+        self.snapshot_bytes = 0
+        self.snapshots = 0
+        self.started = time.perf_counter()
+
+    def record(self, seconds: float, encode_seconds: float, broadcast_seconds: float = 0.0):
+        self.ticks += 1
+        self.total += seconds
+        self.encode += encode_seconds
+        self.broadcast += broadcast_seconds
+        self.worst = max(self.worst, seconds)
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total / self.ticks * 1000 if self.ticks else 0.0
+
+    def summary(self) -> str:
+        elapsed = time.perf_counter() - self.started
+        mean_snapshot = self.snapshot_bytes / self.snapshots if self.snapshots else 0
+        return (f"{self.ticks / max(elapsed, 1e-9):.1f} ticks/s, "
+                f"tick {self.mean_ms:.3f} ms avg / {self.worst * 1000:.3f} ms max "
+                f"(encode {self.encode / max(self.ticks, 1) * 1000:.3f} ms, "
+                f"spectators {self.broadcast / max(self.ticks, 1) * 1000:.3f} ms), "
+                f"snapshot {mean_snapshot:.0f} B avg")
+
+
+class GameServer:
+    """Accepts clients, runs every session's tick and sends snapshots."""
+
+    def __init__(self, db: DatabaseService, host: str = NET_HOST, port: int = NET_PORT,
+                 tick_rate: int = NET_TICK_RATE, verbose: bool = True):
+        self.db = db
+        self.host = host
+        self.port = port
+        self.tick_rate = tick_rate
+        self.verbose = verbose  # in join/leave và báo cáo định kỳ
+        self.tick = 0
+        self.sessions: Dict[str, GameSession] = {}
+        self.stats = TickStats()
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._tick_task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        # port=0 -> hệ điều hành chọn cổng trống
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._tick_task = asyncio.create_task(self._tick_loop())
+        if self.verbose:
+            print(f"[Server] Listening on {self.host}:{self.port} at {self.tick_rate} ticks/s")
+
+    async def stop(self):
+        if self._tick_task:
+            self._tick_task.cancel()
+            try:
+                await self._tick_task
+            except asyncio.CancelledError:
+                pass
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+        for session in list(self.sessions.values()):
+            for client in list(session.clients.values()):
+                client.writer.close()
+            session.feed.close()
+            await self.db.aio.set_multiplayer_session_status(session.code, SESSION_FINISHED)
+        self.sessions.clear()
+
+    # ==================== Connections ====================
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        client = ClientConnection(reader, writer)
+        try:
+            msg_type, payload = await read_frame(reader)
+            if msg_type == MSG_SPECTATE:
+                await self._spectate(reader, writer, payload)
+                return
+            if msg_type != MSG_JOIN or not await self._join(client, payload):
+                return
+            while True:
+                msg_type, payload = await read_frame(reader)
+                if msg_type == MSG_INPUT:
+                    client.inputs.append(parse_input(payload))
+                    # Client gửi nhanh hơn tick: bỏ input cũ nhất thay vì trễ dần
+                    while len(client.inputs) > NET_INPUT_BACKLOG:
+                        client.inputs.popleft()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            await self._leave(client)
+            writer.close()
+
+    async def _join(self, client: ClientConnection, payload: bytes) -> bool:
+        try:
+            request = json.loads(payload)
+            code = str(request["session"]).upper()
+            user = await self.db.aio.login_user(request["username"], request["password"])
+            session_row = await self.db.aio.get_multiplayer_session(code)
+        except (ValueError, KeyError, TypeError) as e:
+            client.writer.write(json_frame(MSG_ERROR, {"error": f"bad join request: {e}"}))
+            return False
+
+        if user is None:
+            error = "invalid username or password"
+        elif session_row is None or session_row["status"] == SESSION_FINISHED:
+            error = f"no open session {code}"
+        else:
+            error = None
+        if error:
+            client.writer.write(json_frame(MSG_ERROR, {"error": error}))
+            return False
+
+        session = self.sessions.get(code)
+        if session is None:
+            session = self.sessions[code] = GameSession(code)
+            await self.db.aio.set_multiplayer_session_status(code, SESSION_PLAYING)
+
+        client.user = user
+        client.session = session
+        client.player_id = session.add_client(client)
+        client.writer.write(welcome_frame(
+            {"player_id": client.player_id, "tick_rate": self.tick_rate, "tick": self.tick},
+            session.maze_blob
+        ))
+        if self.verbose:
+            print(f"[Server] {user['username']} joined {code} as player {client.player_id}")
+        return True
+
+    async def _spectate(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, payload: bytes):
+        """Watch a running session until the spectator disconnects; no account needed."""
+        try:
+            code = str(json.loads(payload)["session"]).upper()
+        except (ValueError, KeyError, TypeError) as e:
+            writer.write(json_frame(MSG_ERROR, {"error": f"bad spectate request: {e}"}))
+            return
+        session = self.sessions.get(code)
+        if session is None:
+            writer.write(json_frame(MSG_ERROR, {"error": f"session {code} is not running"}))
+            return
+
+        # Bộ đệm gửi mặc định của kernel giữ được vài MB frame cũ trước khi
+        # transport thấy backpressure; thu nhỏ lại để bỏ frame sớm
+        sock = writer.get_extra_info("socket")
+        if sock is not None:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, NET_SPECTATOR_SOCKET_BUFFER)
+        spectator = SpectatorConnection(writer)
+        writer.write(welcome_frame({"player_id": 0, "tick_rate": self.tick_rate, "tick": self.tick},
+                                   session.maze_blob))
+        session.feed.add(spectator)
+        try:
+            # Spectator không gửi gì; chỉ đọc để biết khi nào nó ngắt kết nối
+            while True:
+                await read_frame(reader)
+        finally:
+            session.feed.remove(spectator)
+
+    async def _leave(self, client: ClientConnection):
+        session = client.session
+        if session is None:
+            return
+        session.remove_client(client.player_id)
+        client.session = None
+        if self.verbose:
+            print(f"[Server] {client.user['username']} left {session.code} "
+                  f"({client.bytes_sent / 1024:.1f} KiB sent, {client.bandwidth / 1024:.2f} KiB/s)")
+        if not session.clients and self.sessions.get(session.code) is session:
+            del self.sessions[session.code]
+            session.feed.close()
+            await self.db.aio.set_multiplayer_session_status(session.code, SESSION_FINISHED)
+
+    # ==================== Tick ====================
+    async def _tick_loop(self):
+        loop = asyncio.get_running_loop()
+        interval = 1.0 / self.tick_rate
+        next_tick = loop.time()
+        while True:
+            self.run_tick(interval)
+            next_tick += interval
+            delay = next_tick - loop.time()
+            if delay < 0:
+                # Chậm hơn thời gian thực: bỏ qua tick bị lỡ thay vì chạy dồn
+                next_tick = loop.time()
+                delay = 0
+            await asyncio.sleep(delay)
+
+    def run_tick(self, dt: float):
+        """Simulate every session one tick and send each client its snapshot."""
+        started = time.perf_counter()
+        self.tick += 1
+        encode_time = 0.0
+        broadcast_time = 0.0
+        for session in self.sessions.values():
+            session.step(dt)
+            state = session.world_state()
+            encode_started = time.perf_counter()
+            for client in session.clients.values():
+                data = encode_snapshot(self.tick, client.ack, state, client.baseline, client.baseline_tick)
+                if client.send(data):
+                    client.baseline = state
+                    client.baseline_tick = self.tick
+                    client.snapshots_sent += 1
+                    self.stats.snapshot_bytes += len(data)
+                    self.stats.snapshots += 1
+                else:
+                    # Giữ baseline cũ: snapshot sau sẽ là delta so với cái client thật sự có
+                    client.snapshots_skipped += 1
+            broadcast_started = time.perf_counter()
+            encode_time += broadcast_started - encode_started
+            session.feed.publish(self.tick, state)
+            broadcast_time += time.perf_counter() - broadcast_started
+        self.stats.record(time.perf_counter() - started, encode_time, broadcast_time)
+
+        if self.verbose and time.perf_counter() - self.stats.started >= NET_STATS_INTERVAL:
+            self.print_stats()
+            self.stats.reset()
+
+    def clients(self) -> List[ClientConnection]:
+        return [client for session in self.sessions.values() for client in session.clients.values()]
+
+    def spectators(self) -> List[SpectatorConnection]:
+        return [spectator for session in self.sessions.values() for spectator in session.feed.spectators]
+
+    def print_stats(self):
+        clients = self.clients()
+        spectators = self.spectators()
+        print(f"[Server] {len(self.sessions)} sessions, {len(clients)} clients, "
+              f"{len(spectators)} spectators, {self.stats.summary()}")
+        if spectators:
+            dropped = sum(s.frames_dropped for s in spectators)
+            print(f"[Server]   spectators: {dropped} frames dropped for slow readers")
+        for client in clients:
+            print(f"[Server]   {client.user['username']}: {client.bandwidth / 1024:.2f} KiB/s, "
+                  f"{client.snapshots_skipped} snapshots skipped")
+
+
+async def _serve(args):
+    db = DatabaseService(args.db)
+    server = GameServer(db, args.host, args.port, args.tick_rate)
+    await server.start()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless multiplayer server for the maze game.")
+    parser.add_argument("--host", default=NET_HOST)
+    parser.add_argument("--port", type=int, default=NET_PORT)
+    parser.add_argument("--tick-rate", type=int, default=NET_TICK_RATE)
+    parser.add_argument("--db", help="database file (default: the game's database)")
+    args = parser.parse_args()
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
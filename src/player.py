@@ -1,13 +1,24 @@
 import pygame
-import os
 from typing import Tuple, Optional
 from src.untils.constants import (
     PLAYER_SPEED, PLAYER_MAX_HEALTH, PLAYER_SIZE,
-    TILE_SIZE, CELL_WALL, SKINS
+    TILE_SIZE, SKINS
 )
+from src.collision import sweep_x, sweep_y
 from src.untils.sound_manager import SoundManager
+from src.untils.skin_cache import skin_cache, parse_color
 
 class Player:
+    # __slots__: không tạo __dict__ cho mỗi instance, truy cập thuộc tính nhanh hơn
+    __slots__ = (
+        "grid_x", "grid_y", "x", "y", "size", "speed",
+        "max_health", "health",
+        "skin_type", "skin_value", "skin_id", "custom_color", "custom_image_path",
+        "image", "color",
+        "velocity_x", "velocity_y", "sound",
+        "damage_cooldown", "invulnerable_time",
+    )
+
     def __init__(
         self,
         x: int,
@@ -65,34 +76,17 @@ class Player:
 
         elif self.skin_type == "color":
             try:
-                rgb = eval(self.skin_value) if isinstance(self.skin_value, str) else (255, 255, 255)
-                self.color = tuple(map(int, rgb))
-            except Exception:
+                self.color = parse_color(str(self.skin_value))
+            except ValueError:
                 self.color = (255, 255, 255)
             self.image = None
 
         elif self.skin_type == "image":
-            if self.custom_image_path and os.path.exists(self.custom_image_path):
-                try:
-                    img = pygame.image.load(self.custom_image_path).convert_alpha()
-                    img = pygame.transform.scale(img, (self.size, self.size))
-                    self.image = img
-                except Exception as e:
-                    print(f"[Warning] Could not load custom skin image: {e}")
-                    self.image = None
-            else:
-                # Trường hợp skin_value là đường dẫn ảnh
-                if os.path.exists(self.skin_value):
-                    try:
-                        img = pygame.image.load(self.skin_value).convert_alpha()
-                        img = pygame.transform.scale(img, (self.size, self.size))
-                        self.image = img
-                    except Exception as e:
-                        print(f"[Warning] Could not load custom skin image: {e}")
-                        self.image = None
-                else:
-                    self.image = None
-                    self.color = (255, 255, 255)
+            # Trường hợp skin_value là đường dẫn ảnh
+            path = self.custom_image_path or self.skin_value
+            self.image = skin_cache.get_image(path, (self.size, self.size))
+            if self.image is None:
+                self.color = (255, 255, 255)
 
     def set_skin(self, skin_type="preset", skin_value="1"):
         """Thay đổi skin khi người chơi chọn ở menu."""
@@ -128,40 +122,16 @@ class Player:
         if self.damage_cooldown > 0:
             self.damage_cooldown -= dt
 
-        # Tính toán vị trí mới
-        new_x = self.x + self.velocity_x * self.speed * dt
-        new_y = self.y + self.velocity_y * self.speed * dt
-
-        # Kiểm tra va chạm
-        if not self._check_collision(new_x, self.y, maze):
-            self.x = new_x
-        if not self._check_collision(self.x, new_y, maze):
-            self.y = new_y
+        # Di chuyển từng trục bằng swept AABB: dừng sát tường và trượt dọc tường,
+        # không xuyên tường kể cả khi dt lớn
+        half = self.size / 2
+        self.x = sweep_x(self.x, self.y, self.velocity_x * self.speed * dt, half, maze)
+        self.y = sweep_y(self.x, self.y, self.velocity_y * self.speed * dt, half, maze)
 
         # Cập nhật vị trí trên grid
         self.grid_x = int(self.x // TILE_SIZE)
         self.grid_y = int(self.y // TILE_SIZE)
 
-    def _check_collision(self, x: float, y: float, maze: list) -> bool:
-        """Kiểm tra xem vị trí có va vào tường hay không."""
-        half = self.size / 2
-        corners = [
-            (x - half, y - half),
-            (x + half, y - half),
-            (x - half, y + half),
-            (x + half, y + half)
-        ]
-
-        for cx, cy in corners:
-            gx = int(cx // TILE_SIZE)
-            gy = int(cy // TILE_SIZE)
-
-            if gy < 0 or gy >= len(maze) or gx < 0 or gx >= len(maze[0]):
-                return True
-            if maze[gy][gx] == CELL_WALL:
-                return True
-        return False
-
     # ==================== HEALTH ====================
     def take_damage(self, damage: int):
         """Gây sát thương cho nhân vật."""
@@ -0,0 +1,131 @@
+"""
+Asset Bundle
+============
+Packs the assets/ directory into one indexed archive and reads it back
+through a memory map, so a frozen build opens a single file instead of
+extracting and opening every font, sound and image separately.
+
+Layout: MAGIC, u32 index length, JSON index {path: [offset, size]}, data
+(offsets are relative to the start of the data section).
+
+Build before packaging with PyInstaller:
+    python -m src.untils.asset_bundle            # assets/ -> assets.pak
+    pyinstaller main.py --add-data "assets.pak:."
+"""
+import io
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+
+MAGIC = b"MZPAK1\0\0"
+_HEADER = struct.Struct("<8sI")
+
+
+class BundleFile(io.RawIOBase):
+    """Read-only, seekable file object over a slice of the mapped bundle (no copy)."""
+
+    def __init__(self, view: memoryview, name: str):
+        super().__init__()
+        self._view = view
+        self._pos = 0
+        self.name = name
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, buffer):
+        n = min(len(buffer), len(self._view) - self._pos)
+        if n <= 0:
+            return 0
+        buffer[:n] = self._view[self._pos:self._pos + n]
+        self._pos += n
+        return n
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            pos = offset
+        elif whence == io.SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == io.SEEK_END:
+            pos = len(self._view) + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        if pos < 0:
+            raise ValueError("Negative seek position")
+        self._pos = pos
+        return pos
+
+    def tell(self):
+        return self._pos
+
+
+class AssetBundle:
+    """Memory-mapped view of a bundle built by build_bundle()."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, index_len = _HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not an asset bundle")
+        start = _HEADER.size
+        self.index = json.loads(self._mmap[start:start + index_len].decode("utf-8"))
+        self._data = memoryview(self._mmap)[start + index_len:]
+
+    def __contains__(self, relative_path: str) -> bool:
+        return _key(relative_path) in self.index
+
+    def open(self, relative_path: str) -> BundleFile:
+        """Return a file-like view of one asset; raises KeyError if it is not packed."""
+        key = _key(relative_path)
+        offset, size = self.index[key]
+        return BundleFile(self._data[offset:offset + size], key)
+
+
+def _key(relative_path: str) -> str:
+    return os.path.normpath(relative_path).replace(os.sep, "/")
+
+
+def build_bundle(source_dir: str, output_path: str) -> int:
+    """Pack every file under source_dir into output_path; returns the file count."""
+    parent = os.path.dirname(os.path.abspath(source_dir))
+    files = []
+    for root, _, names in os.walk(source_dir):
+        for name in names:
+            path = os.path.join(root, name)
+            files.append((_key(os.path.relpath(path, parent)), path))
+    files.sort()
+
+    # Offsets are relative to the start of the data section (right after the index)
+    entries, offset = {}, 0
+    for key, path in files:
+        size = os.path.getsize(path)
+        entries[key] = [offset, size]
+        offset += size
+    index = json.dumps(entries, ensure_ascii=False).encode("utf-8")
+
+    tmp_path = output_path + ".tmp"
+    with open(tmp_path, "wb") as out:
+        out.write(_HEADER.pack(MAGIC, len(index)))
+        out.write(index)
+        for _, path in files:
+            with open(path, "rb") as f:
+                out.write(f.read())
+    os.replace(tmp_path, output_path)
+    return len(files)
+
+
+if __name__ == "__main__":
+    source = sys.argv[1] if len(sys.argv) > 1 else "assets"
+    output = sys.argv[2] if len(sys.argv) > 2 else "assets.pak"
+    started = time.perf_counter()
+    count = build_bundle(source, output)
+    print(f"Packed {count} files into {output} "
+          f"({os.path.getsize(output) / 1024:.0f} KiB, {time.perf_counter() - started:.2f}s)")
@@ -0,0 +1,72 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from src.untils.asset_manager import assets, AssetRegistry
+from src.untils.constants import ASSET_LOADER_WORKERS
+
+
+class AssetLoader:
+    """
+    Preloads registry assets on a worker pool while the main loop keeps rendering.
+
+    Jobs go straight into the shared AssetRegistry, so anything that asks for
+    an asset before it has finished simply waits for that one load. How long
+    each asset took is kept in `timings` (milliseconds by name).
+    """
+
+    def __init__(self, registry: AssetRegistry = assets, max_workers: int = ASSET_LOADER_WORKERS):
+        self.registry = registry
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="asset-loader")
+        self._jobs = []  # (name, Future)
+        self.timings = {}  # name -> milliseconds
+
+    def submit(self, name: str, kind: str, *args):
+        """Queue one asset; kind and args are the same as AssetRegistry.job()."""
+        key, loader, size_of = self.registry.job(kind, *args)
+
+        def timed_load():
+            started = time.perf_counter()
+            asset = loader()
+            # Chỉ ghi lại; main.py in ra khi chạy với --startup-benchmark
+            self.timings[name] = (time.perf_counter() - started) * 1000
+            return asset
+
+        future = self.registry.preload(key, timed_load, size_of, self._executor)
+        if future is not None:
+            self._jobs.append((name, future))
+
+    @property
+    def total(self) -> int:
+        return len(self._jobs)
+
+    @property
+    def completed(self) -> int:
+        return sum(1 for _, future in self._jobs if future.done())
+
+    @property
+    def progress(self) -> float:
+        """Fraction of queued assets finished, 1.0 when nothing is queued."""
+        return self.completed / self.total if self._jobs else 1.0
+
+    @property
+    def done(self) -> bool:
+        return all(future.done() for _, future in self._jobs)
+
+    @property
+    def current(self) -> str:
+        """Name of the first asset still loading ("" when done)."""
+        for name, future in self._jobs:
+            if not future.done():
+                return name
+        return ""
+
+    def wait(self):
+        """Block until every queued asset has finished (for the startup benchmark)."""
+        wait([future for _, future in self._jobs])
+
+    def errors(self) -> list:
+        """(name, exception) for every job that failed."""
+        return [(name, future.exception()) for name, future in self._jobs
+                if future.done() and not future.cancelled() and future.exception() is not None]
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,240 @@
+import os
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import Executor, Future
+from typing import Optional
+import pygame
+from src.untils.asset_bundle import AssetBundle
+from src.untils.constants import ASSET_MEMORY_BUDGET, ASSET_BUNDLE, USER_CACHE_APP_DIR
+
+
+def resource_path(relative_path):
+    """Trả về đường dẫn chính xác khi chạy bằng file .exe hoặc khi chạy bình thường"""
+    try:
+        base_path = sys._MEIPASS  # Khi chạy trong file exe (PyInstaller)
+    except Exception:
+        base_path = os.path.abspath(".")  # Khi chạy trong IDE hoặc terminal
+    return os.path.join(base_path, relative_path)
+
+
+def user_cache_path(relative_path):
+    """
+    Đường dẫn ghi được cho dữ liệu cache (không phải asset đóng gói).
+
+    Bản .exe giải nén vào sys._MEIPASS và thư mục đó bị xoá khi thoát, nên
+    cache nằm trong thư mục cache của người dùng (%LOCALAPPDATA% trên
+    Windows, $XDG_CACHE_HOME hoặc ~/.cache ở nơi khác). Chạy từ mã nguồn
+    thì vẫn nằm trong data/ cạnh database.
+    """
+    if not hasattr(sys, "_MEIPASS"):
+        return os.path.join(os.path.abspath("data"), relative_path)
+    if sys.platform == "win32":
+        base_path = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+    else:
+        base_path = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser(os.path.join("~", ".cache"))
+    return os.path.join(base_path, USER_CACHE_APP_DIR, relative_path)
+
+
+_bundle = None
+_bundle_checked = False
+_bundle_lock = threading.Lock()
+
+
+def _get_bundle():
+    """Mở asset bundle (nếu có) một lần duy nhất."""
+    global _bundle, _bundle_checked
+    with _bundle_lock:
+        if not _bundle_checked:
+            _bundle_checked = True
+            path = resource_path(ASSET_BUNDLE)
+            if os.path.exists(path):
+                try:
+                    _bundle = AssetBundle(path)
+                except (OSError, ValueError) as e:
+                    print(f"[Assets] Warning: could not open {path}: {e}")
+    return _bundle
+
+
+def open_asset(relative_path):
+    """
+    Locate an asset for pygame's loaders.
+
+    Returns a file-like view into the memory-mapped bundle when the asset is
+    packed there, otherwise the path on disk.
+    """
+    bundle = _get_bundle()
+    if bundle is not None and relative_path in bundle:
+        return bundle.open(relative_path)
+    return resource_path(relative_path)
+
+
+class AssetRegistry:
+    """
+    Process-wide cache for sounds, fonts and images.
+
+    Assets are loaded on first request and every later request returns the
+    same object. Entries are kept in LRU order; once the estimated size of
+    everything cached exceeds `budget` bytes the least recently used entries
+    are dropped (objects already handed out stay valid).
+
+    Assets can also be preloaded on a worker pool (see AssetLoader); a get()
+    for an asset that is still loading waits for it instead of loading twice.
+    """
+
+    def __init__(self, budget: int = ASSET_MEMORY_BUDGET):
+        self.budget = budget
+        self.bytes_used = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # key -> (asset, size_in_bytes)
+        self._pending = {}  # key -> Future của asset đang nạp nền
+        self._lock = threading.Lock()
+
+    def get(self, key, loader, size_of=None):
+        """Return the cached asset for key, calling loader() on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return entry[0]
+            future = self._pending.get(key)
+
+        if future is not None:
+            # Đang được nạp ở luồng nền -> chờ thay vì nạp lại lần nữa
+            return future.result()
+
+        asset = loader()
+        self._store(key, asset, size_of)
+        return asset
+
+    def peek(self, key, loader, size_of=None):
+        """Like get(), but returns None instead of waiting for an asset that is still loading."""
+        with self._lock:
+            if key in self._pending:
+                return None
+        return self.get(key, loader, size_of)
+
+    def preload(self, key, loader, size_of, executor: Executor) -> Optional[Future]:
+        """Start loading key on executor unless it is cached or already pending."""
+        with self._lock:
+            if key in self._entries:
+                return None
+            future = self._pending.get(key)
+            if future is None:
+                future = executor.submit(self._load_pending, key, loader, size_of)
+                self._pending[key] = future
+            return future
+
+    def _load_pending(self, key, loader, size_of):
+        try:
+            asset = loader()
+            self._store(key, asset, size_of)
+            return asset
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+
+    def _store(self, key, asset, size_of):
+        size = size_of(asset) if size_of else 0
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = (asset, size)
+            self.bytes_used += size
+            self._enforce_budget()
+
+    def _enforce_budget(self):
+        # Luôn giữ lại entry mới nhất, kể cả khi một mình nó vượt ngân sách
+        while self.bytes_used > self.budget and len(self._entries) > 1:
+            _, (_, size) = self._entries.popitem(last=False)
+            self.bytes_used -= size
+            self.evictions += 1
+
+    # ==================== Loaders ====================
+    def job(self, kind: str, *args):
+        """(key, loader, size_of) for one asset; kind is "sound", "font" or "image"."""
+        return getattr(self, f"_{kind}_job")(*args)
+
+    def _sound_job(self, relative_path: str, volume: float = 1.0):
+        def load():
+            if not pygame.mixer.get_init():
+                pygame.mixer.init()
+            snd = pygame.mixer.Sound(open_asset(relative_path))
+            snd.set_volume(volume)
+            return snd
+        return ("sound", relative_path, volume), load, _sound_size
+
+    def _font_job(self, relative_path: Optional[str], size: int):
+        def load():
+            if not pygame.font.get_init():
+                pygame.font.init()
+            return pygame.font.Font(open_asset(relative_path) if relative_path else None, size)
+        return ("font", relative_path, size), load, _font_size(relative_path)
+
+    def _image_job(self, relative_path: str, alpha: bool = True):
+        def load():
+            img = pygame.image.load(open_asset(relative_path), relative_path)
+            # convert() chỉ an toàn trên luồng chính; ảnh nạp nền giữ định dạng gốc
+            on_main = threading.current_thread() is threading.main_thread()
+            if on_main and pygame.display.get_surface() is not None:
+                img = img.convert_alpha() if alpha else img.convert()
+            return img
+        return ("image", relative_path, alpha), load, _surface_size
+
+    def sound(self, relative_path: str, volume: float = 1.0, wait: bool = True) -> Optional[pygame.mixer.Sound]:
+        """Decoded sound, shared by every caller; None if wait is False and it is still loading."""
+        return (self.get if wait else self.peek)(*self._sound_job(relative_path, volume))
+
+    def font(self, relative_path: Optional[str], size: int) -> pygame.font.Font:
+        """Parsed TTF font at the given point size (None = pygame's default font)."""
+        return self.get(*self._font_job(relative_path, size))
+
+    def image(self, relative_path: str, alpha: bool = True) -> pygame.Surface:
+        """Image surface, converted to the display format when a display exists."""
+        return self.get(*self._image_job(relative_path, alpha))
+
+    # ==================== Stats ====================
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "bytes_used": self.bytes_used,
+            "budget": self.budget,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes_used = 0
+
+
+def _sound_size(snd: pygame.mixer.Sound) -> int:
+    init = pygame.mixer.get_init()
+    if not init:
+        return 0
+    frequency, fmt, channels = init
+    return int(snd.get_length() * frequency * channels * (abs(fmt) // 8))
+
+
+def _font_size(relative_path):
+    """Kích thước file TTF (ước lượng bộ nhớ), từ bundle hoặc từ đĩa."""
+    def size_of(_):
+        if not relative_path:
+            return 0
+        source = open_asset(relative_path)
+        if isinstance(source, str):
+            return os.path.getsize(source)
+        return source.seek(0, os.SEEK_END)
+    return size_of
+
+
+def _surface_size(surface: pygame.Surface) -> int:
+    return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+
+# Registry dùng chung cho toàn bộ tiến trình
+assets = AssetRegistry()
@@ -58,6 +58,19 @@ UI_LARGE_FONT_SIZE = 36
 
 # Database settings
 DB_NAME = "data/maze_game.db"
+DB_WRITE_BATCH_SIZE = 64  # max statements per write-behind transaction
+DB_BUSY_TIMEOUT = 5.0  # seconds to wait for a lock held by another connection
+DB_READ_POOL_SIZE = 3  # reader connections in DatabaseService
+MAZE_MIGRATION_BATCH_SIZE = 200  # JSON mazes converted per transaction
+
+# Leaderboard periods (buckets are UTC days / weeks named by their Monday, like SQLite's date())
+LEADERBOARD_DAY = "day"
+LEADERBOARD_WEEK = "week"
+LEADERBOARD_ALL = "all"
+LEADERBOARD_PERIODS = (LEADERBOARD_DAY, LEADERBOARD_WEEK, LEADERBOARD_ALL)
+LEADERBOARD_TITLES = {LEADERBOARD_DAY: "Today", LEADERBOARD_WEEK: "This Week", LEADERBOARD_ALL: "All Time"}
+RANK_SCORE_BITS = 32  # rank lookups treat scores as 0 .. 2**32 - 1 (larger scores tie at the top)
+RANK_LEVEL_BITS = 10  # and levels as 0 .. 1023
 
 # Maze generation algorithms
 MAZE_ALGO_DFS = "dfs"
@@ -91,10 +104,60 @@ EDITOR_TILE_WALL = 1
 EDITOR_TILE_START = 2
 EDITOR_TILE_EXIT = 3
 EDITOR_TILE_ENEMY = 4
+EDITOR_GRID_SIZES = (21, 51, 101, 251, 501, 1000)  # N cycles through these
+EDITOR_ZOOM_LEVELS = (1, 2, 3, 4, 6, 8, 12, 16, 24, 30, 40)  # cell size in pixels
+EDITOR_LOD_CELL_SIZE = 6  # smaller cells are drawn from the overview only, without grid lines
+EDITOR_PAN_SPEED = 600  # screen pixels per second with the arrow keys
+EDITOR_UNDO_MEMORY = 4 * 1024 * 1024  # bytes of undo/redo history before the oldest steps are dropped
+EDITOR_MODE_BRUSH = "Brush"
+EDITOR_MODE_LINE = "Line"
+EDITOR_MODE_RECT = "Rectangle"
+EDITOR_MODE_FILL = "Fill"
+EDITOR_MODES = (EDITOR_MODE_BRUSH, EDITOR_MODE_LINE, EDITOR_MODE_RECT, EDITOR_MODE_FILL)  # TAB cycles
+EDITOR_FILL_BUDGET = 0.004  # seconds per frame spent on a running flood fill
+EDITOR_FILL_BATCH = 64  # spans written between budget checks
+EDITOR_VALIDATE_BUDGET = 0.002  # seconds per frame for connectivity validation
+EDITOR_VALIDATE_DEBOUNCE = 0.25  # seconds without edits before walls are checked / the grid is relabelled
+EDITOR_VALIDATE_UNION_LIMIT = 512  # cells per frame unioned incrementally; larger edits relabel the grid
+EDITOR_VALIDATE_BFS_LIMIT = 512  # cells the BFS may visit to prove new walls split nothing
+EDITOR_UNREACHABLE_COLOR = ORANGE
+EDITOR_UNREACHABLE_ALPHA = 110
 
 # Cell types
 CELL_WALL = 1
 CELL_PATH = 2
 CELL_START = 3
 CELL_EXIT = 4
-CELL_ENEMY = 5
\ No newline at end of file
+CELL_ENEMY = 5
+
+# Asset cache
+ASSET_MEMORY_BUDGET = 64 * 1024 * 1024  # bytes
+ASSET_BUNDLE = "assets.pak"  # built by `python -m src.untils.asset_bundle`
+ASSET_LOADER_WORKERS = 4  # background loading threads
+
+# Custom skin cache
+SKIN_CACHE_DIR = "skin_cache"  # pre-scaled PNGs, under user_cache_path()
+USER_CACHE_APP_DIR = "MazeAdventure"  # per-user cache folder name in packaged (.exe) builds
+SKIN_CACHE_SIZE = 16  # surfaces kept in memory
+
+# Text surface cache
+TEXT_CACHE_SIZE = 256  # rendered labels kept in memory
+
+# Multiplayer (server and client)
+NET_HOST = "127.0.0.1"
+NET_PORT = 50007
+NET_TICK_RATE = 30  # simulation ticks (and snapshots) per second
+NET_POSITION_SCALE = 8  # positions are sent in 1/8 pixel units
+NET_INPUT_BACKLOG = 8  # queued inputs per player before the oldest are dropped
+NET_SEND_BUFFER_LIMIT = 64 * 1024  # bytes; skip a client's snapshot while its buffer is fuller
+NET_SPECTATOR_BUFFER_LIMIT = 8 * 1024  # bytes; drop a spectator's frames while its buffer is fuller
+NET_SPECTATOR_SOCKET_BUFFER = 16 * 1024  # bytes; kernel send buffer of a spectator socket
+NET_STATS_INTERVAL = 5.0  # seconds between server metrics reports
+NET_INTERP_DELAY = 0.1  # seconds remote entities are rendered behind the newest snapshot
+NET_SNAPSHOT_BUFFER = 32  # snapshots kept for interpolation
+NET_CORRECTION_DECAY = 12.0  # 1/s; how fast a reconciliation error is smoothed out
+
+# Multiplayer session status (multiplayer_sessions.status)
+SESSION_WAITING = "waiting"
+SESSION_PLAYING = "playing"
+SESSION_FINISHED = "finished"
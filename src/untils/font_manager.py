@@ -1,20 +1,76 @@
 import pygame
 import os
-import sys
-
-pygame.font.init()
+from collections import OrderedDict
+from typing import Optional
+from src.untils.asset_manager import assets
+from src.untils.constants import TEXT_CACHE_SIZE
 
 DEFAULT_FONT_SIZE = 24
+DEFAULT_FACE = "BeVietnamPro"
+
+# (font, text, color, antialias) -> Surface, thứ tự LRU
+_text_cache = OrderedDict()
+# (font, template, color, antialias) -> (value, Surface): mỗi nhãn chỉ giữ giá trị gần nhất
+_value_cache = {}
+
+
+def _font_file(face: Optional[str], bold: bool, italic: bool) -> Optional[str]:
+    """Đường dẫn file TTF cho (face, style); None = font mặc định của pygame."""
+    if face is None:
+        return None
+    style = ("Bold" if bold else "") + ("Italic" if italic else "")
+    return os.path.join("assets", "fonts", f"{face}-{style or 'Regular'}.ttf")
+
+
+def get_font(size=DEFAULT_FONT_SIZE, face=DEFAULT_FACE, bold=False, italic=False):
+    """
+    Trả về đối tượng font pygame hỗ trợ tiếng Việt.
+
+    Mỗi bộ (face, size, style) chỉ được nạp một lần rồi dùng chung;
+    face=None trả về font mặc định của pygame.
+    """
+    return assets.font(_font_file(face, bold, italic), size)
+
+
+def preload_font(loader, size=DEFAULT_FONT_SIZE, face=DEFAULT_FACE, bold=False, italic=False):
+    """Đưa một font vào hàng đợi nạp nền; get_font() sau đó sẽ lấy từ cache."""
+    loader.submit(f"font:{face or 'default'}:{size}", "font", _font_file(face, bold, italic), size)
+
+
+def render_text(font, text, antialias, color):
+    """
+    Giống font.render(text, antialias, color) nhưng lấy surface từ cache.
+
+    Các nhãn không đổi giữa các frame (menu, hướng dẫn, "Health:") chỉ được
+    render một lần. Surface trả về là dùng chung, không được vẽ đè lên nó.
+    Chuỗi thay đổi liên tục (điểm, bộ đếm, thông báo) không dùng hàm này:
+    mỗi giá trị mới sẽ đẩy một nhãn tĩnh ra khỏi cache. Xem render_value().
+    """
+    if type(color) is not tuple:
+        color = tuple(color)
+    key = (font, text, color, antialias)
+    surface = _text_cache.get(key)
+    if surface is None:
+        surface = font.render(text, antialias, color)
+        _text_cache[key] = surface
+        if len(_text_cache) > TEXT_CACHE_SIZE:
+            _text_cache.popitem(last=False)
+    else:
+        _text_cache.move_to_end(key)
+    return surface
+
+
+def render_value(font, template, value, antialias, color):
+    """
+    Render template.format(value) cho nhãn có một số thay đổi, như "Score: {}".
 
-def resource_path(relative_path):
-    """Trả về đường dẫn chính xác khi chạy bằng file .exe hoặc khi chạy bình thường"""
-    try:
-        base_path = sys._MEIPASS  # Khi chạy trong file exe (PyInstaller)
-    except Exception:
-        base_path = os.path.abspath(".")  # Khi chạy trong IDE hoặc terminal
-    return os.path.join(base_path, relative_path)
-
-def get_font(size=DEFAULT_FONT_SIZE):
-    """Trả về đối tượng font pygame hỗ trợ tiếng Việt."""
-    font_path = resource_path(os.path.join("assets", "fonts", "BeVietnamPro-Regular.ttf"))
-    return pygame.font.Font(font_path, size)
+    Surface chỉ được render lại khi giá trị đổi, và mỗi nhãn chỉ giữ giá trị
+    gần nhất, nên điểm tăng liên tục không làm tràn cache của render_text().
+    """
+    if type(color) is not tuple:
+        color = tuple(color)
+    key = (font, template, color, antialias)
+    cached = _value_cache.get(key)
+    if cached is None or cached[0] != value:
+        cached = _value_cache[key] = (value, font.render(template.format(value), antialias, color))
+    return cached[1]
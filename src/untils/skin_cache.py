@@ -0,0 +1,102 @@
+import os
+import hashlib
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Optional, Tuple
+import pygame
+from src.untils.asset_manager import user_cache_path
+from src.untils.constants import SKIN_CACHE_DIR, SKIN_CACHE_SIZE
+
+
+@lru_cache(maxsize=64)
+def parse_color(value: str) -> Tuple[int, int, int]:
+    """
+    Parse a colour string such as "(255, 0, 128)" or "255,0,128" without eval.
+
+    Raises ValueError if the string is not 3 or 4 comma-separated numbers
+    in 0-255 (so "inf" or "nan" from a bad DB value is rejected too).
+    """
+    parts = value.strip().strip("()[]").split(",")
+    if len(parts) not in (3, 4):
+        raise ValueError(f"Invalid colour: {value!r}")
+    components = [float(p) for p in parts]
+    # `not 0 <= c <= 255` cũng loại nan (mọi phép so sánh với nan đều False)
+    if any(not 0 <= c <= 255 for c in components):
+        raise ValueError(f"Invalid colour: {value!r}")
+    return tuple(int(c) for c in components[:3])
+
+
+class SkinCache:
+    """
+    Cache of custom skin images, converted and scaled to their target size.
+
+    Entries are keyed by the SHA-1 of the file content plus the size, kept in
+    memory with LRU eviction, and also written as pre-scaled PNGs to
+    `cache_dir` (under user_cache_path(), which outlives the process in
+    packaged builds too) so the original image is decoded and scaled only once.
+    """
+
+    def __init__(self, max_entries: int = SKIN_CACHE_SIZE, cache_dir: str = SKIN_CACHE_DIR):
+        self.max_entries = max_entries
+        self.cache_dir = user_cache_path(cache_dir)
+        self._surfaces = OrderedDict()  # (digest, size) -> Surface
+        self._digests = {}  # (path, mtime_ns, file_size) -> digest
+
+    def _digest(self, path: str) -> str:
+        # Chỉ hash lại khi file thay đổi (stat rẻ hơn nhiều so với đọc file)
+        st = os.stat(path)
+        stat_key = (path, st.st_mtime_ns, st.st_size)
+        digest = self._digests.get(stat_key)
+        if digest is None:
+            h = hashlib.sha1()
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(65536), b""):
+                    h.update(chunk)
+            digest = h.hexdigest()
+            self._digests[stat_key] = digest
+        return digest
+
+    def get_image(self, path: str, size: Tuple[int, int]) -> Optional[pygame.Surface]:
+        """Return the skin at `path` scaled to `size`, or None if it cannot be loaded."""
+        try:
+            digest = self._digest(path)
+        except OSError:
+            return None
+
+        key = (digest, size)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            return surface
+
+        try:
+            surface = self._load(path, digest, size)
+        except Exception as e:
+            print(f"[Warning] Could not load custom skin image: {e}")
+            return None
+
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)
+        return surface
+
+    def _load(self, path: str, digest: str, size: Tuple[int, int]) -> pygame.Surface:
+        cached_png = os.path.join(self.cache_dir, f"{digest}_{size[0]}x{size[1]}.png")
+        if os.path.exists(cached_png):
+            return pygame.image.load(cached_png).convert_alpha()
+
+        img = pygame.image.load(path).convert_alpha()
+        img = pygame.transform.scale(img, size)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Ghi ra file tạm rồi đổi tên, tránh để lại PNG hỏng nếu bị ngắt giữa chừng
+            tmp_png = cached_png[:-4] + ".tmp.png"
+            pygame.image.save(img, tmp_png)
+            os.replace(tmp_png, cached_png)
+        except (OSError, pygame.error) as e:
+            print(f"[SkinCache] Warning: could not write {cached_png}: {e}")
+        return img
+
+
+# Cache dùng chung cho mọi Player
+skin_cache = SkinCache()
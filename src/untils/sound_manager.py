@@ -1,35 +1,48 @@
-import pygame
 import os
-import sys
+from src.untils.asset_manager import assets
+
+SOUND_DIR = os.path.join("assets", "sounds")
+SOUND_FILES = {
+    "move": "Blip_sound.wav",
+    "select": "select-sound-user-interface.wav",
+    "explosion": "repetitive-explosion.wav",
+    "win": "win-sound.wav",
+    "game_over": "game_over_sound.wav",
+}
+SOUND_VOLUME = 0.3  # Giảm âm lượng để nghe dễ chịu
 
-def resource_path(relative_path):
-    """Trả về đường dẫn chính xác khi chạy bằng file .exe hoặc khi chạy bình thường"""
-    try:
-        base_path = sys._MEIPASS
-    except Exception:
-        base_path = os.path.abspath(".")
-    return os.path.join(base_path, relative_path)
 
 class SoundManager:
-    def __init__(self, base_path="assets/sounds"):
-        pygame.mixer.init()
-
-        base_path = resource_path(base_path)
-        self.sounds = {
-            "move": pygame.mixer.Sound(os.path.join(base_path, "Blip_sound.wav")),
-            "select": pygame.mixer.Sound(os.path.join(base_path, "select-sound-user-interface.wav")),
-            "explosion": pygame.mixer.Sound(os.path.join(base_path, "repetitive-explosion.wav")),
-            "win": pygame.mixer.Sound(os.path.join(base_path, "win-sound.wav")),
-            "game_over": pygame.mixer.Sound(os.path.join(base_path, "game_over_sound.wav")),
-        }
-
-        # Giảm âm lượng để nghe dễ chịu
-        for sound in self.sounds.values():
-            sound.set_volume(0.3)
+    """Phát âm thanh theo tên; dữ liệu âm thanh nằm trong registry dùng chung."""
+
+    def __init__(self, base_path=SOUND_DIR):
+        self.base_path = base_path
+
+    def get(self, name, wait=True):
+        """
+        Trả về pygame.mixer.Sound (nạp lần đầu, các lần sau lấy từ cache).
+
+        wait=False: trả về None nếu âm thanh còn đang nạp nền thay vì chờ.
+        """
+        return assets.sound(os.path.join(self.base_path, SOUND_FILES[name]), SOUND_VOLUME, wait)
+
+    def preload(self, loader):
+        """Đưa toàn bộ âm thanh vào hàng đợi nạp nền của AssetLoader."""
+        for name, filename in SOUND_FILES.items():
+            loader.submit(f"sound:{name}", "sound", os.path.join(self.base_path, filename), SOUND_VOLUME)
 
     def play(self, name):
-        """Phát âm thanh theo tên"""
-        if name in self.sounds:
-            self.sounds[name].play()
+        """Phát âm thanh theo tên; im lặng nếu nó chưa nạp nền xong (menu không chờ âm thanh)."""
+        if name in SOUND_FILES:
+            sound = self.get(name, wait=False)
+            if sound is not None:
+                sound.play()
         else:
             print(f"[SoundManager] Warning: sound '{name}' not found!")
+
+
+class MutedSoundManager(SoundManager):
+    """SoundManager không phát gì: cho server chạy headless và khi client mô phỏng lại input."""
+
+    def play(self, name):
+        pass
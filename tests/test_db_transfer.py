@@ -0,0 +1,25 @@
+import json
+
+from src.database import DatabaseManager
+from src.untils.constants import LEADERBOARD_ALL, LEADERBOARD_DAY
+from tools.db_transfer import import_table
+
+
+def test_replace_import_rebuilds_leaderboards(tmp_path):
+    db = DatabaseManager(str(tmp_path / "game.db"))
+    for name in ("alice", "bob"):
+        db.register_user(name, "pw")
+    db.cursor.execute("INSERT INTO scores (id, user_id, score, level) VALUES (1, 1, 900, 5), (2, 2, 100, 1)")
+    db.conn.commit()
+
+    path = tmp_path / "scores.jsonl"
+    path.write_text(json.dumps({"id": 1, "user_id": 1, "score": 50, "level": 1}) + "\n")
+    import_table(db, "scores", str(path), "jsonl", 100, "replace")
+
+    db._invalidate_leaderboard()
+    assert db.get_leaderboard(5) == [("bob", 100, 1), ("alice", 50, 1)]
+    assert db.get_leaderboard(5, LEADERBOARD_DAY) == [("bob", 100, 1), ("alice", 50, 1)]
+    assert db.get_user_rank(1) == {"rank": 2, "players": 2, "top_percent": 100.0}
+    sizes = dict(db.cursor.execute("SELECT period, players FROM board_sizes").fetchall())
+    assert sizes[LEADERBOARD_ALL] == 2 and sizes[LEADERBOARD_DAY] == 2
+    db.close()
@@ -0,0 +1,151 @@
+import gc
+import time
+
+import pygame
+import pytest
+
+from src.editor import MazeEditor
+from src.untils.constants import *
+
+
+@pytest.fixture
+def editor():
+    pygame.display.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.font.init()
+    return MazeEditor(screen, None, None)
+
+
+def _pos(editor, x, y):
+    """Screen position of the centre of cell (x, y)."""
+    cs = editor.cell_size
+    return (round(editor.viewport.x + (x - editor.view_x + 0.5) * cs),
+            round(editor.viewport.y + (y - editor.view_y + 0.5) * cs))
+
+
+def _event(kind, **attrs):
+    return pygame.event.Event(kind, **attrs)
+
+
+def _key(editor, key, mod=0):
+    editor.handle_event(_event(pygame.KEYDOWN, key=key, mod=mod))
+
+
+def test_undo_while_drawing_keeps_the_stroke(editor):
+    editor.handle_event(_event(pygame.MOUSEBUTTONDOWN, button=1, pos=_pos(editor, 2, 2)))
+    editor.handle_event(_event(pygame.MOUSEMOTION, pos=_pos(editor, 3, 2), rel=(0, 0), buttons=(1, 0, 0)))
+    _key(editor, pygame.K_z, pygame.KMOD_LCTRL)
+    _key(editor, pygame.K_y, pygame.KMOD_LCTRL)
+    editor.handle_event(_event(pygame.MOUSEMOTION, pos=_pos(editor, 4, 2), rel=(0, 0), buttons=(1, 0, 0)))
+    editor.handle_event(_event(pygame.MOUSEBUTTONUP, button=1, pos=_pos(editor, 4, 2)))
+    assert editor.grid[2][2:5] == bytes([EDITOR_TILE_WALL] * 3)
+
+    _key(editor, pygame.K_z, pygame.KMOD_LCTRL)
+    assert editor.grid[2][2:5] == bytes([EDITOR_TILE_EMPTY] * 3)
+    assert editor.history.undo_steps == 0
+
+
+class _UntouchedDb:
+    """Stand-in database: any save or load attempt fails the test."""
+
+    def __getattr__(self, name):
+        raise AssertionError(f"db.{name} called")
+
+
+@pytest.mark.parametrize("key", [pygame.K_n, pygame.K_l, pygame.K_c, pygame.K_s])
+def test_grid_keys_are_ignored_during_a_drag(editor, key):
+    editor.db, editor.user = _UntouchedDb(), {"id": 1}
+    width = editor.grid_width
+    editor.handle_event(_event(pygame.MOUSEBUTTONDOWN, button=1, pos=_pos(editor, 2, 2)))
+    editor.handle_event(_event(pygame.MOUSEMOTION, pos=_pos(editor, 3, 2), rel=(0, 0), buttons=(1, 0, 0)))
+    _key(editor, key)
+    editor.handle_event(_event(pygame.MOUSEMOTION, pos=_pos(editor, 4, 2), rel=(0, 0), buttons=(1, 0, 0)))
+    editor.handle_event(_event(pygame.MOUSEBUTTONUP, button=1, pos=_pos(editor, 4, 2)))
+
+    # Nét vẽ còn nguyên và vẫn là một bước undo
+    assert editor.grid_width == width
+    assert editor.grid[2][2:5] == bytes([EDITOR_TILE_WALL] * 3)
+    assert editor.history.undo_steps == 1
+    _key(editor, pygame.K_z, pygame.KMOD_LCTRL)
+    assert editor.grid[2][2:5] == bytes([EDITOR_TILE_EMPTY] * 3)
+
+
+@pytest.mark.parametrize("key", [pygame.K_n, pygame.K_l, pygame.K_c, pygame.K_s])
+def test_grid_keys_are_ignored_while_filling(editor, key):
+    editor.db, editor.user = _UntouchedDb(), {"id": 1}
+    editor._new_grid(251, 251)
+    editor.mode = EDITOR_MODE_FILL
+    editor.current_tool = EDITOR_TILE_ENEMY
+    editor.handle_event(_event(pygame.MOUSEBUTTONDOWN, button=1, pos=_pos(editor, 10, 10)))
+    editor._run_fill(0)  # ngân sách 0: job đã tạo nhưng chưa chạy xong
+    assert editor.is_filling
+    _key(editor, key)
+    assert editor.is_filling and editor.grid_width == 251
+
+    while editor.is_filling:
+        editor.update(1 / 60)
+    assert all(row[1:250] == bytes([EDITOR_TILE_ENEMY] * 249) for row in editor.grid[1:250])
+    assert editor.history.undo_steps == 1
+
+
+def test_tool_and_mode_keys_are_ignored_during_a_drag(editor):
+    editor.mode = EDITOR_MODE_RECT
+    editor.handle_event(_event(pygame.MOUSEBUTTONDOWN, button=1, pos=_pos(editor, 2, 2)))
+    editor.handle_event(_event(pygame.MOUSEMOTION, pos=_pos(editor, 4, 4), rel=(0, 0), buttons=(1, 0, 0)))
+    _key(editor, pygame.K_3)
+    _key(editor, pygame.K_TAB)
+    editor.handle_event(_event(pygame.MOUSEBUTTONUP, button=1, pos=_pos(editor, 4, 4)))
+
+    assert editor.current_tool == EDITOR_TILE_WALL and editor.mode == EDITOR_MODE_RECT
+    assert all(editor.grid[y][2:5] == bytes([EDITOR_TILE_WALL] * 3) for y in range(2, 5))
+    assert not any(EDITOR_TILE_START in row for row in editor.grid)
+
+
+def test_shape_uses_the_tile_chosen_at_drag_start(editor):
+    editor.mode = EDITOR_MODE_LINE
+    editor.handle_event(_event(pygame.MOUSEBUTTONDOWN, button=1, pos=_pos(editor, 2, 2)))
+    editor.handle_event(_event(pygame.MOUSEMOTION, pos=_pos(editor, 5, 2), rel=(0, 0), buttons=(1, 0, 0)))
+    editor.current_tool = EDITOR_TILE_EXIT  # đổi trực tiếp, không qua phím
+    editor.handle_event(_event(pygame.MOUSEBUTTONUP, button=1, pos=_pos(editor, 5, 2)))
+    assert editor.grid[2][2:6] == bytes([EDITOR_TILE_WALL] * 4)
+
+
+def test_fill_runs_over_frames_as_one_undo_step(editor):
+    editor._new_grid(251, 251)
+    for y in range(1, 250):
+        editor.grid[y][125] = EDITOR_TILE_WALL  # chia grid làm hai nửa
+    editor._rebuild_overview()
+    editor.validator.reset(editor.grid)
+    editor.mode = EDITOR_MODE_FILL
+    editor.current_tool = EDITOR_TILE_ENEMY
+    editor.handle_event(_event(pygame.MOUSEBUTTONDOWN, button=1, pos=_pos(editor, 10, 10)))
+    assert editor.is_filling
+
+    # Các thao tác sửa grid bị bỏ qua cho tới khi tô xong
+    editor.handle_event(_event(pygame.MOUSEBUTTONDOWN, button=3, pos=_pos(editor, 200, 10)))
+    _key(editor, pygame.K_z, pygame.KMOD_LCTRL)
+    while editor.is_filling:
+        editor.update(1 / 60)
+
+    assert all(row[1:125] == bytes([EDITOR_TILE_ENEMY] * 124) for row in editor.grid[1:250])
+    assert all(row[126:250] == bytes([EDITOR_TILE_EMPTY] * 124) for row in editor.grid[1:250])
+    assert editor.history.undo_steps == 1
+    _key(editor, pygame.K_z, pygame.KMOD_LCTRL)
+    assert all(row[1:125] == bytes([EDITOR_TILE_EMPTY] * 124) for row in editor.grid[1:250])
+
+
+def test_large_open_fill_fits_in_one_frame_budget(editor):
+    editor._new_grid(501, 501)
+    editor.mode = EDITOR_MODE_FILL
+    editor.current_tool = EDITOR_TILE_ENEMY
+    editor.handle_event(_event(pygame.MOUSEBUTTONDOWN, button=1, pos=_pos(editor, 10, 10)))
+    assert editor.is_filling  # nhấn chuột chỉ tạo job, chưa tô ô nào
+
+    gc.collect()  # đo phần tô, không đo một lượt GC do các test trước để lại
+    started = time.perf_counter()
+    editor.update(1 / 60)
+    elapsed = time.perf_counter() - started
+    # 250k ô: một lần update là xong, trong ngân sách (cộng tối đa một lô lố hạn)
+    assert not editor.is_filling
+    assert elapsed < EDITOR_FILL_BUDGET * 2
+    assert all(row[1:500] == bytes([EDITOR_TILE_ENEMY] * 499) for row in editor.grid[1:500])
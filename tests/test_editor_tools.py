@@ -0,0 +1,34 @@
+import random
+from collections import deque
+
+from src.editor_tools import flood_fill_spans
+
+
+def _bfs(grid, x, y):
+    target = grid[y][x]
+    height, width = len(grid), len(grid[0])
+    seen = {(x, y)}
+    queue = deque(seen)
+    while queue:
+        cx, cy = queue.popleft()
+        for nx, ny in ((cx - 1, cy), (cx + 1, cy), (cx, cy - 1), (cx, cy + 1)):
+            if (0 < nx < width - 1 and 0 < ny < height - 1 and (nx, ny) not in seen
+                    and grid[ny][nx] == target):
+                seen.add((nx, ny))
+                queue.append((nx, ny))
+    return seen
+
+
+def test_flood_fill_matches_bfs():
+    rng = random.Random(3)
+    for _ in range(200):
+        width, height = rng.randint(3, 30), rng.randint(3, 30)
+        density = rng.random()
+        grid = [[int(rng.random() < density) for _ in range(width)] for _ in range(height)]
+        x, y = rng.randint(1, max(1, width - 2)), rng.randint(1, max(1, height - 2))
+        if not (0 < x < width - 1 and 0 < y < height - 1):
+            assert flood_fill_spans(grid, x, y) == []
+            continue
+        cells = [(cx, cy) for cy, x0, x1 in flood_fill_spans(grid, x, y) for cx in range(x0, x1)]
+        assert len(cells) == len(set(cells))
+        assert set(cells) == _bfs(grid, x, y)
@@ -0,0 +1,62 @@
+import tracemalloc
+
+import pygame
+import pytest
+
+from src.untils.constants import *
+
+WARMUP_FRAMES = 60
+MEASURED_FRAMES = 300
+# Player/Enemy giữ vài float trong thuộc tính; mỗi frame chúng được thay bằng object mới
+# nên số block sống dao động theo số entity, không theo số frame
+BLOCKS_PER_ENTITY = 4
+MAX_EXTRA_BLOCKS = 16
+
+
+@pytest.fixture
+def game():
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    from src.game import Game
+    game = Game(screen)
+    game.start_new_game()  # khách: không đụng tới database
+    # Không gọi pygame.quit(): font registry giữ Font của cả tiến trình
+    return game
+
+
+def _frames(game, count):
+    for _ in range(count):
+        game._update_playing(1 / 60)
+        game.render()
+    assert game.state == STATE_PLAYING
+
+
+def _net_blocks(after, before) -> int:
+    return sum(stat.count_diff for stat in after.compare_to(before, "lineno"))
+
+
+@pytest.mark.parametrize("level", [1, 6])
+def test_playing_frames_do_not_grow_memory(game, level):
+    while game.level < level:
+        game.next_level()
+    # Enemy vẫn chạy và va chạm bình thường, chỉ không làm player thua giữa chừng
+    for enemy in game.enemies:
+        enemy.damage = 0
+    _frames(game, WARMUP_FRAMES)
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        _frames(game, MEASURED_FRAMES)
+        middle = tracemalloc.take_snapshot()
+        _frames(game, MEASURED_FRAMES)
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    allowed = MAX_EXTRA_BLOCKS + BLOCKS_PER_ENTITY * (len(game.enemies) + 1)
+    first, second = _net_blocks(middle, before), _net_blocks(after, middle)
+    top = "\n".join(str(stat) for stat in after.compare_to(before, "lineno")[:10])
+    assert first <= allowed, top
+    # Rò rỉ theo frame sẽ làm cửa sổ thứ hai tăng tiếp; trạng thái ổn định thì không
+    assert second <= allowed, top
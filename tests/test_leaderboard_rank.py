@@ -0,0 +1,67 @@
+import calendar
+import random
+import time
+
+from src.database import _BUCKET_SQL, DatabaseManager, period_bucket
+from src.untils.constants import LEADERBOARD_ALL, LEADERBOARD_WEEK
+
+
+def test_week_bucket_is_monday_across_new_year(tmp_path):
+    db = DatabaseManager(str(tmp_path / "game.db"))
+    week_sql = _BUCKET_SQL[LEADERBOARD_WEEK].format(ts="?")
+    # Thứ Hai 29/12/2025 .. Chủ Nhật 04/01/2026 là một tuần
+    for day in range(29, 29 + 7):
+        ts = calendar.timegm((2025, 12, day, 12, 0, 0))
+        assert period_bucket(LEADERBOARD_WEEK, ts) == "2025-12-29"
+        assert db.cursor.execute(f"SELECT {week_sql}", (time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(ts)),)).fetchone()[0] == "2025-12-29"
+    monday = calendar.timegm((2026, 1, 5, 0, 0, 0))
+    assert period_bucket(LEADERBOARD_WEEK, monday) == "2026-01-05"
+    assert db.cursor.execute(f"SELECT {week_sql}", ("2026-01-05 00:00:00",)).fetchone()[0] == "2026-01-05"
+    db.close()
+
+
+def test_rank_matches_brute_force(tmp_path):
+    db = DatabaseManager(str(tmp_path / "game.db"))
+    rng = random.Random(7)
+    users = 60
+    for i in range(users):
+        db.register_user(f"user{i}", "pw")
+    db.cursor.executemany(
+        "INSERT INTO scores (user_id, score, level) VALUES (?, ?, ?)",
+        [(rng.randint(1, users - 5), rng.randint(0, 50), rng.randint(1, 4)) for _ in range(400)]
+    )
+    db.conn.commit()
+
+    best = {}
+    for user_id, score, level in db.cursor.execute(
+        "SELECT user_id, score, level FROM scores ORDER BY id"
+    ).fetchall():
+        if user_id not in best or score > best[user_id][0]:
+            best[user_id] = (score, level)
+    for user_id, key in best.items():
+        expected = 1 + sum(other > key for other in best.values())
+        result = db.get_user_rank(user_id, LEADERBOARD_ALL)
+        assert result["rank"] == expected
+        assert result["players"] == len(best)
+    assert db.get_user_rank(users, LEADERBOARD_ALL) is None
+    db.close()
+
+
+def test_rank_lookup_uses_primary_key(tmp_path):
+    db = DatabaseManager(str(tmp_path / "game.db"))
+    db.register_user("player", "pw")
+    db.cursor.execute("INSERT INTO scores (user_id, score, level) VALUES (1, 1234, 3)")
+    db.conn.commit()
+
+    # Lấy đúng câu lệnh get_user_rank() chạy (đã thay tham số) rồi xem plan của nó
+    statements = []
+    db.conn.set_trace_callback(statements.append)
+    assert db.get_user_rank(1, LEADERBOARD_ALL)["rank"] == 1
+    db.conn.set_trace_callback(None)
+    ahead = [sql for sql in statements if "JOIN rank_counts" in sql]
+    assert len(ahead) == 1 and "FROM (VALUES" in ahead[0]
+
+    plan = db.cursor.execute("EXPLAIN QUERY PLAN " + ahead[0]).fetchall()
+    assert any("PRIMARY KEY" in row[3] and "depth=? AND prefix=?" in row[3] for row in plan)
+    assert not any(row[3].startswith("SCAN r") for row in plan)
+    db.close()
@@ -0,0 +1,79 @@
+import random
+from collections import deque
+
+import pygame
+import pytest
+
+from src.maze_connectivity import ConnectivityValidator
+from src.untils.constants import *
+
+
+@pytest.fixture(autouse=True)
+def display():
+    pygame.display.init()
+
+
+def _grid(size):
+    grid = [[EDITOR_TILE_EMPTY] * size for _ in range(size)]
+    for i in range(size):
+        grid[0][i] = grid[size - 1][i] = grid[i][0] = grid[i][size - 1] = EDITOR_TILE_WALL
+    return grid
+
+
+def _set(validator, grid, x, y, tile):
+    grid[y][x] = tile
+    validator.mark(x, y, 1, 1, tile)
+
+
+def _reachable(grid, start, exit):
+    seen = {start}
+    queue = deque(seen)
+    while queue:
+        x, y = queue.popleft()
+        for nx, ny in ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)):
+            if (nx, ny) not in seen and grid[ny][nx] != EDITOR_TILE_WALL:
+                seen.add((nx, ny))
+                queue.append((nx, ny))
+    return exit in seen
+
+
+def test_reopened_wall_does_not_keep_its_old_region():
+    grid = _grid(9)
+    validator = ConnectivityValidator()
+    validator.reset(grid)
+    _set(validator, grid, 1, 1, EDITOR_TILE_START)
+    assert not validator.finish()
+
+    _set(validator, grid, 4, 4, EDITOR_TILE_WALL)
+    validator.finish()
+    for x, y in ((3, 4), (5, 4), (4, 3), (4, 5)):
+        _set(validator, grid, x, y, EDITOR_TILE_WALL)
+    validator.finish()
+    _set(validator, grid, 4, 4, EDITOR_TILE_EXIT)
+
+    assert not validator.finish()
+    assert validator.status == "EXIT unreachable"
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_random_edits_match_bfs(seed):
+    rng = random.Random(seed)
+    size = 6
+    grid = _grid(size)
+    validator = ConnectivityValidator()
+    validator.reset(grid)
+    start, exit = (1, 1), (size - 2, size - 2)
+    _set(validator, grid, *start, EDITOR_TILE_START)
+    _set(validator, grid, *exit, EDITOR_TILE_EXIT)
+    for _ in range(600):
+        cell = rng.randint(1, size - 2), rng.randint(1, size - 2)
+        if cell in (start, exit):
+            continue
+        if rng.random() < 0.1:
+            # Đặt EXIT chỗ khác như editor: EXIT cũ bị xoá
+            _set(validator, grid, *exit, EDITOR_TILE_EMPTY)
+            exit = cell
+            _set(validator, grid, *exit, EDITOR_TILE_EXIT)
+        else:
+            _set(validator, grid, *cell, rng.choice((EDITOR_TILE_WALL, EDITOR_TILE_WALL, EDITOR_TILE_EMPTY)))
+        assert validator.finish() == _reachable(grid, start, exit)
@@ -0,0 +1,42 @@
+import json
+import sqlite3
+
+from src.database import DatabaseManager
+
+GRID = [[1, 1, 1], [1, 2, 1], [1, 3, 1], [1, 1, 1]]
+
+
+def _old_database(path, with_dimensions):
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY AUTOINCREMENT, username TEXT UNIQUE, password TEXT, "
+                 "skin_type TEXT DEFAULT 'preset', skin_value TEXT DEFAULT '1', last_level INTEGER DEFAULT 0)")
+    columns = ", width INTEGER NOT NULL DEFAULT 0, height INTEGER NOT NULL DEFAULT 0" if with_dimensions else ""
+    conn.execute("CREATE TABLE mazes (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL, data TEXT NOT NULL, "
+                 f"created_by INTEGER NOT NULL, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP{columns})")
+    conn.execute("INSERT INTO users (username, password) VALUES ('old', 'x')")
+    values = (", 3, 4", ", width, height") if with_dimensions else ("", "")
+    conn.execute(f"INSERT INTO mazes (name, data, created_by{values[1]}) VALUES ('m', ?, 1{values[0]})",
+                 (json.dumps(GRID),))
+    conn.commit()
+    conn.close()
+
+
+def _check_migrated(path):
+    db = DatabaseManager(str(path))
+    try:
+        assert db.list_custom_mazes(limit=5)[0][3:5] == (3, 4)
+        assert db.load_custom_maze(1) == GRID
+        assert db.cursor.execute("SELECT data FROM mazes WHERE id = 1").fetchone()[0] == ""
+    finally:
+        db.close()
+
+
+def test_migrates_database_without_dimensions(tmp_path):
+    _old_database(tmp_path / "game.db", with_dimensions=False)
+    _check_migrated(tmp_path / "game.db")
+
+
+def test_migrates_database_with_dimensions_but_no_blob_hash(tmp_path):
+    # Schema sau khi thêm width/height nhưng trước khi lưu grid thành blob
+    _old_database(tmp_path / "game.db", with_dimensions=True)
+    _check_migrated(tmp_path / "game.db")
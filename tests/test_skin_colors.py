@@ -0,0 +1,20 @@
+import pytest
+
+from src.player import Player
+from src.untils.skin_cache import parse_color
+
+
+def test_parse_color_accepts_tuple_and_plain_forms():
+    assert parse_color("(255, 0, 128)") == (255, 0, 128)
+    assert parse_color("10,20,30,255") == (10, 20, 30)
+
+
+@pytest.mark.parametrize("value", ["(inf,0,0)", "nan,0,0", "256,0,0", "-1,0,0", "1,2", "red"])
+def test_parse_color_rejects_bad_values(value):
+    with pytest.raises(ValueError):
+        parse_color(value)
+
+
+def test_player_falls_back_to_white_for_bad_stored_color():
+    player = Player(1, 1, skin_type="color", skin_value="(inf,0,0)")
+    assert player.color == (255, 255, 255)
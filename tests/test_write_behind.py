@@ -0,0 +1,37 @@
+import threading
+
+from src.database import DatabaseManager, WriteBehindQueue
+
+
+def _join_or_fail(target, timeout=5.0):
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), f"{target.__name__} hung"
+
+
+def test_failing_callback_and_statement_do_not_kill_writer(tmp_path):
+    db = DatabaseManager(str(tmp_path / "game.db"))
+    db.register_user("alice", "pw")
+    user_id = db.login_user("alice", "pw")["id"]
+
+    def broken_callback():
+        raise RuntimeError("boom")
+
+    db.writer.put("INSERT INTO no_such_table VALUES (1)")
+    db.writer.put("UPDATE users SET last_level = 3 WHERE id = ?", (user_id,), on_commit=broken_callback)
+    _join_or_fail(db.flush)
+
+    # Luồng ghi vẫn sống: lệnh sau vẫn được commit
+    db.update_user_skin(user_id, "color", "(1, 2, 3)")
+    assert db.get_user_skin(user_id) == {"skin_type": "color", "skin_value": "(1, 2, 3)"}
+    assert db.login_user("alice", "pw")["last_level"] == 3
+    _join_or_fail(db.writer.close)
+    db.conn.close()
+
+
+def test_unopenable_database_does_not_hang_flush_or_close(tmp_path):
+    writer = WriteBehindQueue(str(tmp_path / "missing" / "game.db"))
+    writer.put("UPDATE users SET last_level = 1")
+    _join_or_fail(writer.flush)
+    _join_or_fail(writer.close)
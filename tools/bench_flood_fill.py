@@ -0,0 +1,113 @@
+"""
+Flood Fill Benchmark
+====================
+Fills three kinds of region on a large editor grid:
+  - open: an empty grid, a few long spans per row;
+  - random: 30% of the cells are walls (about 70% of the grid is one
+    ragged region with many short spans);
+  - serpentine: one-cell vertical corridors joined at alternate ends, the
+    worst case for a span fill (one span per cell pair of rows).
+
+For each it reports the spans, flood_fill_spans() on its own, and the fill
+as the editor runs it: how many frames it is spread over and the longest
+frame (editor update plus the overview redraw), which is what the user
+feels, against doing the whole fill in one frame.
+
+Usage:
+    python tools/bench_flood_fill.py [size]
+"""
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+from src.editor import MazeEditor
+from src.editor_tools import flood_fill_spans
+from src.untils.constants import *
+
+
+def _open(size: int) -> list:
+    grid = [[EDITOR_TILE_EMPTY] * size for _ in range(size)]
+    for row in grid:
+        row[0] = row[-1] = EDITOR_TILE_WALL
+    grid[0] = [EDITOR_TILE_WALL] * size
+    grid[-1] = [EDITOR_TILE_WALL] * size
+    return grid
+
+
+def _random(size: int) -> list:
+    rng = random.Random(42)
+    grid = _open(size)
+    for row in grid[1:-1]:
+        for x in range(1, size - 1):
+            if rng.random() < 0.3:
+                row[x] = EDITOR_TILE_WALL
+    grid[size // 2][size // 2 | 1] = EDITOR_TILE_EMPTY
+    return grid
+
+
+def _serpentine(size: int) -> list:
+    grid = _open(size)
+    for x in range(2, size - 1, 2):
+        gap = 1 if x % 4 == 0 else size - 2
+        for y in range(1, size - 1):
+            if y != gap:
+                grid[y][x] = EDITOR_TILE_WALL
+    return grid
+
+
+def _editor_fill(editor: MazeEditor, grid: list) -> tuple:
+    """(frames, longest frame, total) for one fill of `grid`, in seconds."""
+    editor.grid = grid
+    editor.grid_width = editor.grid_height = len(grid)
+    editor._rebuild_overview()
+    editor.history.clear()
+    editor.validator.reset(editor.grid)
+    editor.current_tool = EDITOR_TILE_ENEMY
+    editor.mode = EDITOR_MODE_FILL
+    editor.cell_size, editor.view_x, editor.view_y = 1, 0.0, 0.0
+    centre = len(grid) // 2
+    pos = (editor.viewport.x + (centre | 1), editor.viewport.y + centre)  # x lẻ: không rơi vào tường của serpentine
+
+    frames = 0
+    longest = 0.0
+    started = time.perf_counter()
+    editor.handle_event(pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=pos))
+    while True:
+        frame = time.perf_counter()
+        editor._run_fill(EDITOR_FILL_BUDGET)
+        editor._redraw_dirty()
+        longest = max(longest, time.perf_counter() - frame)
+        frames += 1
+        if not editor.is_filling:
+            break
+    return frames, longest, time.perf_counter() - started
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    pygame.display.init()
+    pygame.font.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    editor = MazeEditor(screen, None, None)
+
+    print(f"{size}x{size}, fill budget {EDITOR_FILL_BUDGET * 1000:.0f} ms/frame")
+    print(f"{'region':>10} | {'spans':>8} | {'spans()':>9} | {'frames':>6} | {'longest':>9} | {'total':>9}")
+    for name, build in (("open", _open), ("random", _random), ("serpentine", _serpentine)):
+        grid = [bytearray(row) for row in build(size)]  # hàng bytearray như grid của editor
+        started = time.perf_counter()
+        spans = flood_fill_spans(grid, size // 2 | 1, size // 2)
+        alone = time.perf_counter() - started
+        frames, longest, total = _editor_fill(editor, [bytearray(row) for row in build(size)])
+        print(f"{name:>10} | {len(spans):>8} | {alone * 1000:>7.1f}ms | {frames:>6} | "
+              f"{longest * 1000:>7.1f}ms | {total * 1000:>7.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
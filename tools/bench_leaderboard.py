@@ -0,0 +1,125 @@
+"""
+Leaderboard Benchmark
+=====================
+Fills a throw-away database with synthetic scores and times, at several
+table sizes:
+  - a cold top-10 read from the materialised user_best table against the
+    old GROUP BY over the whole scores table;
+  - a user's rank/percentile (get_user_rank: a sum over at most 42 rank_counts nodes)
+    against computing it from a GROUP BY over scores;
+  - the write path: one score insert, committed in a batch of
+    DB_WRITE_BATCH_SIZE as the write-behind queue does. Each board row
+    inserted upserts RANK_KEY_BITS (42) rank_counts nodes and each best
+    that improves moves 2 x 42, on up to three boards (all/day/week).
+    After the last size the rank_counts triggers are dropped and the
+    write is timed again, for comparison.
+
+Usage:
+    python tools/bench_leaderboard.py [max_rows] [users]
+"""
+import itertools
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database import DatabaseManager, DatabaseSession
+from src.untils.constants import DB_WRITE_BATCH_SIZE
+
+GROUP_BY_QUERY = '''
+    SELECT u.username, MAX(s.score) AS best_score, s.level
+    FROM scores s
+    JOIN users u ON s.user_id = u.id
+    GROUP BY s.user_id
+    ORDER BY best_score DESC, s.level DESC
+    LIMIT 10
+'''
+RANK_SCAN_QUERY = '''
+    SELECT COUNT(*) + 1
+    FROM (SELECT MAX(score) AS best FROM scores GROUP BY user_id)
+    WHERE best > (SELECT MAX(score) FROM scores WHERE user_id = ?)
+'''
+CHUNK = 50_000
+_record = itertools.count(100_001)  # điểm cao hơn mọi điểm ngẫu nhiên
+RANK_TRIGGERS = ("trg_user_best_rank_insert", "trg_user_best_rank_update",
+                 "trg_period_best_rank_insert", "trg_period_best_rank_update")
+
+
+def _time(fn, repeat: int = 5) -> float:
+    """Best of `repeat` runs, in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def _write_ms(db: DatabaseManager, rng: random.Random, users: int, new_best: bool = False) -> float:
+    """
+    Milliseconds per score insert, in write-behind sized transactions.
+
+    new_best: every score beats all earlier ones, so each insert moves the
+    player on all three boards (the worst case for the rank_counts triggers).
+    """
+    def score():
+        return next(_record) if new_best else rng.randint(0, 100_000)
+
+    def batch():
+        db.cursor.executemany(
+            "INSERT INTO scores (user_id, score, level) VALUES (?, ?, ?)",
+            ((rng.randint(1, users), score(), rng.randint(1, 20)) for _ in range(DB_WRITE_BATCH_SIZE))
+        )
+        db.conn.commit()
+    return _time(batch, repeat=20) / DB_WRITE_BATCH_SIZE
+
+
+def main():
+    max_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    users = int(sys.argv[2]) if len(sys.argv) > 2 else 10_000
+    checkpoints = [n for n in (10_000, 100_000, 1_000_000, 10_000_000) if n < max_rows] + [max_rows]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(os.path.join(tmp, "bench.db"))
+        db.cursor.executemany(
+            "INSERT INTO users (username, password) VALUES (?, ?)",
+            ((f"user{i}", "x") for i in range(users))
+        )
+        db.conn.commit()
+
+        rng = random.Random(42)
+        inserted = 0
+        print(f"{'rows':>10} | {'user_best':>10} | {'GROUP BY':>10} | {'rank':>10} | {'rank scan':>10} | {'insert':>10} | {'new best':>10}")
+        for target in checkpoints:
+            while inserted < target:
+                n = min(CHUNK, target - inserted)
+                db.cursor.executemany(
+                    "INSERT INTO scores (user_id, score, level) VALUES (?, ?, ?)",
+                    ((rng.randint(1, users), rng.randint(0, 100_000), rng.randint(1, 20)) for _ in range(n))
+                )
+                db.conn.commit()
+                inserted += n
+
+            fast = _time(lambda: db._query_leaderboard(10))
+            slow = _time(lambda: db.cursor.execute(GROUP_BY_QUERY).fetchall(), repeat=1)
+            # Trung bình trên nhiều user (bỏ qua cache) để không phụ thuộc vị trí của một người
+            sample = [rng.randint(1, users) for _ in range(100)]
+            rank = _time(lambda: [DatabaseSession.get_user_rank(db, u) for u in sample]) / len(sample)
+            rank_scan = _time(lambda: db.cursor.execute(RANK_SCAN_QUERY, (sample[0],)).fetchone(), repeat=1)
+            write = _write_ms(db, rng, users)
+            worst = _write_ms(db, rng, users, new_best=True)
+            print(f"{inserted:>10} | {fast:>8.3f}ms | {slow:>8.1f}ms | {rank:>8.3f}ms | {rank_scan:>8.1f}ms | "
+                  f"{write:>8.3f}ms | {worst:>8.3f}ms")
+
+        for trigger in RANK_TRIGGERS:
+            db.cursor.execute(f"DROP TRIGGER {trigger}")
+        print(f"without rank_counts triggers: insert {_write_ms(db, rng, users):.3f}ms, "
+              f"new best {_write_ms(db, rng, users, new_best=True):.3f}ms")
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""
+Database Import / Export
+========================
+Streams the users, scores and mazes tables to and from JSONL or CSV files.
+Rows are read and written in bounded chunks (one executemany and one
+transaction per chunk on import), so memory stays flat however large the
+table is. Progress and rows/sec are reported on stderr.
+
+Usage:
+    python tools/db_transfer.py export scores scores.jsonl
+    python tools/db_transfer.py import scores scores.csv --chunk 20000
+    python tools/db_transfer.py import users users.jsonl --on-conflict ignore
+
+With --on-conflict replace, an existing score row is deleted and
+re-inserted, which the leaderboard triggers cannot undo, so the derived
+leaderboard tables are rebuilt from `scores` once the import finishes.
+
+Mazes are exported with their grid as a JSON list of rows, so the files do
+not depend on the packed storage format.
+"""
+import argparse
+import csv
+import itertools
+import json
+import os
+import sqlite3
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database import DatabaseManager
+from src.maze_codec import encode_grid, decode_grid
+
+TABLES = {
+    "users": ("id", "username", "password", "skin_type", "skin_value", "last_level"),
+    "scores": ("id", "user_id", "score", "level", "completed_at"),
+    "mazes": ("id", "name", "created_by", "created_at", "width", "height", "grid"),
+}
+CONFLICT_CLAUSES = {"abort": "INSERT", "ignore": "INSERT OR IGNORE", "replace": "INSERT OR REPLACE"}
+DEFAULT_CHUNK = 10_000
+
+
+class Progress:
+    """Prints rows done and rows/sec, at most a few times per second."""
+
+    def __init__(self, label: str):
+        self.label = label
+        self.rows = 0
+        self.started = time.perf_counter()
+        self._last_print = 0.0
+
+    def add(self, count: int):
+        self.rows += count
+        now = time.perf_counter()
+        if now - self._last_print >= 0.25:
+            self._last_print = now
+            self._print("\r")
+
+    def finish(self):
+        self._print("\r")
+        sys.stderr.write("\n")
+
+    def _print(self, prefix: str):
+        elapsed = max(time.perf_counter() - self.started, 1e-9)
+        sys.stderr.write(f"{prefix}{self.label}: {self.rows} rows ({self.rows / elapsed:,.0f} rows/s)")
+        sys.stderr.flush()
+
+
+def _detect_format(path: str, fmt: str) -> str:
+    if fmt:
+        return fmt
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+
+def _chunks(iterable, size: int):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+# ==================== Export ====================
+
+def _select_rows(db: DatabaseManager, table: str, chunk: int):
+    """Yield rows as dicts, fetching `chunk` rows at a time."""
+    cursor = db.conn.cursor()
+    if table == "mazes":
+        cursor.execute('''
+                       SELECT m.id, m.name, m.created_by, m.created_at, m.width, m.height, m.data, b.grid
+                       FROM mazes m
+                                LEFT JOIN maze_blobs b ON b.hash = m.blob_hash
+                       ORDER BY m.id
+                       ''')
+    else:
+        cursor.execute(f"SELECT {', '.join(TABLES[table])} FROM {table} ORDER BY id")
+
+    while True:
+        rows = cursor.fetchmany(chunk)
+        if not rows:
+            return
+        for row in rows:
+            if table == "mazes":
+                *meta, data, blob = row
+                grid = decode_grid(blob) if blob is not None else json.loads(data)
+                yield dict(zip(TABLES[table], (*meta, json.dumps(grid, separators=(",", ":")))))
+            else:
+                yield dict(zip(TABLES[table], row))
+
+
+def export_table(db: DatabaseManager, table: str, path: str, fmt: str, chunk: int) -> int:
+    progress = Progress(f"export {table}")
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = None
+        if fmt == "csv":
+            writer = csv.DictWriter(f, fieldnames=TABLES[table])
+            writer.writeheader()
+        for rows in _chunks(_select_rows(db, table, chunk), chunk):
+            if writer:
+                writer.writerows(rows)
+            else:
+                f.writelines(json.dumps(row, ensure_ascii=False) + "\n" for row in rows)
+            progress.add(len(rows))
+    progress.finish()
+    return progress.rows
+
+
+# ==================== Import ====================
+
+def _read_records(path: str, fmt: str):
+    with open(path, newline="", encoding="utf-8") as f:
+        if fmt == "csv":
+            for record in csv.DictReader(f):
+                # CSV không phân biệt chuỗi rỗng và NULL; coi rỗng là NULL
+                yield {k: (v if v != "" else None) for k, v in record.items()}
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def _insert_chunk(db: DatabaseManager, table: str, columns: tuple, records: list, verb: str):
+    cursor = db.conn.cursor()
+    if table == "mazes":
+        blobs = []
+        rows = []
+        for record in records:
+            grid = record["grid"]
+            if isinstance(grid, str):
+                grid = json.loads(grid)
+            blob, content_hash = encode_grid(grid)
+            blobs.append((content_hash, blob))
+            width = len(grid[0]) if grid else 0
+            rows.append(tuple(record.get(c) for c in columns) + ("", width, len(grid), content_hash))
+        cursor.executemany('INSERT OR IGNORE INTO maze_blobs (hash, grid) VALUES (?, ?)', blobs)
+        columns = columns + ("data", "width", "height", "blob_hash")
+    else:
+        rows = [tuple(record.get(c) for c in columns) for record in records]
+
+    placeholders = ", ".join("?" * len(columns))
+    cursor.executemany(f"{verb} INTO {table} ({', '.join(columns)}) VALUES ({placeholders})", rows)
+
+
+def import_table(db: DatabaseManager, table: str, path: str, fmt: str, chunk: int, on_conflict: str) -> int:
+    verb = CONFLICT_CLAUSES[on_conflict]
+    progress = Progress(f"import {table}")
+    columns = None
+    for records in _chunks(_read_records(path, fmt), chunk):
+        if columns is None:
+            # Cột lấy theo bản ghi đầu tiên; width/height của maze luôn tính lại từ grid
+            skip = {"grid", "width", "height"} if table == "mazes" else set()
+            columns = tuple(c for c in TABLES[table] if c in records[0] and c not in skip)
+            if table == "mazes" and "grid" not in records[0]:
+                raise ValueError("maze records need a 'grid' field")
+        with db.conn:  # một transaction cho mỗi chunk
+            _insert_chunk(db, table, columns, records, verb)
+        progress.add(len(records))
+    progress.finish()
+    if table == "scores" and on_conflict == "replace":
+        # REPLACE xoá dòng cũ rồi chèn dòng mới: chỉ trigger AFTER INSERT chạy,
+        # điểm cũ vẫn nằm trong user_best/period_best/board_sizes
+        db.rebuild_leaderboards()
+    return progress.rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stream maze game tables to/from JSONL or CSV.")
+    parser.add_argument("action", choices=("export", "import"))
+    parser.add_argument("table", choices=tuple(TABLES))
+    parser.add_argument("path", help="JSONL or CSV file")
+    parser.add_argument("--format", choices=("jsonl", "csv"), help="default: from the file extension")
+    parser.add_argument("--db", help="database file (default: the game's database)")
+    parser.add_argument("--chunk", type=int, default=DEFAULT_CHUNK, help="rows per batch/transaction")
+    parser.add_argument("--on-conflict", choices=tuple(CONFLICT_CLAUSES), default="abort",
+                        help="what to do with rows whose id/username already exists")
+    args = parser.parse_args(argv)
+
+    fmt = _detect_format(args.path, args.format)
+    db = DatabaseManager(args.db)
+    try:
+        if args.action == "export":
+            export_table(db, args.table, args.path, fmt, args.chunk)
+        else:
+            import_table(db, args.table, args.path, fmt, args.chunk, args.on_conflict)
+    except (sqlite3.Error, ValueError, KeyError) as e:
+        # Chunk đang ghi đã được rollback; các chunk trước vẫn giữ nguyên
+        sys.stderr.write(f"\nError: {e}\n")
+        return 1
+    finally:
+        db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,133 @@
+"""
+Network Latency Test
+====================
+Runs the game server on localhost and one PredictedClient behind simulated
+latency, jitter and loss, driven at 60 frames/s by a scripted bot. Compares
+what prediction + interpolation draws against simply drawing the latest
+server state:
+
+  - input latency: time from a direction change until the drawn player
+    starts moving that way;
+  - reconciliation: how often and by how much the prediction was corrected;
+  - smoothness: how much enemy speed changes from one frame to the next
+    (a stall followed by a jump scores badly), and frames with no data.
+
+Usage:
+    python tools/net_latency_test.py [rtt_ms] [loss] [seconds]
+"""
+import asyncio
+import math
+import os
+import random
+import statistics
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.db_service import DatabaseService
+from src.net.prediction import PredictedClient
+from src.net.protocol import KIND_ENEMY, dequantize, flags_direction
+from src.net.server import GameServer
+
+FRAME_DT = 1.0 / 60
+
+
+def _sign(value: float) -> int:
+    return (value > 0) - (value < 0)
+
+
+def _speed_changes(tracks: dict) -> list:
+    """|change in per-frame displacement| for every enemy and frame, in pixels."""
+    changes = []
+    for points in tracks.values():
+        steps = [math.hypot(x1 - x0, y1 - y0) for (x0, y0), (x1, y1) in zip(points, points[1:])]
+        changes.extend(abs(b - a) for a, b in zip(steps, steps[1:]))
+    return changes
+
+
+async def run(rtt: float, loss: float, seconds: float):
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseService(os.path.join(tmp, "latency.db"))
+        await db.aio.register_user("bot", "bot")
+        host_id = (await db.aio.login_user("bot", "bot"))["id"]
+        code = await db.aio.create_multiplayer_session(host_id)
+        server = GameServer(db, port=0, verbose=False)
+        await server.start()
+
+        client = PredictedClient(latency=rtt, jitter=rtt * 0.1, loss=loss, seed=7)
+        await client.connect(code, "bot", "bot", port=server.port)
+
+        rng = random.Random(3)
+        loop = asyncio.get_running_loop()
+        direction = (0, 0)
+        changed_at = None
+        predicted_delays, naive_delays = [], []
+        waiting_predicted = waiting_naive = False
+        smooth_tracks, naive_tracks = {}, {}
+
+        end = loop.time() + seconds
+        next_frame = loop.time()
+        while loop.time() < end:
+            now = loop.time()
+            if rng.random() < 0.02:
+                new_direction = (rng.choice((-1, 1)), 0) if rng.random() < 0.5 else (0, rng.choice((-1, 1)))
+                if new_direction != direction:
+                    direction = new_direction
+                    changed_at = now
+                    waiting_predicted = waiting_naive = True
+            client.update(FRAME_DT, *direction)
+
+            # Player vẽ theo prediction vs theo snapshot mới nhất
+            if client.player is not None and changed_at is not None:
+                if waiting_predicted and (_sign(client.player.velocity_x), _sign(client.player.velocity_y)) == direction:
+                    predicted_delays.append(now - changed_at)
+                    waiting_predicted = False
+                mine = client.state.get(client.player_id)
+                if waiting_naive and mine and flags_direction(mine[4]) == direction:
+                    naive_delays.append(now - changed_at)
+                    waiting_naive = False
+
+            for entity_id, (kind, x, y, _, _) in client.remote_entities().items():
+                if kind == KIND_ENEMY:
+                    smooth_tracks.setdefault(entity_id, []).append((x, y))
+            for entity_id, (kind, qx, qy, _, _) in client.state.items():
+                if kind == KIND_ENEMY:
+                    naive_tracks.setdefault(entity_id, []).append((dequantize(qx), dequantize(qy)))
+
+            next_frame += FRAME_DT
+            await asyncio.sleep(max(0.0, next_frame - loop.time()))
+
+        smooth = _speed_changes(smooth_tracks)
+        naive = _speed_changes(naive_tracks)
+        corrections = client.corrections
+
+        print(f"RTT {rtt * 1000:.0f} ms, jitter {rtt * 100:.0f} ms, loss {loss:.0%}, "
+              f"{seconds:.0f}s, {client.frames} frames, {client.snapshots_received} snapshots, "
+              f"{client.downlink.lost + client.uplink.lost} packets lost")
+        print(f"  input latency: predicted {statistics.mean(predicted_delays) * 1000:.0f} ms, "
+              f"latest-state {statistics.mean(naive_delays) * 1000:.0f} ms "
+              f"({len(naive_delays)} direction changes)")
+        if corrections:
+            print(f"  reconciliation: {len(corrections)} corrections, "
+                  f"{statistics.mean(corrections):.2f} px avg, {max(corrections):.2f} px max")
+        else:
+            print("  reconciliation: no corrections needed")
+        print(f"  enemy speed change per frame: interpolated {statistics.mean(smooth):.2f} px avg "
+              f"/ {max(smooth):.1f} max, latest-state {statistics.mean(naive):.2f} px avg / {max(naive):.1f} max")
+        print(f"  interpolation underruns: {client.underruns} of {client.frames} frames")
+
+        await client.close()
+        await server.stop()
+        db.close()
+
+
+def main():
+    rtt = float(sys.argv[1]) / 1000 if len(sys.argv) > 1 else 0.15
+    loss = float(sys.argv[2]) if len(sys.argv) > 2 else 0.02
+    seconds = float(sys.argv[3]) if len(sys.argv) > 3 else 10.0
+    asyncio.run(run(rtt, loss, seconds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Multiplayer Load Test
+=====================
+Starts the game server on localhost with a throw-away database, connects
+simulated clients that send random inputs every tick, and reports the
+server's per-tick cost, bandwidth per client and full vs delta snapshot
+size. At the end every client's decoded state is checked against the last
+snapshot the server sent it.
+
+Usage:
+    python tools/net_loadtest.py [clients] [seconds] [sessions]
+"""
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.db_service import DatabaseService
+from src.net.client import NetClient
+from src.net.protocol import encode_snapshot
+from src.net.server import GameServer
+
+
+async def _drive(client: NetClient, stop: asyncio.Event, rng: random.Random):
+    """Send one input per tick, changing direction every so often."""
+    interval = 1.0 / client.tick_rate
+    dx = dy = 0
+    while not stop.is_set():
+        if rng.random() < 0.1:
+            dx, dy = rng.randint(-1, 1), rng.randint(-1, 1)
+        client.send_input(dx, dy)
+        await asyncio.sleep(interval)
+
+
+async def run(clients: int, seconds: float, sessions: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseService(os.path.join(tmp, "loadtest.db"))
+        # Đọc không chờ ghi: phải đợi đăng ký xong rồi mới đăng nhập
+        await asyncio.gather(*(db.aio.register_user(f"bot{i}", "bot") for i in range(clients)))
+        host_id = (await db.aio.login_user("bot0", "bot"))["id"]
+        codes = [await db.aio.create_multiplayer_session(host_id) for _ in range(sessions)]
+
+        server = GameServer(db, port=0, verbose=False)
+        await server.start()
+
+        bots = []
+        for i in range(clients):
+            bot = NetClient()
+            await bot.connect(codes[i % sessions], f"bot{i}", "bot", port=server.port)
+            bots.append(bot)
+
+        stop = asyncio.Event()
+        rng = random.Random(1)
+        drivers = [asyncio.create_task(_drive(bot, stop, rng)) for bot in bots]
+        server.stats.reset()
+        started = time.perf_counter()
+        await asyncio.sleep(seconds)
+        stop.set()
+        await asyncio.gather(*drivers)
+        elapsed = time.perf_counter() - started
+
+        # Chờ snapshot cuối tới nơi rồi so trạng thái client với baseline của server
+        await asyncio.sleep(0.2)
+        server_clients = {c.user["username"]: c for c in server.clients()}
+        mismatches = 0
+        for i, bot in enumerate(bots):
+            if bot.state != server_clients[f"bot{i}"].baseline:
+                mismatches += 1
+
+        session = next(iter(server.sessions.values()))
+        full = len(encode_snapshot(server.tick, 0, session.world_state()))
+        per_client = [c.bandwidth for c in server_clients.values()]
+
+        print(f"{clients} clients in {sessions} sessions for {elapsed:.1f}s at {server.tick_rate} ticks/s")
+        print(f"  server: {server.stats.summary()}")
+        print(f"  full snapshot {full} B (one session), bandwidth per client "
+              f"{sum(per_client) / len(per_client) / 1024:.2f} KiB/s avg, {max(per_client) / 1024:.2f} KiB/s max")
+        print(f"  received: {sum(b.snapshots_received for b in bots) / clients:.0f} snapshots per client, "
+              f"state mismatches: {mismatches}")
+
+        for bot in bots:
+            await bot.close()
+        await server.stop()
+        finished = [(await db.aio.get_multiplayer_session(code))["status"] for code in codes]
+        print(f"  session status after shutdown: {', '.join(sorted(set(finished)))}")
+        db.close()
+        return mismatches
+
+
+def main():
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 5.0
+    sessions = int(sys.argv[3]) if len(sys.argv) > 3 else 2
+    mismatches = asyncio.run(run(clients, seconds, sessions))
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+"""
+Spectator Broadcast Benchmark
+=============================
+Runs the game server on localhost with a few bot players in one session,
+then attaches hundreds of spectators and reports what they cost the server
+per tick. Most spectators only drain the socket; a few decode every frame
+and are checked against the server's state at the end.
+
+A second, short run shows the backpressure: a few spectators stop reading
+until the server starts dropping their frames, then catch up from a full
+snapshot instead of working through a backlog. It ticks at
+SLOW_TICK_RATE so the kernel socket buffers fill in seconds, not minutes.
+
+Usage:
+    python tools/net_spectator_bench.py [spectators] [seconds] [players]
+"""
+import asyncio
+import os
+import random
+import socket
+import struct
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.db_service import DatabaseService
+from src.net.client import NetClient, SpectatorClient
+from src.net.protocol import MSG_SPECTATE, FRAME_HEADER_SIZE, json_frame, encode_snapshot
+from src.net.server import GameServer
+
+DECODING_SPECTATORS = 8
+SLOW_SPECTATORS = 4
+SLOW_TICK_RATE = 300
+
+
+class _Drain(asyncio.Protocol):
+    """A spectator that reads and throws away everything it is sent."""
+
+    def __init__(self, code: str):
+        self.code = code
+        self.bytes_received = 0
+
+    def connection_made(self, transport):
+        transport.write(json_frame(MSG_SPECTATE, {"session": self.code}))
+
+    def data_received(self, data):
+        self.bytes_received += len(data)
+
+
+class _SlowReader(asyncio.Protocol):
+    """A decoding spectator on a socket with a tiny receive buffer, so pausing it backs up the server."""
+
+    def __init__(self, code: str):
+        self.code = code
+        self.client = SpectatorClient()
+        self.transport = None
+        self._buffer = bytearray()
+
+    def connection_made(self, transport):
+        self.transport = transport
+        transport.write(json_frame(MSG_SPECTATE, {"session": self.code}))
+
+    def data_received(self, data):
+        self._buffer += data
+        while len(self._buffer) >= FRAME_HEADER_SIZE:
+            length, msg_type = struct.unpack_from("<IB", self._buffer)
+            end = FRAME_HEADER_SIZE + length
+            if len(self._buffer) < end:
+                break
+            self.client._deliver(msg_type, bytes(self._buffer[FRAME_HEADER_SIZE:end]))
+            del self._buffer[:end]
+
+
+async def _connect_slow(code: str, port: int) -> _SlowReader:
+    loop = asyncio.get_running_loop()
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    # Đặt SO_RCVBUF trước khi kết nối: kernel không tự nới rộng bộ đệm nhận nữa
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+    sock.setblocking(False)
+    await loop.sock_connect(sock, ("127.0.0.1", port))
+    _, reader = await loop.create_connection(lambda: _SlowReader(code), sock=sock)
+    return reader
+
+
+async def _drive(client: NetClient, stop: asyncio.Event, rng: random.Random):
+    interval = 1.0 / client.tick_rate
+    dx = dy = 0
+    while not stop.is_set():
+        if rng.random() < 0.1:
+            dx, dy = rng.randint(-1, 1), rng.randint(-1, 1)
+        client.send_input(dx, dy)
+        await asyncio.sleep(interval)
+
+
+async def _measure(server: GameServer, seconds: float):
+    server.stats.reset()
+    session = next(iter(server.sessions.values()))
+    encoded = session.feed.bytes_encoded
+    await asyncio.sleep(seconds)
+    stats = server.stats
+    return (stats.mean_ms, stats.broadcast / max(stats.ticks, 1) * 1000,
+            (session.feed.bytes_encoded - encoded) / max(stats.ticks, 1))
+
+
+async def run(spectators: int, seconds: float, players: int):
+    loop = asyncio.get_running_loop()
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseService(os.path.join(tmp, "spectators.db"))
+        await asyncio.gather(*(db.aio.register_user(f"bot{i}", "bot") for i in range(players)))
+        host_id = (await db.aio.login_user("bot0", "bot"))["id"]
+        code = await db.aio.create_multiplayer_session(host_id)
+        server = GameServer(db, port=0, verbose=False)
+        await server.start()
+
+        bots = []
+        for i in range(players):
+            bot = NetClient()
+            await bot.connect(code, f"bot{i}", "bot", port=server.port)
+            bots.append(bot)
+        stop = asyncio.Event()
+        rng = random.Random(1)
+        drivers = [asyncio.create_task(_drive(bot, stop, rng)) for bot in bots]
+
+        tick_alone, _, _ = await _measure(server, seconds)
+
+        started = time.perf_counter()
+        drains = []
+        for _ in range(spectators - DECODING_SPECTATORS):
+            _, protocol = await loop.create_connection(lambda: _Drain(code), "127.0.0.1", server.port)
+            drains.append(protocol)
+        watchers = []
+        for _ in range(DECODING_SPECTATORS):
+            watcher = SpectatorClient()
+            await watcher.connect(code, port=server.port)
+            watchers.append(watcher)
+        connect_time = time.perf_counter() - started
+
+        tick_watched, broadcast_ms, encoded_per_tick = await _measure(server, seconds)
+
+        stop.set()
+        await asyncio.gather(*drivers)
+        # Dừng server trước rồi mới so: frame cuối đã ghi sẽ tới trước EOF
+        feed = next(iter(server.sessions.values())).feed
+        await server.stop()
+        await asyncio.sleep(0.3)
+        mismatches = sum(1 for w in watchers if w.state != feed.state or w.tick != feed.tick)
+
+        # Nếu mỗi người xem có baseline riêng như player: mỗi người một lần encode
+        state = feed.state
+        baseline = {k: (kind, x + 8, y, health, flags) for k, (kind, x, y, health, flags) in state.items()}
+        timed = 2000
+        encode_started = time.perf_counter()
+        for _ in range(timed):
+            encode_snapshot(feed.tick, 0, state, baseline, feed.tick - 1)
+        per_encode = (time.perf_counter() - encode_started) / timed
+        received = sum(d.bytes_received for d in drains) / max(len(drains), 1)
+
+        print(f"{players} players, {spectators} spectators on one session at {server.tick_rate} ticks/s "
+              f"({connect_time:.1f}s to connect)")
+        print(f"  tick without spectators {tick_alone:.3f} ms, with spectators {tick_watched:.3f} ms")
+        print(f"  broadcast {broadcast_ms:.3f} ms/tick = {broadcast_ms * 1000 / spectators:.2f} us per spectator, "
+              f"{encoded_per_tick:.0f} B encoded per tick for all of them")
+        print(f"  encoding per spectator instead would add {per_encode * spectators * 1000:.3f} ms/tick "
+              f"({per_encode * 1e6:.1f} us each)")
+        print(f"  each spectator received {received / 1024:.1f} KiB")
+        print(f"  state mismatches: {mismatches} of {len(watchers)} decoding spectators")
+
+        for client in bots + watchers:
+            await client.close()
+        mismatches += await _slow_readers(db)
+        db.close()
+        return mismatches
+
+
+async def _slow_readers(db: DatabaseService) -> int:
+    host_id = (await db.aio.login_user("bot0", "bot"))["id"]
+    code = await db.aio.create_multiplayer_session(host_id)
+    server = GameServer(db, port=0, tick_rate=SLOW_TICK_RATE, verbose=False)
+    await server.start()
+    player = NetClient()
+    await player.connect(code, "bot0", "bot", port=server.port)
+    feed = server.sessions[code].feed
+
+    readers = [await _connect_slow(code, server.port) for _ in range(SLOW_SPECTATORS)]
+    await asyncio.sleep(0.5)
+
+    # Ngừng đọc tới khi server bắt đầu bỏ frame của mọi người xem
+    for reader in readers:
+        reader.transport.pause_reading()
+    server.stats.reset()
+    stalled = time.perf_counter()
+    while not all(s.frames_dropped for s in feed.spectators) and time.perf_counter() - stalled < 60:
+        await asyncio.sleep(0.1)
+    stall_time = time.perf_counter() - stalled
+    buffered = max(s.transport.get_write_buffer_size() for s in feed.spectators)
+    await asyncio.sleep(1.0)
+    buffered_after = max(s.transport.get_write_buffer_size() for s in feed.spectators)
+    dropped = sum(s.frames_dropped for s in feed.spectators)
+    ticks_per_second = server.stats.ticks / (time.perf_counter() - stalled)
+    for reader in readers:
+        reader.transport.resume_reading()
+    await asyncio.sleep(1.0)
+
+    await server.stop()
+    await asyncio.sleep(0.3)
+    watchers = [reader.client for reader in readers]
+    mismatches = sum(1 for w in watchers if w.state != feed.state or w.tick != feed.tick)
+    print(f"{SLOW_SPECTATORS} slow spectators at {ticks_per_second:.0f} ticks/s: dropping started after "
+          f"{stall_time:.1f}s, send buffer {buffered / 1024:.1f} KiB then {buffered_after / 1024:.1f} KiB "
+          f"a second later, {dropped} frames dropped")
+    print(f"  after reading again: {sum(w.full_snapshots - 1 for w in watchers)} resyncs from a full snapshot, "
+          f"state mismatches: {mismatches} of {len(watchers)}")
+    await player.close()
+    return mismatches
+
+
+def main():
+    spectators = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 5.0
+    players = int(sys.argv[3]) if len(sys.argv) > 3 else 4
+    mismatches = asyncio.run(run(spectators, seconds, players))
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()